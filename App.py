@@ -4,16 +4,27 @@ import os
 from os.path import exists as file_exists
 from datetime import datetime
 import json
+import time
 
 import argparse
+import random
 import sys
 import re
 
+# keep stdout clean for the headless JSON-lines output
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
 import pygame
 
 from lib.Maze import Maze
 from lib.Map import Map
 from lib.Pathfinder import Pathfinder
+from lib.Headless import HeadlessSolver
+from lib.MazeFile import MazeFile
+from lib.MazeGenerators import EllerRows
+from lib.PathCache import PathCache
+from lib.Profiler import Profiler
+from lib.Simulation import Simulation
 
 
 class App():
@@ -25,7 +36,13 @@ class App():
 
     FPS = 100
 
-    def __init__(self, cols=None, rows=None, start_pos=None, end_pos=None, dump=None, save_generated_maze=False, load_generated_maze=None):
+    SIMULATION_BUDGET = 12          # in ms of generation/path finding per frame (the number of updates is tuned to it)
+    RENDER_INTERVAL = 100           # in ms between two frames in uncapped mode
+    UPDATES_COUNTER_MAX = 1000      # with the manual number of updates per frame ('+' / '-')
+
+    DIRTY_RECTS_MAX = 200       # more dirty rects than that are merged in one
+
+    def __init__(self, cols=None, rows=None, start_pos=None, end_pos=None, dump=None, save_generated_maze=False, load_generated_maze=None, algorithm=Maze.DEFAULT_ALGORITHM, solver=Pathfinder.DEFAULT_SOLVER, cache=None, seed=None, save_seed_only=False, profile=None, cprofile=False, trace_memory=False, budget=SIMULATION_BUDGET, uncapped=False, render_interval=RENDER_INTERVAL, threaded=False, flow_field=False):
         assert(cols is None or cols > 0)
         assert(rows is None or rows > 0)
 
@@ -39,23 +56,65 @@ class App():
         self._cols = cols
         self._rows = rows
 
+        self._algorithm = algorithm
+        self._solver = solver
+
+        # solved paths cache (see PathCache)
+        self._cache = cache
+        # paths read from the flow field of the maze to the end (see Map.get_flow_field)
+        self._flow_field = flow_field
+
+        # seed of the first maze, incremented at each restart (drawn for each maze if None)
+        self._seed = seed
+        self._mazes_count = 0
+
         self._init_pygame()
 
         self._save_generated_maze = save_generated_maze
+        # only the seed and the algorithm are saved when they determine the maze (see MazeFile)
+        self._save_seed_only = save_seed_only
         self._loaded_data = None
         if load_generated_maze is not None:
-            self._loaded_data = json.load(load_generated_maze)
+            self._loaded_data = MazeFile.load(load_generated_maze)
 
         self._start_pos = start_pos
         self._end_pos = end_pos
 
         self._multiple_update_counter = 1
 
+        # number of updates per frame tuned to spend the budget (in sec) simulating, manual if None,
+        # uncapped: no FPS limit, the simulation runs between frames drawn every render_interval
+        self._budget = budget / 1000 if budget else None
+        self._adaptive_budget = self._budget if self._budget is not None else self.SIMULATION_BUDGET / 1000
+        self._uncapped = uncapped
+        self._render_interval = render_interval / 1000
+        self._updates_rate = None
+        self._steps_count = 0
+        self._steps_time_start = time.perf_counter()
+        self._steps_per_sec = 0
+
+        # generation and path finding in a worker thread, their changes are drawn by the main loop (see Simulation)
+        self._threaded = threaded
+        self._simulation = None
+        self._simulation_steps = 0
+
         self._dump = dump
         self._dump_uuid = None
 
         self._debug_mode = False
 
+        self._dirty_rects_enabled = True
+        self._full_redraw = True
+
+        # timing of the hot paths (see Profiler), a report per maze ('json' or 'csv') is written at restart
+        self._profile = profile
+        self._profiler = Profiler()
+        self._instrument(self, self.ALL_UPDATE_STEP_FUNCS + ['update', 'draw', '_update_display'])
+        if cprofile:
+            self._profiler.toggle_cprofile()
+        if trace_memory:
+            self._profiler.toggle_tracemalloc()
+
     @classmethod
     def generate_dump_uuid(cls):
         return datetime.now().strftime('%Y%m%d%H%M%S')
@@ -83,10 +142,21 @@ Controls:
   'R'           => Restart
   'S'           => To save the current map
   'D'           => Toggle debug mode during pathfinding
-  '+' / '-'     => Increase/Decrease by 10 the number of updates per frame
+  'F'           => Toggle full screen redraw (instead of dirty rects) at each frame
+  '+' / '-'     => Increase/Decrease by 10 the number of updates per frame (manual mode)
+  'A'           => Adaptive number of updates per frame (the simulation lasts up to the budget per frame)
+  'U'           => Toggle uncapped mode: simulate as fast as possible, draw every render interval
+  'P'           => Start/Stop a cProfile session (stats saved at stop)
+  'M'           => Start/Stop tracing the memory allocations (tracemalloc)
 =========================
         ''')
 
+    @property
+    def _is_simulating(self):
+        if self._pathfinder is not None:
+            return not self._pathfinder.path_found()
+        return self._maze is not None and not self._maze.was_generated
+
     @property
     def window_title(self):
         out = f'Maze - FPS: {self._clock.get_fps():.2f}'
@@ -94,31 +164,100 @@ Controls:
             out += f' (Generating {self._maze.progression:.2f}%)'
         if self._pathfinder is not None and not self._pathfinder.path_found():
             out += f' (Finding path length: {len(self._pathfinder)} cells)'
+        if self._is_simulating and self._steps_per_sec > 0:
+            out += f' {self._steps_per_sec:.0f} steps/s'
         if self._multiple_update_counter > 1:
             out += f' x{self._multiple_update_counter}'
+        if self._threaded:
+            out += ' (THREADED)'
+        elif self._uncapped:
+            out += ' (UNCAPPED)'
+        elif self._budget is None:
+            out += ' (MANUAL)'
         if self._debug_mode:
             out += ' (DEBUG MODE)'
+        if not self._dirty_rects_enabled:
+            out += ' (FULL REDRAW)'
+        if self._profiler.is_cprofile_enabled:
+            out += ' (CPROFILE)'
+        if self._profiler.is_tracemalloc_enabled:
+            out += ' (TRACEMALLOC)'
         return out
 
+    def _instrument(self, obj, methods_names):
+        if self._profile is not None:
+            self._profiler.instrument_all(obj, methods_names)
+
     def _init_map(self):
-        self._map = Map(self._screen_map.get_size(), self._cols, self._rows, self._loaded_data)
+        seed = self._seed + self._mazes_count if self._seed is not None else None
+        self._mazes_count += 1
+
+        self._map = Map(self._screen_map.get_size(), self._cols, self._rows, self._loaded_data, seed=seed)
+        self._instrument(self._map, ['draw', 'draw_all_cells'])
 
         if self._loaded_data is not None:
             self._map.draw_all_cells(self._screen_map)
+            self._full_redraw = True
 
     def _init_maze(self):
         assert(self._map is not None)
-        self._maze = Maze(self._map)
+        # a loaded map is fully visited: the backtracker ends at once without carving any wall
+        algorithm = self._algorithm if self._loaded_data is None else Maze.DEFAULT_ALGORITHM
+        self._maze = Maze(self._map, algorithm, publish=self._threaded)
+        self._instrument(self._maze, ['update', 'draw'])
 
     def _init_pathfinder(self):
         assert(self._map is not None)
         assert(self._start_pos is None or (0 <= self._start_pos[0] < self._map.cols and 0 <= self._start_pos[1] < self._map.rows))
         assert(self._end_pos is None or (0 <= self._end_pos[0] < self._map.cols and 0 <= self._end_pos[1] < self._map.rows))
-        self._pathfinder = Pathfinder(self._map, self._start_pos, self._end_pos)
+        self._pathfinder = Pathfinder(self._map, self._start_pos, self._end_pos, self._solver, self._cache, publish=self._threaded, flow_field=self._flow_field)
+        self._instrument(self._pathfinder, ['update', '_solve_step', '_update_stable_path', '_render_stable_path', 'draw', 'draw_full_path'])
+
+    def _close_pathfinder(self):
+        if self._pathfinder is not None:
+            self._pathfinder.close()
+
+    def _write_profile_report(self):
+        # report of the maze being replaced
+        if self._profile is not None:
+            path = f'{self._dump_uuid}_profile.{self._profile}'
+            self._profiler.write_report(path, {
+                'cols': self._map.cols,
+                'rows': self._map.rows,
+                'algorithm': self._maze.algorithm if self._maze is not None else None,
+                'solver': self._pathfinder.solver if self._pathfinder is not None else None,
+            })
+            print(f'Profile: {path}')
+
+        if self._profiler.is_cprofile_enabled:
+            self._profiler.dump_cprofile(f'{self._dump_uuid}_cprofile.prof')
+
+    def _toggle_cprofile(self):
+        path = f'{self._dump_uuid}_cprofile.prof'
+        if self._profiler.is_cprofile_enabled:
+            print(f'cProfile: {path}')
+        self._profiler.toggle_cprofile(path)
+
+    def _toggle_tracemalloc(self):
+        if self._profiler.is_tracemalloc_enabled:
+            memory = self._profiler.get_tracemalloc_stats()
+            print(f'Memory: {memory["current"]} bytes (peak: {memory["peak"]} bytes)')
+            for stat in memory['top']:
+                print(f'  {stat["size"]:>12} bytes {stat["count"]:>8} blocks  {stat["line"]}')
+        self._profiler.toggle_tracemalloc()
 
     def _restart(self):
         pygame.time.set_timer(self.USEREVENT_RESTART, 0)        # Remove restart event
 
+        if self._cache is not None and self._pathfinder is not None:
+            print(f'Paths cache: {self._cache.get_stats()}')
+
+        self._stop_simulation()
+        self._close_pathfinder()
+
+        if self._map is not None:
+            self._write_profile_report()
+
         self._map = None
         self._maze = None
         self._pathfinder = None
@@ -128,6 +267,10 @@ Controls:
 
         self._dump_uuid = self.generate_dump_uuid()
 
+        self._full_redraw = True
+
+        self._reset_updates_rate()
+
         self._cur_update_step = 0
 
     def events(self):
@@ -144,18 +287,91 @@ Controls:
                     self._update_step_4_save_maze(force=True)
                 elif event.key == pygame.K_d:
                     self._debug_mode = not self._debug_mode
+                    self._full_redraw = True
+                elif event.key == pygame.K_f:
+                    self._dirty_rects_enabled = not self._dirty_rects_enabled
+                    self._full_redraw = True
                 elif event.key in (pygame.K_PLUS, pygame.K_KP_PLUS):
-                    self._multiple_update_counter += 10
-                    self._multiple_update_counter = min(self._multiple_update_counter, 1000)
+                    self._set_manual_updates_counter(self._multiple_update_counter + 10)
                 elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
-                    self._multiple_update_counter -= 10
-                    self._multiple_update_counter = max(self._multiple_update_counter, 1)
+                    self._set_manual_updates_counter(self._multiple_update_counter - 10)
+                elif event.key == pygame.K_a:
+                    self._budget = self._adaptive_budget
+                    self._uncapped = False
+                elif event.key == pygame.K_u:
+                    self._uncapped = not self._uncapped
+                elif event.key == pygame.K_p:
+                    self._toggle_cprofile()
+                elif event.key == pygame.K_m:
+                    self._toggle_tracemalloc()
                 continue
 
             if event.type == self.USEREVENT_RESTART:
                 self._restart()
                 continue
 
+    def _set_manual_updates_counter(self, counter):
+        self._budget = None
+        self._uncapped = False
+        self._multiple_update_counter = max(1, min(counter, self.UPDATES_COUNTER_MAX))
+
+    def _get_budget(self):
+        if self._uncapped:
+            return self._render_interval
+        return self._budget
+
+    def _simulate(self, update_func):
+        start = time.perf_counter()
+        update_func(multiple_update_counter=self._multiple_update_counter)
+        duration = time.perf_counter() - start
+
+        self._count_steps(self._multiple_update_counter)
+
+        budget = self._get_budget()
+        if budget is None or duration <= 0:
+            return
+
+        # updates per sec smoothed over the frames, at most doubled from a frame to the next one
+        rate = self._multiple_update_counter / duration
+        self._updates_rate = rate if self._updates_rate is None else (self._updates_rate + rate) / 2
+        self._multiple_update_counter = max(1, min(int(self._updates_rate * budget), self._multiple_update_counter * 2))
+
+    def _reset_updates_rate(self):
+        # the generation and the path finding steps do not last the same
+        self._updates_rate = None
+        if self._get_budget() is not None:
+            self._multiple_update_counter = 1
+
+    def _count_steps(self, steps):
+        self._steps_count += steps
+        now = time.perf_counter()
+        if now - self._steps_time_start >= 1:
+            self._steps_per_sec = self._steps_count / (now - self._steps_time_start)
+            self._steps_count = 0
+            self._steps_time_start = now
+
+    def _start_simulation(self, target):
+        if self._threaded:
+            self._simulation = Simulation(target)
+            self._simulation_steps = 0
+
+    def _stop_simulation(self):
+        if self._simulation is not None:
+            self._simulation.stop()
+            self._simulation = None
+
+    def _apply_simulation_changes(self, target):
+        # changes published by the worker thread, drawn at the next draw
+        is_done = self._simulation.is_done
+        for changes in self._simulation.pop_changes():
+            target.apply_changes(changes)
+
+        steps_count = self._simulation.steps_count
+        self._count_steps(steps_count - self._simulation_steps)
+        self._simulation_steps = steps_count
+
+        return is_done
+
     def _dump_screen(self, filename):
         if not self._dump:
             return
@@ -177,23 +393,36 @@ Controls:
         assert(self._maze is None)
 
         self._init_maze()
+        self._start_simulation(self._maze)
 
         return True
 
     def _update_step_3_generate_maze(self):
-        assert(not self._maze.was_generated)
-
         if int(self._maze.progression) in (25, 50, 75):
             self._dump_screen(f'maze_{int(self._maze.progression)}%_generated.png')
 
-        self._maze.update(multiple_update_counter=self._multiple_update_counter)
+        if self._simulation is not None:
+            return self._apply_simulation_changes(self._maze)
+
+        assert(not self._maze.was_generated)
+
+        self._simulate(self._maze.update)
 
         return self._maze.was_generated
 
+    def _get_maze_origin(self):
+        # seed and algorithm generating the maze again (unknown for a loaded JSON maze)
+        if self._loaded_data is None:
+            return self._map.seed, self._algorithm
+        if isinstance(self._loaded_data, MazeFile):
+            return self._loaded_data.seed, self._loaded_data.algorithm
+        return None, None
+
     def _update_step_4_save_maze(self, force=False):
         if self._save_generated_maze or force:
-            with open(f'{self._dump_uuid}_maze_{self._map.cols}x{self._map.rows}.json', 'w', encoding='utf-8') as f:
-                json.dump(self._map.save(), f)
+            seed, algorithm = self._get_maze_origin()
+            walls = not self._save_seed_only or seed is None or algorithm not in MazeFile.ALGORITHMS
+            MazeFile.write(f'{self._dump_uuid}_maze_{self._map.cols}x{self._map.rows}{MazeFile.EXTENSION}', self._map, seed, algorithm, walls)
 
         return True
 
@@ -202,13 +431,21 @@ Controls:
 
         self._dump_screen('maze_generated.png')
         self._init_pathfinder()
+        self._reset_updates_rate()
+        self._start_simulation(self._pathfinder)
 
         return True
 
     def _update_step_6_find_path(self):
-        assert(not self._pathfinder.path_found())
+        if self._pathfinder.path_found():
+            # path from the cache
+            return True
 
-        self._pathfinder.update(multiple_update_counter=self._multiple_update_counter)
+        if self._simulation is not None:
+            self._apply_simulation_changes(self._pathfinder)
+            return self._pathfinder.path_found()
+
+        self._simulate(self._pathfinder.update)
 
         return self._pathfinder.path_found()
 
@@ -249,24 +486,36 @@ Controls:
                 self._cur_update_step = 0
 
 
+    def _update_display(self, dirty_rects):
+        if self._full_redraw or not self._dirty_rects_enabled:
+            dirty_rects = [self._screen.get_rect()]
+        elif len(dirty_rects) > self.DIRTY_RECTS_MAX:
+            dirty_rects = [dirty_rects[0].unionall(dirty_rects[1:])]
+
+        for rect in dirty_rects:
+            self._screen.blit(self._screen_map, rect, rect)
+            self._screen.blit(self._screen_path, rect, rect)
+
+        pygame.display.update(dirty_rects)
+
+        self._full_redraw = False
+
     def draw(self):
+        dirty_rects = []
+
         if self._pathfinder is None:
             if self._map is not None:
-                self._map.draw(self._screen_map)
+                dirty_rects += self._map.draw(self._screen_map)
 
             if self._maze is not None:
-                self._maze.draw(self._screen_map)
+                dirty_rects += self._maze.draw(self._screen_map)
         else:
             if not self._pathfinder.path_found():
-                self._screen_path.fill(self.BG_COLOR)
-                self._pathfinder.draw(self._screen_path, debug=self._debug_mode)
+                dirty_rects += self._pathfinder.draw(self._screen_path, debug=self._debug_mode, full_redraw=self._full_redraw)
             else:
-                self._pathfinder.draw_full_path(self._screen_path)
+                dirty_rects += self._pathfinder.draw_full_path(self._screen_path)
 
-        self._screen.blit(self._screen_map, (0, 0))
-        self._screen.blit(self._screen_path, (0, 0))
-
-        pygame.display.update()
+        self._update_display(dirty_rects)
 
     def run(self):
         self._running = True
@@ -274,13 +523,17 @@ Controls:
         self._restart()
 
         while self._running:
-            self._clock.tick(self.FPS)
+            # uncapped: the frames are paced by the simulation budget (see _simulate)
+            self._clock.tick(self.FPS if not self._uncapped else 0)
             pygame.display.set_caption(self.window_title)
 
             self.events()
             self.update()
             self.draw()
 
+        self._stop_simulation()
+        self._close_pathfinder()
+
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(prog=sys.argv[0])
@@ -307,13 +560,121 @@ if __name__ == '__main__':
                         action='store_true',
                         dest='save_generated_maze',
                         help='save the generated maze')
+    parser.add_argument('--save-seed-only',
+                        action='store_true',
+                        dest='save_seed_only',
+                        help='save only the seed and the algorithm of the generated maze (implies --save), the maze is generated again on load')
     parser.add_argument('--load', '--load-maze',
-                        type=argparse.FileType('r'),
+                        type=str,
                         dest='load_generated_maze',
                         metavar='load_generated_maze',
-                        help='load a pre generated maze')
+                        help='load a pre generated maze (binary or JSON file)')
+    parser.add_argument('--convert',
+                        type=str,
+                        default=None,
+                        dest='convert',
+                        metavar='json_maze',
+                        help='convert a JSON maze to the binary format and exit')
+    parser.add_argument('-g', '--generator', '--algorithm',
+                        type=str,
+                        default=Maze.DEFAULT_ALGORITHM,
+                        choices=Maze.ALGORITHMS,
+                        dest='algorithm',
+                        help='the maze generation algorithm')
+    parser.add_argument('--solver',
+                        type=str,
+                        default=Pathfinder.DEFAULT_SOLVER,
+                        choices=Pathfinder.SOLVERS,
+                        dest='solver',
+                        help='the path finding algorithm')
+    parser.add_argument('--cache',
+                        action='store_true',
+                        dest='cache',
+                        help='cache the solved paths: a maze solved again between the same points is not searched')
+    parser.add_argument('--cache-dir',
+                        type=str,
+                        default=None,
+                        dest='cache_dir',
+                        help='the directory where the solved paths are cached across runs (implies --cache)')
+    parser.add_argument('--cache-size',
+                        type=int,
+                        default=PathCache.MAX_ENTRIES,
+                        dest='cache_size',
+                        help='the maximum number of cached paths (the least recently used are evicted)')
+    parser.add_argument('--flow-field',
+                        action='store_true',
+                        dest='flow_field',
+                        help='read the paths from a single search rooted at the end of the maze (all the starts to the same end)')
+    parser.add_argument('--stream',
+                        type=str,
+                        default=None,
+                        dest='stream',
+                        metavar='maze_file',
+                        help='generate the maze row by row (Eller) straight into a binary maze file and exit, the whole maze is never in memory')
+    parser.add_argument('--budget',
+                        type=float,
+                        default=App.SIMULATION_BUDGET,
+                        dest='budget',
+                        help='the time (in ms) spent generating/finding the path per frame, the number of updates is tuned to it (0: manual number of updates)')
+    parser.add_argument('--uncapped',
+                        action='store_true',
+                        dest='uncapped',
+                        help='simulate as fast as possible and draw a frame every render interval')
+    parser.add_argument('--render-interval',
+                        type=float,
+                        default=App.RENDER_INTERVAL,
+                        dest='render_interval',
+                        help='the time (in ms) between two frames in uncapped mode')
+    parser.add_argument('--threaded',
+                        action='store_true',
+                        dest='threaded',
+                        help='generate the maze and find the path in a worker thread, the display only draws their changes')
+    parser.add_argument('--profile',
+                        type=str,
+                        nargs='?',
+                        const='json',
+                        default=None,
+                        choices=['json', 'csv'],
+                        dest='profile',
+                        help='time the update steps, the generation, the path finding and the draw calls, a report (json or csv) is written for each maze')
+    parser.add_argument('--cprofile',
+                        action='store_true',
+                        dest='cprofile',
+                        help='profile all the functions with cProfile from the start (a .prof file is written for each maze, see also the P key)')
+    parser.add_argument('--tracemalloc',
+                        action='store_true',
+                        dest='trace_memory',
+                        help='trace the memory allocations from the start (reported with --profile json, see also the M key)')
+    parser.add_argument('--headless',
+                        action='store_true',
+                        dest='headless',
+                        help='generate and solve mazes without display, results are written as JSON lines')
+    parser.add_argument('-n', '--count',
+                        type=int,
+                        default=1,
+                        dest='count',
+                        help='the number of mazes to generate and solve in headless mode')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=None,
+                        dest='seed',
+                        help='the seed of the first maze (incremented for each maze): the seed and the dimensions determine the maze')
+    parser.add_argument('-w', '--workers',
+                        type=int,
+                        default=None,
+                        dest='workers',
+                        help='the number of processes generating the maze by tiles in headless mode')
+    parser.add_argument('-o', '--output',
+                        type=argparse.FileType('w'),
+                        default=sys.stdout,
+                        dest='output',
+                        help='the file where the headless results are written (default: stdout)')
     args = parser.parse_args()
 
+    if args.convert is not None:
+        print(MazeFile.convert(args.convert))
+        sys.exit(0)
+
     app_params = {
         'cols': None,
         'rows': None,
@@ -322,6 +683,19 @@ if __name__ == '__main__':
         'dump': None,
         'save_generated_maze': None,
         'load_generated_maze': None,
+        'algorithm': None,
+        'solver': None,
+        'cache': None,
+        'flow_field': False,
+        'seed': None,
+        'save_seed_only': None,
+        'profile': None,
+        'cprofile': None,
+        'trace_memory': None,
+        'budget': None,
+        'uncapped': None,
+        'render_interval': None,
+        'threaded': None,
     }
 
     if args.dims is not None:
@@ -329,6 +703,9 @@ if __name__ == '__main__':
         if matched is not None:
             app_params['cols'] = int(matched.groupdict().get('cols'))
             app_params['rows'] = int(matched.groupdict().get('rows'))
+        if args.load_generated_maze is not None:
+            # the dimensions of a loaded maze are the ones of its file
+            parser.error('--dims cannot be used with --load')
 
     if args.start_pos is not None:
         matched = re.match(r'[({\[]?(?P<pos_x>\d+)[, x]\s?(?P<pos_y>\d+)[)}\]]?', args.start_pos)
@@ -342,8 +719,50 @@ if __name__ == '__main__':
 
     app_params['dump'] = args.dump
 
-    app_params['save_generated_maze'] = args.save_generated_maze
+    app_params['save_generated_maze'] = args.save_generated_maze or args.save_seed_only
+    app_params['save_seed_only'] = args.save_seed_only
+    app_params['seed'] = args.seed
+    app_params['profile'] = args.profile
+    app_params['cprofile'] = args.cprofile
+    app_params['trace_memory'] = args.trace_memory
+    app_params['budget'] = args.budget
+    app_params['uncapped'] = args.uncapped
+    app_params['render_interval'] = args.render_interval
+    app_params['threaded'] = args.threaded
     app_params['load_generated_maze'] = args.load_generated_maze
+    app_params['algorithm'] = args.algorithm
+    app_params['solver'] = args.solver
+    app_params['flow_field'] = args.flow_field
+
+    if args.cache or args.cache_dir is not None:
+        app_params['cache'] = PathCache(args.cache_size, args.cache_dir)
+
+    if args.stream is not None:
+        assert(app_params['cols'] is not None and app_params['rows'] is not None), 'Error: --dims is required with --stream'
+        # same maze as the eller generator with this seed
+        seed = args.seed if args.seed is not None else random.getrandbits(32)
+        rows_walls = EllerRows(app_params['cols'], app_params['rows'], random.Random(seed))
+        MazeFile.write_rows(args.stream, app_params['cols'], app_params['rows'], rows_walls, seed=seed, algorithm='eller')
+        sys.exit(0)
+
+    if args.headless:
+        solver = HeadlessSolver(cols=app_params['cols'],
+                                rows=app_params['rows'],
+                                start_pos=app_params['start_pos'],
+                                end_pos=app_params['end_pos'],
+                                data_to_load=MazeFile.load(args.load_generated_maze) if args.load_generated_maze is not None else None,
+                                seed=args.seed,
+                                algorithm=app_params['algorithm'],
+                                solver=app_params['solver'],
+                                cache=app_params['cache'],
+                                flow_field=app_params['flow_field'],
+                                workers=args.workers)
+        for result in solver.run(args.count):
+            args.output.write(json.dumps(result) + '\n')
+            args.output.flush()
+        if app_params['cache'] is not None:
+            print(f'Paths cache: {app_params["cache"].get_stats()}', file=sys.stderr)
+        sys.exit(0)
 
     a = App(**app_params)
     a.run()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lib.Map import Map
+from lib.ParallelMaze import ParallelMaze
+from lib.PathSolvers import AStarSolver
+
+
+class NoAdjacencySolver(AStarSolver):
+    '''
+    A* with the former neighbors queries (cell views and walls checks).
+    Only used as reference for the benchmark.
+    '''
+
+    def __init__(self, map_grid, start_pos, end_pos):
+        super().__init__(map_grid, start_pos, end_pos)
+        self._map.clear_adjacency()
+        self._find_neighbors = self._find_neighbors_views
+
+    def _find_neighbors_views(self, index):
+        return [self.to_index((cell.x, cell.y)) for cell in self._map.find_neighbors(self._map.get_cell(*self.to_pos(index)))]
+
+
+def bench_queries(map_grid, query, cells):
+    start = time.perf_counter()
+    for cell in cells:
+        query(cell)
+    return len(cells) / (time.perf_counter() - start)
+
+
+def bench_solve(solver_cls, map_grid):
+    start = time.perf_counter()
+    solver = solver_cls(map_grid, (0, 0), (map_grid.cols - 1, map_grid.rows - 1))
+    solver.solve()
+    return solver.expanded_count, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog=sys.argv[0])
+    parser.add_argument('--sizes',
+                        type=int,
+                        nargs='+',
+                        default=[100, 500, 1000],
+                        help='the sizes of the square mazes to benchmark')
+    parser.add_argument('--queries',
+                        type=int,
+                        default=200000,
+                        help='the number of neighbors queries per run')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='the seed used to generate the mazes')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        map_grid = Map(None, size, size, headless=True)
+        ParallelMaze(map_grid, workers=1, seed=args.seed).generate()
+
+        cells = [map_grid.get_cell(i % size, (i // size) % size) for i in range(0, min(args.queries, len(map_grid)))]
+        indexes = [cell.y * size + cell.x for cell in cells]
+
+        map_grid.clear_adjacency()
+        views_rate = bench_queries(map_grid, map_grid.find_neighbors, cells)
+
+        start = time.perf_counter()
+        map_grid.build_adjacency()
+        build_duration = time.perf_counter() - start
+
+        index_rate = bench_queries(map_grid, map_grid.find_neighbors, cells)
+        indexes_rate = bench_queries(map_grid, map_grid.find_neighbor_indexes, indexes)
+
+        print(f'{size}x{size} adjacency index built in {build_duration * 1000:.1f}ms ({len(map_grid)} bytes)')
+        print(f'{size}x{size} {"walls checks":>16}: {views_rate:10.0f} queries/s')
+        print(f'{size}x{size} {"adjacency index":>16}: {index_rate:10.0f} queries/s')
+        print(f'{size}x{size} {"indexes only":>16}: {indexes_rate:10.0f} queries/s')
+
+        for name, solver_cls in (('walls checks', NoAdjacencySolver), ('adjacency index', AStarSolver)):
+            map_grid.build_adjacency()
+            expanded, duration = bench_solve(solver_cls, map_grid)
+            print(f'{size}x{size} {name:>16}: solved in {duration:7.2f}s ({expanded} expansions)')
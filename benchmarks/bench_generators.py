@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import time
+import argparse
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lib.Map import Map
+from lib.Maze import Maze
+
+
+def bench_generation(algorithm, size, step_wise, seed):
+    random.seed(seed)
+    map_grid = Map(None, size, size, headless=True)
+    maze = Maze(map_grid, algorithm)
+
+    start = time.perf_counter()
+    if step_wise:
+        while not maze.was_generated:
+            maze.update(multiple_update_counter=1000)
+    else:
+        maze.generate()
+    duration = time.perf_counter() - start
+
+    return len(map_grid) / duration
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog=sys.argv[0])
+    parser.add_argument('--sizes',
+                        type=int,
+                        nargs='+',
+                        default=[100, 500],
+                        help='the sizes of the square mazes to benchmark')
+    parser.add_argument('--algorithms',
+                        type=str,
+                        nargs='+',
+                        default=Maze.ALGORITHMS,
+                        choices=Maze.ALGORITHMS,
+                        help='the generation algorithms to benchmark')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='the seed used to generate the mazes')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        for algorithm in args.algorithms:
+            step_wise = bench_generation(algorithm, size, True, args.seed)
+            at_once = bench_generation(algorithm, size, False, args.seed)
+            print(f'{size}x{size} {algorithm:>12}: {step_wise:12.0f} cells/s (update) {at_once:12.0f} cells/s (generate)')
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import time
+import argparse
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lib.Map import Map
+from lib.MazeHierarchy import MazeHierarchy
+from lib.ParallelMaze import ParallelMaze
+from lib.PathSolvers import SOLVERS
+
+
+def bench_queries(map_grid, queries, solver, max_duration):
+    '''
+    Mean duration of the queries (as many as possible in max_duration) and mean of the nodes expanded per query.
+    '''
+    durations = []
+    expanded_count = 0
+    start = time.perf_counter()
+    for start_pos, end_pos in queries:
+        time_query = time.perf_counter()
+        path_solver = SOLVERS[solver](map_grid, start_pos, end_pos)
+        path_solver.solve()
+        durations.append(time.perf_counter() - time_query)
+        expanded_count += path_solver.expanded_count
+        if time.perf_counter() - start > max_duration:
+            break
+    return sum(durations) / len(durations), expanded_count / len(durations), len(durations)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog=sys.argv[0])
+    parser.add_argument('--sizes',
+                        type=int,
+                        nargs='+',
+                        default=[1000, 2000, 4000],
+                        help='the sizes of the square mazes to benchmark')
+    parser.add_argument('--cluster-sizes',
+                        type=int,
+                        nargs='+',
+                        default=[8, MazeHierarchy.CLUSTER_SIZE, 32],
+                        help='the sizes of the square clusters of the abstract graph')
+    parser.add_argument('--queries',
+                        type=int,
+                        default=20,
+                        help='the number of random start / end queries')
+    parser.add_argument('--max-duration',
+                        type=float,
+                        default=60.0,
+                        help='the maximum duration of the queries of a solver (in sec)')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='the seed used to generate the mazes and the queries')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        map_grid = Map(None, size, size, headless=True, seed=args.seed)
+        ParallelMaze(map_grid).generate()
+        map_grid.build_adjacency()
+
+        rng = random.Random(args.seed)
+        queries = [((rng.randrange(size), rng.randrange(size)), (rng.randrange(size), rng.randrange(size))) for _ in range(0, args.queries)]
+
+        duration, expanded_count, count = bench_queries(map_grid, queries, 'astar', args.max_duration)
+        print(f'{size}x{size} {"astar":>8}: {duration * 1000:10.1f} ms/query {expanded_count:12.0f} expanded/query ({count} queries)')
+
+        for cluster_size in args.cluster_sizes:
+            start = time.perf_counter()
+            # the solver uses the abstract graph of the map
+            hierarchy = map_grid.build_hierarchy(cluster_size)
+            build_duration = time.perf_counter() - start
+
+            duration, expanded_count, count = bench_queries(map_grid, queries, 'hpa', args.max_duration)
+            print(f'{size}x{size} {"hpa " + str(cluster_size):>8}: {duration * 1000:10.1f} ms/query {expanded_count:12.0f} expanded/query ({count} queries), '
+                  f'built in {build_duration:.2f}s, {hierarchy.nodes_count} nodes, {hierarchy.edges_count} edges, {hierarchy.nbytes / 1e6:.1f}MB ({hierarchy.nbytes / len(map_grid):.2f} bytes/cell)')
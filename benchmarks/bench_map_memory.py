@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lib.Map import Map
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog=sys.argv[0])
+    parser.add_argument('--cols',
+                        type=int,
+                        default=4000,
+                        help='the number of columns of the map')
+    parser.add_argument('--rows',
+                        type=int,
+                        default=2500,
+                        help='the number of rows of the map')
+    args = parser.parse_args()
+
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    map_grid = Map(None, args.cols, args.rows, headless=True)
+    duration = time.perf_counter() - start
+
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'{args.cols}x{args.rows} ({len(map_grid)} cells) allocated in {duration:.3f}s')
+    print(f'grid: {map_grid.nbytes} bytes => {map_grid.bytes_per_cell:.2f} bytes/cell')
+    print(f'traced: {allocated} bytes => {allocated / len(map_grid):.2f} bytes/cell')
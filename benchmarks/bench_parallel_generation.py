@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lib.Map import Map
+from lib.ParallelMaze import ParallelMaze
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog=sys.argv[0])
+    parser.add_argument('--size',
+                        type=int,
+                        default=2000,
+                        help='the size of the square maze to generate')
+    parser.add_argument('--workers',
+                        type=int,
+                        nargs='+',
+                        default=[1, 2, 4, 8],
+                        help='the numbers of worker processes to benchmark')
+    parser.add_argument('--tile-size',
+                        type=int,
+                        default=ParallelMaze.TILE_SIZE,
+                        help='the size of the tiles (in cells)')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='the seed used to generate the maze')
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        map_grid = Map(None, args.size, args.size, headless=True)
+
+        start = time.perf_counter()
+        ParallelMaze(map_grid, tile_size=args.tile_size, workers=workers, seed=args.seed).generate()
+        duration = time.perf_counter() - start
+
+        print(f'{args.size}x{args.size} {workers:>3} workers: {duration:7.2f}s => {len(map_grid) / duration:12.0f} cells/s')
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import time
+import argparse
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lib.Maze import Maze
+from lib.Map import Map
+from lib.PathSolvers import AStarSolver
+
+
+class LinearScanSolver(AStarSolver):
+    '''
+    A* with the former open set: a linear scan to find the lowest f cell at each step.
+    Only used as reference for the benchmark.
+    '''
+
+    def __init__(self, map_grid, start_pos, end_pos):
+        self._open_indexes = set()
+        super().__init__(map_grid, start_pos, end_pos)
+
+    def _open_set_push(self, index, f, h):
+        self._open_indexes.add(index)
+
+    def _open_set_peek(self):
+        return min(self._open_indexes, key=self._f.__getitem__, default=None)
+
+    def _open_set_pop(self):
+        index = self._open_set_peek()
+        self._open_indexes.remove(index)
+        return index
+
+
+def generate_maze(cols, rows, empty=False):
+    map_grid = Map((cols * 2, rows * 2), cols, rows)
+    maze = Maze(map_grid)
+    while not maze.was_generated:
+        maze.update(multiple_update_counter=1000)
+
+    if empty:
+        # remove all the inner walls: worst case for the open set size
+        for y in range(0, rows):
+            for x in range(0, cols):
+                cell = map_grid.get_cell(x, y)
+                for cardinality, (d_x, d_y) in (('N', (0, -1)), ('S', (0, 1)), ('E', (1, 0)), ('W', (-1, 0))):
+                    if map_grid.get_cell(x + d_x, y + d_y) is not None:
+                        cell.remove_wall(cardinality)
+
+    return map_grid
+
+
+def bench_expansions(solver_cls, map_grid, max_expansions, max_duration):
+    solver = solver_cls(map_grid, (0, 0), (map_grid.cols - 1, map_grid.rows - 1))
+
+    start = time.perf_counter()
+    while solver.winner is None and not solver.is_exhausted and solver.expanded_count < max_expansions:
+        solver.step()
+        if time.perf_counter() - start > max_duration:
+            break
+    duration = time.perf_counter() - start
+
+    return solver.expanded_count, duration
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog=sys.argv[0])
+    parser.add_argument('--sizes',
+                        type=int,
+                        nargs='+',
+                        default=[100, 500, 2000],
+                        help='the sizes of the square mazes to benchmark')
+    parser.add_argument('--max-expansions',
+                        type=int,
+                        default=200000,
+                        help='the maximum number of expansions per run')
+    parser.add_argument('--max-duration',
+                        type=float,
+                        default=20.0,
+                        help='the maximum duration of a run (in sec)')
+    parser.add_argument('--empty',
+                        action='store_true',
+                        help='remove all the inner walls of the mazes (large open set)')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='the seed used to generate the mazes')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        random.seed(args.seed)
+        map_grid = generate_maze(size, size, args.empty)
+
+        for name, solver_cls in (('linear scan', LinearScanSolver), ('binary heap', AStarSolver)):
+            expanded, duration = bench_expansions(solver_cls, map_grid, args.max_expansions, args.max_duration)
+            print(f'{size}x{size} {name:>12}: {expanded:>8} expansions in {duration:7.2f}s => {expanded / duration:10.0f} expansions/s')
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import time
+import argparse
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lib.Cell import Cell
+from lib.Map import Map
+from lib.Maze import Maze
+from lib.Player import Player
+from lib.Wall import Wall
+
+
+class LoopPlayer(Player):
+    '''
+    Player with the former ray casting: every ray against every wall in Python.
+    Only used as reference for the benchmark.
+    '''
+
+    def _rays_cast(self, walls):
+        self._rays_view = [(None, None) for _ in range(-self._fov // 2, self._fov // 2)]
+
+        for i, ray in enumerate(self._rays):
+            closest = None
+            dist_min = float('inf')
+            for wall in walls:
+                pt = ray.cast(wall)
+                if pt is not None:
+                    d = self._pos.distance_to(pt)
+                    if d < dist_min:
+                        dist_min = d
+                        closest = pt
+
+            if closest is not None:
+                self._rays_view[i] = (closest, dist_min)
+
+
+def bench_frames(player_cls, walls, screen_size, max_frames, max_duration):
+    player = player_cls((screen_size[0] / 2, screen_size[1] / 2))
+    player.rotate(False)
+
+    frames = 0
+    start = time.perf_counter()
+    while frames < max_frames and time.perf_counter() - start < max_duration:
+        player.update(walls)
+        frames += 1
+    duration = time.perf_counter() - start
+
+    return frames, duration, player._rays_view
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog=sys.argv[0])
+    parser.add_argument('--walls',
+                        type=int,
+                        nargs='+',
+                        default=[1000, 10000, 100000],
+                        help='the numbers of random walls to benchmark')
+    parser.add_argument('--maze-sizes',
+                        type=int,
+                        nargs='+',
+                        default=[100, 1000],
+                        help='the sizes of the square mazes to benchmark with the grid (DDA) ray casting')
+    parser.add_argument('--max-frames',
+                        type=int,
+                        default=200,
+                        help='the maximum number of frames per run')
+    parser.add_argument('--max-duration',
+                        type=float,
+                        default=10.0,
+                        help='the maximum duration of a run (in sec)')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='the seed used to generate the walls')
+    args = parser.parse_args()
+
+    screen_size = (1000, 1000)
+
+    for walls_count in args.walls:
+        random.seed(args.seed)
+        walls = [Wall(screen_size) for _ in range(0, walls_count)]
+
+        for name, player_cls in (('python loop', LoopPlayer), ('numpy', Player)):
+            frames, duration, _ = bench_frames(player_cls, walls, screen_size, args.max_frames, args.max_duration)
+            print(f'{walls_count:>7} walls {name:>12}: {frames:>5} frames in {duration:6.2f}s => {frames / duration:9.2f} FPS')
+
+    for size in args.maze_sizes:
+        random.seed(args.seed)
+        map_grid = Map(None, size, size, headless=True)
+        maze = Maze(map_grid)
+        while not maze.was_generated:
+            maze.update(multiple_update_counter=10000)
+
+        map_size = (size * Cell.SIZE, size * Cell.SIZE)
+        frames, duration, _ = bench_frames(Player, map_grid, map_size, args.max_frames, args.max_duration)
+        print(f'{size}x{size} maze {"grid (DDA)":>12}: {frames:>5} frames in {duration:6.2f}s => {frames / duration:9.2f} FPS')
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import time
+import argparse
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lib.Map import Map
+from lib.ParallelMaze import ParallelMaze
+from lib.PathSolvers import SOLVERS
+
+
+def braid(map_grid, rng, ratio):
+    # some more passages: the paths can go round a closed passage
+    for _ in range(0, int(len(map_grid) * ratio)):
+        x, y = rng.randrange(map_grid.cols - 1), rng.randrange(map_grid.rows - 1)
+        map_grid.remove_wall((x, y), (x + 1, y) if rng.random() < 0.5 else (x, y + 1))
+
+
+def solve(solver):
+    start = time.perf_counter()
+    solver.solve()
+    return time.perf_counter() - start
+
+
+def edit(map_grid, rng, path):
+    '''
+    One wall changed: a passage of the path closed (the path has to change) or a random wall removed.
+    '''
+    if path is not None and len(path) > 1 and rng.random() < 0.5:
+        i = rng.randrange(len(path) - 1)
+        map_grid.add_wall(path[i], path[i + 1])
+        return 'close'
+
+    x, y = rng.randrange(map_grid.cols - 1), rng.randrange(map_grid.rows - 1)
+    map_grid.remove_wall((x, y), (x + 1, y) if rng.random() < 0.5 else (x, y + 1))
+    return 'open'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog=sys.argv[0])
+    parser.add_argument('--sizes',
+                        type=int,
+                        nargs='+',
+                        default=[250, 500, 1000],
+                        help='the sizes of the square mazes to benchmark')
+    parser.add_argument('--edits',
+                        type=int,
+                        default=20,
+                        help='the number of single wall changes')
+    parser.add_argument('--braid',
+                        type=float,
+                        default=0.05,
+                        help='the ratio of walls removed from the perfect mazes (loops around the closed passages)')
+    parser.add_argument('--moves',
+                        type=int,
+                        default=10,
+                        help='the number of cells the start moves along the path between two changes')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='the seed used to generate the mazes and the changes')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        map_grid = Map(None, size, size, headless=True, seed=args.seed)
+        ParallelMaze(map_grid).generate()
+        map_grid.build_adjacency()
+
+        rng = random.Random(args.seed)
+        braid(map_grid, rng, args.braid)
+
+        start_pos, end_pos = (0, 0), (size - 1, size - 1)
+        incremental = SOLVERS['dstar-lite'](map_grid, start_pos, end_pos)
+        try:
+            duration = solve(incremental)
+            print(f'{size}x{size} {"dstar-lite first solve":>24}: {duration * 1000:10.1f} ms {incremental.expanded_count:10} expanded')
+
+            # (change, solver) => [changes count, total duration, total expanded]
+            stats = {}
+            for _ in range(0, args.edits):
+                path = None
+                if incremental.winner is not None:
+                    path = [incremental.to_pos(index) for index in reversed(list(incremental.get_path(incremental.winner)))]
+                    # the agent goes on along the path
+                    start_pos = path[min(args.moves, len(path) - 1)]
+                    path = path[min(args.moves, len(path) - 1):]
+                    incremental.move_start(start_pos)
+
+                change = edit(map_grid, rng, path)
+
+                expanded_count = incremental.expanded_count
+                duration = solve(incremental)
+                values = stats.setdefault((change, 'dstar-lite replan'), [0, 0.0, 0])
+                values[0] += 1
+                values[1] += duration
+                values[2] += incremental.expanded_count - expanded_count
+
+                solver = SOLVERS['astar'](map_grid, start_pos, end_pos)
+                duration = solve(solver)
+                values = stats.setdefault((change, 'astar full solve'), [0, 0.0, 0])
+                values[0] += 1
+                values[1] += duration
+                values[2] += solver.expanded_count
+                assert(solver.is_exhausted == incremental.is_exhausted)
+
+            for (change, name), (count, duration, expanded_count) in sorted(stats.items()):
+                print(f'{size}x{size} {name + " (" + change + ")":>24}: {duration / count * 1000:10.1f} ms {expanded_count / count:10.0f} expanded (mean of {count} changes)')
+        finally:
+            # the map does not notify the solver anymore
+            incremental.close()
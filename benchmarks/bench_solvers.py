@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import time
+import argparse
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lib.Map import Map
+from lib.Maze import Maze
+from lib.ParallelMaze import ParallelMaze
+from lib.PathSolvers import SOLVERS
+
+
+def generate_maze(size, algorithm, seed):
+    map_grid = Map(None, size, size, headless=True)
+
+    if algorithm is None:
+        ParallelMaze(map_grid, seed=seed).generate()
+    else:
+        random.seed(seed)
+        Maze(map_grid, algorithm).generate()
+
+    map_grid.build_adjacency()
+    return map_grid
+
+
+def bench_solver(name, map_grid):
+    start = time.perf_counter()
+    solver = SOLVERS[name](map_grid, (0, 0), (map_grid.cols - 1, map_grid.rows - 1))
+    solver.solve()
+    duration = time.perf_counter() - start
+
+    length = solver.get_length(solver.winner) if solver.winner is not None else None
+    return solver.expanded_count, length, duration
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog=sys.argv[0])
+    parser.add_argument('--sizes',
+                        type=int,
+                        nargs='+',
+                        default=[100, 300, 1000],
+                        help='the sizes of the square mazes to benchmark')
+    parser.add_argument('--solvers',
+                        type=str,
+                        nargs='+',
+                        default=list(SOLVERS),
+                        choices=list(SOLVERS),
+                        help='the solvers to benchmark')
+    parser.add_argument('--algorithm',
+                        type=str,
+                        default=None,
+                        choices=Maze.ALGORITHMS,
+                        help='the generation algorithm of the mazes (default: backtracker by tiles, see ParallelMaze)')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='the seed used to generate the mazes')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        map_grid = generate_maze(size, args.algorithm, args.seed)
+
+        for name in args.solvers:
+            expanded, length, duration = bench_solver(name, map_grid)
+            print(f'{size}x{size} {name:>20}: {expanded:>9} expanded in {duration:7.3f}s (path length: {length})')
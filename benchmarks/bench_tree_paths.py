@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import time
+import argparse
+import random
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lib.Map import Map
+from lib.ParallelMaze import ParallelMaze
+from lib.Pathfinder import Pathfinder
+
+
+def bench_pathfinder(map_grid, queries, max_duration):
+    start = time.perf_counter()
+    count = 0
+    for start_pos, end_pos in queries:
+        pathfinder = Pathfinder(map_grid, start_pos, end_pos)
+        while not pathfinder.path_found() and not pathfinder.is_exhausted:
+            pathfinder.update(multiple_update_counter=10000)
+        pathfinder.close()
+        count += 1
+        if time.perf_counter() - start > max_duration:
+            break
+    return count / (time.perf_counter() - start)
+
+
+def bench_tree(map_grid, queries, full_path):
+    start = time.perf_counter()
+    for start_pos, end_pos in queries:
+        if full_path:
+            map_grid.get_path(start_pos, end_pos)
+        else:
+            map_grid.get_path_length(start_pos, end_pos)
+    return len(queries) / (time.perf_counter() - start)
+
+
+def bench_tree_batch(map_grid, queries):
+    starts = np.array([start_pos for start_pos, _ in queries])
+    ends = np.array([end_pos for _, end_pos in queries])
+
+    start = time.perf_counter()
+    map_grid.tree.get_paths_lengths(starts, ends)
+    return len(queries) / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog=sys.argv[0])
+    parser.add_argument('--sizes',
+                        type=int,
+                        nargs='+',
+                        default=[100, 500, 1000],
+                        help='the sizes of the square mazes to benchmark')
+    parser.add_argument('--queries',
+                        type=int,
+                        default=10000,
+                        help='the number of random start / end queries')
+    parser.add_argument('--max-duration',
+                        type=float,
+                        default=10.0,
+                        help='the maximum duration of the pathfinder runs (in sec)')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='the seed used to generate the mazes and the queries')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        map_grid = Map(None, size, size, headless=True)
+        ParallelMaze(map_grid, seed=args.seed).generate()
+
+        rng = random.Random(args.seed)
+        queries = [((rng.randrange(size), rng.randrange(size)), (rng.randrange(size), rng.randrange(size))) for _ in range(0, args.queries)]
+
+        start = time.perf_counter()
+        tree = map_grid.tree
+        build_duration = time.perf_counter() - start
+
+        print(f'{size}x{size} paths index built in {build_duration:.3f}s ({tree.nbytes / len(map_grid):.1f} bytes/cell)')
+        print(f'{size}x{size} {"pathfinder":>18}: {bench_pathfinder(map_grid, queries, args.max_duration):12.1f} queries/s')
+        print(f'{size}x{size} {"tree length":>18}: {bench_tree(map_grid, queries, False):12.1f} queries/s')
+        print(f'{size}x{size} {"tree path":>18}: {bench_tree(map_grid, queries, True):12.1f} queries/s')
+        print(f'{size}x{size} {"tree length batch":>18}: {bench_tree_batch(map_grid, queries):12.1f} queries/s')
@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+'''
+Benchmark suite: generation, solving (A* and wavefront), maze files, rendering and ray casting on a ladder of maze sizes.
+All the mazes are generated from fixed seeds, so two runs measure the same work.
+
+    ./benchmarks/run.py -o baseline.json
+    ./benchmarks/run.py --baseline baseline.json        # exit code 1 on regression
+'''
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pygame
+
+from lib.Cell import Cell
+from lib.FlowField import FlowField
+from lib.Map import Map
+from lib.Maze import Maze
+from lib.MazeFile import MazeFile
+from lib.ParallelMaze import ParallelMaze
+from lib.Pathfinder import Pathfinder
+from lib.PathSolvers import SOLVERS
+from lib.Player import Player
+from lib.Wavefront import Wavefront
+
+
+SIZES = [50, 100, 250, 500, 1000, 2000]
+SUITES = ['generation', 'astar', 'wavefront', 'file', 'render', 'raycast']
+
+# pixels of the rendered mazes (the cells are at least Cell.SIZE_LIMIT_MIN pixels)
+RENDER_SIZE = 1000
+
+
+class Benchmark():
+    '''
+    Run the suites on each size, the results are keyed by suite/name/size with their unit
+    and whether higher is better (to compare them against a baseline).
+    '''
+
+    REPEAT = 5
+
+    def __init__(self, sizes=SIZES, seed=0, max_duration=10.0, algorithms=None, json_max_size=500, repeat=REPEAT):
+        self._sizes = sizes
+        self._seed = seed
+        self._max_duration = max_duration
+        self._repeat = repeat
+        self._algorithms = algorithms if algorithms is not None else [Maze.DEFAULT_ALGORITHM]
+        self._json_max_size = json_max_size
+
+        # mazes shared by the suites (see _get_maze)
+        self._mazes = {}
+
+        self.results = {}
+
+    def _add_result(self, suite, name, size, value, unit, higher_is_better=True):
+        key = f'{suite}/{name}/{size}x{size}'
+        self.results[key] = {
+            'value': value,
+            'unit': unit,
+            'higher_is_better': higher_is_better,
+        }
+        print(f'{key:<40} {value:>14.3f} {unit}')
+
+    def _get_maze(self, size):
+        # perfect maze generated by tiles: much faster than the step by step generators on the biggest sizes
+        if size not in self._mazes:
+            map_grid = Map(None, size, size, headless=True, seed=self._seed)
+            ParallelMaze(map_grid).generate()
+            map_grid.build_adjacency()
+            self._mazes[size] = map_grid
+        return self._mazes[size]
+
+    def _is_timed_out(self, start):
+        return time.perf_counter() - start > self._max_duration
+
+    def _measure(self, func):
+        '''
+        Best duration of up to `repeat` runs of func (less if they last more than max_duration), and its last result.
+        '''
+        durations = []
+        start = time.perf_counter()
+        while len(durations) == 0 or (len(durations) < self._repeat and not self._is_timed_out(start)):
+            time_run = time.perf_counter()
+            result = func()
+            durations.append(time.perf_counter() - time_run)
+
+        return min(durations), result
+
+    def _generate(self, size, algorithm):
+        map_grid = Map(None, size, size, headless=True, seed=self._seed)
+        maze = Maze(map_grid, algorithm)
+
+        start = time.perf_counter()
+        while not maze.was_generated and not self._is_timed_out(start):
+            maze.update(multiple_update_counter=1000)
+
+        return len(map_grid) * maze.progression / 100
+
+    def bench_generation(self, size):
+        for algorithm in self._algorithms:
+            duration, cells_count = self._measure(lambda: self._generate(size, algorithm))
+            self._add_result('generation', algorithm, size, cells_count / duration, 'cells/s')
+
+    def _solve(self, map_grid):
+        solver = SOLVERS['astar'](map_grid, (0, 0), (map_grid.cols - 1, map_grid.rows - 1))
+
+        start = time.perf_counter()
+        while solver.winner is None and not solver.is_exhausted and not self._is_timed_out(start):
+            solver.step()
+
+        return solver
+
+    def bench_astar(self, size):
+        map_grid = self._get_maze(size)
+
+        duration, solver = self._measure(lambda: self._solve(map_grid))
+        self._add_result('astar', 'expansions', size, solver.expanded_count / duration, 'expansions/s')
+        if solver.winner is not None:
+            self._add_result('astar', 'solve', size, duration, 's', higher_is_better=False)
+
+    def _solve_pathfinder(self, map_grid):
+        pathfinder = Pathfinder(map_grid, (0, 0), (map_grid.cols - 1, map_grid.rows - 1))
+
+        start = time.perf_counter()
+        while not pathfinder.path_found() and not pathfinder.is_exhausted and not self._is_timed_out(start):
+            pathfinder.update(multiple_update_counter=1000)
+        pathfinder.close()
+
+        return pathfinder
+
+    def _get_open_map(self, size):
+        # no inner walls: the widest wavefronts
+        map_grid = Map(None, size, size, headless=True, seed=self._seed)
+        map_grid.grid[:] = bytes(len(map_grid.grid))
+        map_grid.build_adjacency()
+        return map_grid
+
+    def bench_wavefront(self, size):
+        target_pos = (size - 1, size - 1)
+
+        for name, map_grid in (('maze', self._get_maze(size)), ('open', self._get_open_map(size))):
+            duration, wavefront = self._measure(lambda: Wavefront(map_grid, (0, 0)))
+            self._add_result('wavefront', f'{name}_field', size, duration, 's', higher_is_better=False)
+
+            duration, _ = self._measure(lambda: wavefront.get_path(target_pos))
+            self._add_result('wavefront', f'{name}_path', size, duration * 1000, 'ms', higher_is_better=False)
+
+        # paths of many starts to the same goal: one search, then a walk from each start
+        map_grid = self._get_maze(size)
+        duration, flow_field = self._measure(lambda: FlowField(map_grid, target_pos))
+        self._add_result('wavefront', 'flow_field', size, duration, 's', higher_is_better=False)
+
+        starts = [(x, y) for x, y in zip(range(0, size, max(size // 10, 1)), reversed(range(0, size, max(size // 10, 1))))]
+        duration, _ = self._measure(lambda: [flow_field.get_path_indexes(start_pos) for start_pos in starts])
+        self._add_result('wavefront', 'flow_field_walk', size, len(starts) / duration, 'paths/s')
+
+        # the Pathfinder solving the same path on the maze, step by step as in the App
+        duration, pathfinder = self._measure(lambda: self._solve_pathfinder(self._get_maze(size)))
+        if pathfinder.path_found():
+            self._add_result('wavefront', 'pathfinder_solve', size, duration, 's', higher_is_better=False)
+
+    def _load_json(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return Map(None, None, None, json.load(f), headless=True)
+
+    def _save_json(self, path, map_grid):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(map_grid.save(), f)
+
+    def bench_file(self, size):
+        map_grid = self._get_maze(size)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'maze' + MazeFile.EXTENSION)
+
+            duration, _ = self._measure(lambda: MazeFile.write(path, map_grid))
+            megabytes = os.path.getsize(path) / 1e6
+            self._add_result('file', 'binary_save', size, megabytes / duration, 'MB/s')
+
+            # the walls are memory mapped: they are read when unpacked
+            duration, _ = self._measure(lambda: MazeFile(path).grid.unpack())
+            self._add_result('file', 'binary_load', size, megabytes / duration, 'MB/s')
+
+            if size > self._json_max_size:
+                return
+
+            path = os.path.join(directory, 'maze.json')
+
+            duration, _ = self._measure(lambda: self._save_json(path, map_grid))
+            megabytes = os.path.getsize(path) / 1e6
+            self._add_result('file', 'json_save', size, megabytes / duration, 'MB/s')
+
+            duration, _ = self._measure(lambda: self._load_json(path))
+            self._add_result('file', 'json_load', size, megabytes / duration, 'MB/s')
+
+    def _get_render_map(self, size):
+        # same walls as the shared maze, on a map drawn as by the App
+        screen_size = (max(RENDER_SIZE, size * Cell.SIZE_LIMIT_MIN),) * 2
+        map_grid = Map(screen_size, size, size, seed=self._seed)
+        map_grid.grid[:] = self._get_maze(size).grid
+        return map_grid
+
+    def _draw_all_cells(self, map_grid, screen):
+        # the cells are drawn only once until updated
+        map_grid.grid_array[:] |= Cell.REDRAW
+        map_grid.draw_all_cells(screen)
+
+    def bench_render(self, size):
+        map_grid = self._get_render_map(size)
+        screen = pygame.Surface((size * Cell.SIZE, size * Cell.SIZE))
+
+        duration, _ = self._measure(lambda: self._draw_all_cells(map_grid, screen))
+        self._add_result('render', 'full_redraw', size, duration * 1000, 'ms/frame', higher_is_better=False)
+
+        # frames of the path finding: one solver step and the dirty rects drawn
+        pathfinder = Pathfinder(map_grid, (0, 0), (size - 1, size - 1))
+        surface_path = pygame.Surface(screen.get_size(), flags=pygame.SRCALPHA)
+
+        frames = 0
+        duration = 0
+        start = time.perf_counter()
+        while not pathfinder.path_found() and not pathfinder.is_exhausted and not self._is_timed_out(start):
+            pathfinder.update()
+            time_draw = time.perf_counter()
+            pathfinder.draw(surface_path)
+            duration += time.perf_counter() - time_draw
+            frames += 1
+        pathfinder.close()
+        self._add_result('render', 'path_frame', size, duration / max(frames, 1) * 1000, 'ms/frame', higher_is_better=False)
+
+    def bench_raycast(self, size):
+        map_grid = self._get_maze(size)
+        map_size = size * Cell.SIZE
+
+        player = Player((map_size / 2 + Cell.SIZE / 2, map_size / 2 + Cell.SIZE / 2))
+        player.rotate(False)
+
+        frames = 0
+        start = time.perf_counter()
+        while frames < 1000 and not self._is_timed_out(start):
+            player.update(map_grid)
+            frames += 1
+        duration = time.perf_counter() - start
+        self._add_result('raycast', 'frame', size, duration / frames * 1000, 'ms/frame', higher_is_better=False)
+
+    def run(self, suites=SUITES):
+        for size in self._sizes:
+            for suite in suites:
+                getattr(self, f'bench_{suite}')(size)
+            self._mazes.pop(size, None)
+
+    def to_json(self):
+        return {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': self._seed,
+            'results': self.results,
+        }
+
+
+def compare(results, baseline, tolerance):
+    '''
+    Print the change of each result against the baseline, return the keys of the regressions
+    (worse than the baseline by more than tolerance, in percent).
+    '''
+    regressions = []
+
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+
+        value = result['value']
+        base_value = baseline[key]['value']
+        if base_value == 0:
+            continue
+
+        change = (value - base_value) / base_value * 100
+        improvement = change if result['higher_is_better'] else -change
+
+        status = ''
+        if improvement < -tolerance:
+            status = 'REGRESSION'
+            regressions.append(key)
+        elif improvement > tolerance:
+            status = 'improvement'
+        print(f'{key:<40} {base_value:>14.3f} => {value:>14.3f} {result["unit"]:<14} {change:+7.1f}% {status}')
+
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog=sys.argv[0])
+    parser.add_argument('--suites',
+                        type=str,
+                        nargs='+',
+                        default=SUITES,
+                        choices=SUITES,
+                        help='the suites to run')
+    parser.add_argument('--sizes',
+                        type=int,
+                        nargs='+',
+                        default=SIZES,
+                        help='the sizes of the square mazes to benchmark')
+    parser.add_argument('--quick',
+                        action='store_true',
+                        help='only the sizes up to 250x250')
+    parser.add_argument('--algorithms',
+                        type=str,
+                        nargs='+',
+                        default=None,
+                        choices=Maze.ALGORITHMS,
+                        help=f'the generation algorithms to benchmark (default: {Maze.DEFAULT_ALGORITHM})')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='the seed used to generate the mazes')
+    parser.add_argument('--repeat',
+                        type=int,
+                        default=Benchmark.REPEAT,
+                        help='the number of runs of each measure (the best one is kept)')
+    parser.add_argument('--max-duration',
+                        type=float,
+                        default=10.0,
+                        help='the maximum duration of a measure (in sec)')
+    parser.add_argument('--json-max-size',
+                        type=int,
+                        default=500,
+                        help='the maximum size of the mazes saved/loaded as JSON (slow)')
+    parser.add_argument('-o', '--output',
+                        type=str,
+                        default=None,
+                        dest='output',
+                        help='the JSON file where the results are written (to be used as baseline)')
+    parser.add_argument('--baseline',
+                        type=str,
+                        default=None,
+                        help='the JSON results to compare with')
+    parser.add_argument('--tolerance',
+                        type=float,
+                        default=10.0,
+                        help='the change (in percent) against the baseline reported as regression')
+    args = parser.parse_args()
+
+    sizes = [size for size in args.sizes if size <= 250] if args.quick else args.sizes
+
+    benchmark = Benchmark(sizes, args.seed, args.max_duration, args.algorithms, args.json_max_size, args.repeat)
+    benchmark.run(args.suites)
+
+    if args.output is not None:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(benchmark.to_json(), f, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        print(f'\nComparison with {args.baseline} ({baseline["date"]}):')
+        regressions = compare(benchmark.results, baseline['results'], args.tolerance)
+        if len(regressions) > 0:
+            print(f'{len(regressions)} regression(s) over {args.tolerance}%')
+            sys.exit(1)
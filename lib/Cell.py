@@ -4,6 +4,12 @@ import re
 import pygame
 
 class Cell():
+    '''
+    Lightweight view on a cell of a Map.
+    The state of the cell (walls and flags) is stored as bits in the map grid (one byte per cell).
+    '''
+
+    __slots__ = ('_grid', '_x', '_y', '_index')
 
     SIZE = 50
     SIZE_LIMIT_MIN = 2      # 1px for wall, 1px for cell
@@ -17,21 +23,33 @@ class Cell():
     CARDINALITIES = 'NSEW'
     LOAD_PATTERN = re.compile(r'(?P<x>[0-9]+),(?P<y>[0-9]+):(?P<walls>[NSEW]*)')
 
-    def __init__(self, x, y, draw_cell=True):
+    # bits of a cell in the map grid
+    WALL_BITS = {
+        'N': 0x01,
+        'S': 0x02,
+        'E': 0x04,
+        'W': 0x08,
+    }
+    WALLS_MASK = 0x0F
+    VISITED    = 0x10
+    STACKED    = 0x20
+    REDRAW     = 0x40
+
+    # state of a new cell: all walls up and to be drawn
+    INITIAL_STATE = WALLS_MASK | REDRAW
+
+    # bits of the state drawn in the cell area (see get_tile)
+    TILE_MASK = 0x01 | 0x08 | VISITED | STACKED
+
+    # tiles of the drawn states, built on demand for the current SIZE
+    _tiles = {}
+    _tiles_size = None
+
+    def __init__(self, map_grid, x, y):
+        self._grid = map_grid.grid
         self._x = x
         self._y = y
-        self._pos = (self._x * Cell.SIZE, self._y * Cell.SIZE)
-
-        self._visited = False
-        self._stacked = False
-
-        self._walls = {cardinality:True for cardinality in self.CARDINALITIES}
-
-        self._surface = pygame.Surface((Cell.SIZE, Cell.SIZE))
-        self._surface_updated = False
-
-        if draw_cell:
-            self._draw_cell()
+        self._index = y * map_grid.cols + x
 
     def __hash__(self):
         return hash((self._x, self._y))
@@ -52,23 +70,30 @@ class Cell():
     def y(self):
         return self._y
 
+    @property
+    def pos(self):
+        return (self._x * Cell.SIZE, self._y * Cell.SIZE)
+
     @property
     def need_redraw(self):
-        return self._surface_updated
+        return self._grid[self._index] & self.REDRAW != 0
 
     @property
     def is_visited(self):
-        return self._visited
+        return self._grid[self._index] & self.VISITED != 0
 
     @classmethod
-    def load(cls, data):
+    def load(cls, map_grid, data):
         match = cls.LOAD_PATTERN.match(data)
         assert(match is not None), f'Error: Invalid data "{data}"'
         x = int(match.group('x'))
         y = int(match.group('y'))
 
-        cell = cls(x, y, draw_cell=False)
-        cell._walls = {cardinality:cardinality in match.group('walls') for cardinality in cls.CARDINALITIES}
+        cell = cls(map_grid, x, y)
+        walls = 0
+        for cardinality in match.group('walls'):
+            walls |= cls.WALL_BITS[cardinality]
+        cell._grid[cell._index] = walls
         cell.visit()
 
         return cell
@@ -77,55 +102,84 @@ class Cell():
         return f'{self._x},{self._y}:{"".join([c for c in self.CARDINALITIES if self.is_wall(c)])}'
 
     def is_wall(self, cardinality):
-        return self._walls[cardinality]
+        return self._grid[self._index] & self.WALL_BITS[cardinality] != 0
 
-    def _draw_cell(self):
-        color = Cell.BG_COLOR
-        if self._visited:
-            color = Cell.VISITED_COLOR
-        if self._stacked:
-            color = Cell.STACKED_COLOR
-        self._surface.fill(color)
-
-        w, h = self._surface.get_size()
-        thickness = 1
-
-        for cardinality, has_wall in self._walls.items():
-            if has_wall:
-                if cardinality == 'N':
-                    pygame.draw.line(self._surface, Cell.WALL_COLOR, (0, 0), (w - 1, 0), thickness)
-                if cardinality == 'S':
-                    pygame.draw.line(self._surface, Cell.WALL_COLOR, (0, h), (w - 1, h), thickness)
-                if cardinality == 'E':
-                    pygame.draw.line(self._surface, Cell.WALL_COLOR, (w, 0), (w, h - 1), thickness)
-                if cardinality == 'W':
-                    pygame.draw.line(self._surface, Cell.WALL_COLOR, (0, 0), (0, h - 1), thickness)
-
-        self._surface_updated = True
+    def _set_flag(self, flag, value=True):
+        if value:
+            self._grid[self._index] |= flag | self.REDRAW
+        else:
+            self._grid[self._index] = (self._grid[self._index] & ~flag) | self.REDRAW
 
     def visit(self):
-        self._visited = True
-        self._draw_cell()
+        self._set_flag(self.VISITED)
 
     def stack(self):
-        self._stacked = True
-        self._draw_cell()
+        self._set_flag(self.STACKED)
 
     def unstack(self):
-        self._stacked = False
-        self._draw_cell()
+        self._set_flag(self.STACKED, False)
 
     def remove_wall(self, cardinality):
         assert(cardinality in self.CARDINALITIES)
-        self._walls[cardinality] = False
-        self._draw_cell()
+        self._set_flag(self.WALL_BITS[cardinality], False)
+
+    def add_wall(self, cardinality):
+        assert(cardinality in self.CARDINALITIES)
+        self._set_flag(self.WALL_BITS[cardinality])
+
+    @classmethod
+    def _build_tile(cls, screen, state):
+        color = Cell.BG_COLOR
+        if state & cls.VISITED:
+            color = Cell.VISITED_COLOR
+        if state & cls.STACKED:
+            color = Cell.STACKED_COLOR
+
+        # same pixel format as the screen: blitted without conversion
+        tile = pygame.Surface((Cell.SIZE, Cell.SIZE), 0, screen)
+        tile.fill(color)
+
+        # only the north and west walls are inside the cell area,
+        # south and east walls are drawn by the neighbors (or the map border)
+        thickness = 1
+        if state & cls.WALL_BITS['N']:
+            pygame.draw.line(tile, Cell.WALL_COLOR, (0, 0), (Cell.SIZE - 1, 0), thickness)
+        if state & cls.WALL_BITS['W']:
+            pygame.draw.line(tile, Cell.WALL_COLOR, (0, 0), (0, Cell.SIZE - 1), thickness)
+
+        return tile
+
+    @classmethod
+    def get_tile(cls, screen, state):
+        '''
+        Surface of a cell with the given state, shared by all the cells (at most 16: walls N/W x visited x stacked).
+        '''
+        if cls._tiles_size != Cell.SIZE:
+            Cell._tiles = {}
+            Cell._tiles_size = Cell.SIZE
+
+        key = state & cls.TILE_MASK
+        tile = cls._tiles.get(key)
+        if tile is None:
+            tile = cls._tiles[key] = cls._build_tile(screen, key)
+        return tile
+
+    @classmethod
+    def draw_state(cls, screen, x, y, state):
+        '''
+        Draw the cell at (x, y) with the given state, the grid is not read nor updated (see Simulation).
+        '''
+        return screen.blit(cls.get_tile(screen, state), (x * Cell.SIZE, y * Cell.SIZE))
 
     def draw(self, screen):
         if not self.need_redraw:
-            return
+            return None
+
+        state = self._grid[self._index]
+        rect = self.draw_state(screen, self._x, self._y, state)
+        self._grid[self._index] = state & ~self.REDRAW
 
-        screen.blit(self._surface, self._pos)
-        self._surface_updated = False
+        return rect
 
     def hightlight(self, screen):
-        screen.fill(self.HIGHTLIGHT_COLOR, pygame.Rect(self._pos, (Cell.SIZE, Cell.SIZE)))
+        return screen.fill(self.HIGHTLIGHT_COLOR, pygame.Rect(self.pos, (Cell.SIZE, Cell.SIZE)))
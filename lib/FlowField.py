@@ -0,0 +1,76 @@
+from array import array
+
+from .Cell import Cell
+from .Wavefront import Wavefront
+
+
+class FlowField():
+    '''
+    Paths of all the cells to a goal cell, from a single search rooted at the goal (see Wavefront):
+    the direction toward the goal (a wall bit, see Cell.WALL_BITS) and the remaining distance of each cell.
+    The path of any start is then followed from cell to cell, without search (see Map.get_flow_field).
+    '''
+
+    UNREACHABLE = Wavefront.UNREACHABLE
+
+    def __init__(self, map_grid, goal_pos):
+        self._cols = map_grid.cols
+        self._rows = map_grid.rows
+        self._goal = goal_pos[1] * self._cols + goal_pos[0]
+
+        wavefront = Wavefront(map_grid, goal_pos)
+
+        # shape: (rows, cols), int32 and uint8
+        self.distances = wavefront.distances
+        self.directions = wavefront.get_directions()
+
+        # offset of the next cell of each direction
+        self._deltas = {Cell.WALL_BITS[cardinality]: d_y * self._cols + d_x for cardinality, (d_x, d_y) in (
+            ('N', (0, -1)),
+            ('S', (0, +1)),
+            ('E', (+1, 0)),
+            ('W', (-1, 0)),
+        )}
+        self._directions_bytes = self.directions.tobytes()
+
+    @property
+    def goal_pos(self):
+        return (self._goal % self._cols, self._goal // self._cols)
+
+    @property
+    def nbytes(self):
+        return self.distances.nbytes + self.directions.nbytes
+
+    def get_distance(self, start_pos):
+        '''
+        Length of the path from start_pos to the goal, None if the goal is not reachable.
+        '''
+        distance = int(self.distances[start_pos[1], start_pos[0]])
+        return distance if distance != self.UNREACHABLE else None
+
+    def get_path_indexes(self, start_pos):
+        '''
+        Cells indexes (y * cols + x) of the path from start_pos to the goal, None if the goal is not reachable.
+        '''
+        if self.get_distance(start_pos) is None:
+            return None
+
+        directions = self._directions_bytes
+        deltas = self._deltas
+
+        index = start_pos[1] * self._cols + start_pos[0]
+        path = array('i', [index])
+        while index != self._goal:
+            index += deltas[directions[index]]
+            path.append(index)
+
+        return path
+
+    def get_path(self, start_pos):
+        '''
+        Positions of the cells of the path from start_pos to the goal, None if the goal is not reachable.
+        '''
+        path = self.get_path_indexes(start_pos)
+        if path is None:
+            return None
+        return [(index % self._cols, index // self._cols) for index in path]
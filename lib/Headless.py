@@ -0,0 +1,119 @@
+
+import random
+import time
+
+from .Map import Map
+from .Maze import Maze
+from .ParallelMaze import ParallelMaze
+from .Pathfinder import Pathfinder
+
+
+class HeadlessSolver():
+    '''
+    Generate and solve mazes without display, surfaces or frame pacing.
+    Each solved maze gives a result dict (JSON serializable).
+    '''
+
+    DEFAULT_COLS = 100
+    DEFAULT_ROWS = 100
+
+    UPDATES_PER_STEP = 10000
+
+    def __init__(self, cols=None, rows=None, start_pos=None, end_pos=None, data_to_load=None, seed=None, workers=None, algorithm=Maze.DEFAULT_ALGORITHM, solver=Pathfinder.DEFAULT_SOLVER, cache=None, flow_field=False):
+        assert(data_to_load is None or (cols is None and rows is None))
+        assert(cols is None or cols > 0)
+        assert(rows is None or rows > 0)
+        assert(workers is None or workers > 0)
+
+        self._cols = cols if cols is not None else self.DEFAULT_COLS
+        self._rows = rows if rows is not None else self.DEFAULT_ROWS
+
+        self._start_pos = start_pos
+        self._end_pos = end_pos
+
+        self._data_to_load = data_to_load
+
+        self._seed = seed
+
+        self._algorithm = algorithm
+        self._solver = solver
+        self._cache = cache
+        self._flow_field = flow_field
+
+        # more than one worker: the maze is generated by tiles in parallel (see ParallelMaze)
+        self._workers = workers
+
+    @property
+    def algorithm(self):
+        if self._data_to_load is not None:
+            return None
+        if self._workers is not None and self._workers > 1:
+            return 'parallel'
+        return self._algorithm
+
+    def _get_seed(self, index):
+        if self._seed is None:
+            return random.SystemRandom().randrange(2**32)
+        return self._seed + index
+
+    def _init_map(self, seed):
+        if self._data_to_load is not None:
+            return Map(None, None, None, self._data_to_load, headless=True, seed=seed)
+        return Map(None, self._cols, self._rows, headless=True, seed=seed)
+
+    def generate(self, map_grid):
+        # the maze is determined by the seed of the map
+        if self._workers is not None and self._workers > 1:
+            ParallelMaze(map_grid, workers=self._workers).generate()
+            return
+
+        Maze(map_grid, self._algorithm).generate()
+
+    def solve(self, map_grid):
+        assert(self._start_pos is None or (0 <= self._start_pos[0] < map_grid.cols and 0 <= self._start_pos[1] < map_grid.rows))
+        assert(self._end_pos is None or (0 <= self._end_pos[0] < map_grid.cols and 0 <= self._end_pos[1] < map_grid.rows))
+
+        pathfinder = Pathfinder(map_grid, self._start_pos, self._end_pos, self._solver, self._cache, flow_field=self._flow_field)
+        while not pathfinder.path_found() and not pathfinder.is_exhausted:
+            pathfinder.update(multiple_update_counter=self.UPDATES_PER_STEP)
+        # the walls do not change anymore
+        pathfinder.close()
+
+        return pathfinder
+
+    def run_one(self, seed):
+        time_start = time.perf_counter()
+
+        map_grid = self._init_map(seed)
+        if self._data_to_load is None:
+            self.generate(map_grid)
+
+        time_generated = time.perf_counter()
+
+        pathfinder = self.solve(map_grid)
+
+        time_solved = time.perf_counter()
+
+        return {
+            'cols': map_grid.cols,
+            'rows': map_grid.rows,
+            'seed': seed,
+            'algorithm': self.algorithm,
+            'solver': pathfinder.solver,
+            'cached': pathfinder.is_cached,
+            'flow_field': pathfinder.is_flow_field,
+            'start_pos': pathfinder.start_pos,
+            'end_pos': pathfinder.end_pos,
+            'path_found': pathfinder.path_found(),
+            'path_length': len(pathfinder) if pathfinder.path_found() else None,
+            'nodes_expanded': pathfinder.expanded_count,
+            'generation_time': time_generated - time_start,
+            'solve_time': time_solved - time_generated,
+            'wall_time': time_solved - time_start,
+        }
+
+    def run(self, count=1):
+        assert(count > 0)
+
+        for index in range(0, count):
+            yield self.run_one(self._get_seed(index))
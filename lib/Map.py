@@ -1,11 +1,17 @@
 
 from os.path import exists as file_exists
+import hashlib
+from collections import OrderedDict
 
 import random
 
+import numpy as np
 import pygame
 
 from .Cell import Cell
+from .MazeTree import MazeTree
+from .MazeHierarchy import MazeHierarchy
+from .FlowField import FlowField
 
 
 class Map():
@@ -18,16 +24,57 @@ class Map():
         (-1, 0): 'E',
     }
 
-    def __init__(self, screen_size, cols, rows, data_to_load=None):
+    # offset of the neighbor behind each wall of a cell (in the order of _NEIGHBOR_OFFSETS)
+    _WALL_OFFSETS = (
+        ('N', (0, -1)),
+        ('S', (0, +1)),
+        ('E', (+1, 0)),
+        ('W', (-1, 0)),
+    )
+
+    # flow fields kept by goal (least recently used evicted first, see get_flow_field)
+    FLOW_FIELDS_MAX = 4
+
+    def __init__(self, screen_size, cols, rows, data_to_load=None, headless=False, seed=None):
         assert(data_to_load is None or (cols is None and rows is None))
         assert(data_to_load is not None or (cols is not None and rows is not None))
         assert(cols is None or cols > 0)
         assert(rows is None or rows > 0)
 
-        self._cells = []
+        # one byte per cell (walls and flags bits, see Cell), indexed by y * cols + x
+        self.grid = None
         self.cols = None
         self.rows = None
 
+        # headless map: no screen, nothing is drawn
+        self.headless = headless
+
+        # random generator of the map (maze generation, random cells): the seed and the dimensions determine the maze
+        # (drawn from the global random generator if not given)
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.random = random.Random(self.seed)
+
+        # adjacency index (see build_adjacency)
+        self._open_masks = None
+        self._open_offsets = None
+        self._open_deltas = None
+
+        # paths index of the perfect mazes (see tree)
+        self._tree = None
+
+        # abstract graph of the hierarchical path finding (see hierarchy)
+        self._hierarchy = None
+
+        # goal index => FlowField (see get_flow_field)
+        self._flow_fields = OrderedDict()
+
+        # callbacks notified of the walls changed at runtime (see set_wall)
+        self._subscribers = []
+
+        # generator of the walls (see start_generation), the loaded maps are already generated
+        self._maze = None
+        self._is_loaded = data_to_load is not None
+
         if data_to_load is not None:
             self._load_existing_map(screen_size, data_to_load)
         else:
@@ -36,7 +83,37 @@ class Map():
     def __len__(self):
         return self.cols * self.rows
 
+    @property
+    def grid_array(self):
+        # numpy view (no copy) of the grid, shape: (rows, cols)
+        # (a copy for packed grids loaded from a binary maze file)
+        if isinstance(self.grid, bytearray):
+            return np.frombuffer(self.grid, dtype=np.uint8).reshape(self.rows, self.cols)
+        return self.grid.unpack().reshape(self.rows, self.cols)
+
+    @property
+    def nbytes(self):
+        if isinstance(self.grid, bytearray):
+            return len(self.grid)
+        return self.grid.nbytes
+
+    @property
+    def bytes_per_cell(self):
+        return self.nbytes / len(self)
+
+    @property
+    def walls_hash(self):
+        # content hash of the dimensions and the walls (same for a generated maze and its saved file)
+        walls = self.grid_array & Cell.WALLS_MASK
+        return hashlib.blake2b(f'{self.cols}x{self.rows}:'.encode('utf-8') + walls.tobytes(), digest_size=16).hexdigest()
+
     def _init_dimensions(self, screen_size, cols, rows):
+        if self.headless:
+            assert(cols is not None and rows is not None)
+            self.cols = cols
+            self.rows = rows
+            return
+
         screen_w, screen_h = screen_size
 
         if cols is None:
@@ -51,36 +128,49 @@ class Map():
         self.rows = rows
 
     def _load_existing_map(self, screen_size, data_to_load):
+        if not isinstance(data_to_load, dict):
+            # binary maze file (see MazeFile), the grid is used as is
+            self._init_dimensions(screen_size, data_to_load.cols, data_to_load.rows)
+            self.grid = data_to_load.grid
+            # the seed of the maze read (saved again with it), the random cells are still drawn from the given seed
+            if data_to_load.seed is not None:
+                self.seed = data_to_load.seed
+            return
+
         self._init_dimensions(screen_size, data_to_load['cols'], data_to_load['rows'])
-        self._cells = [Cell.load(cell_data) for cell_data in data_to_load['cells']]
+        self.grid = bytearray(len(self))
+        for cell_data in data_to_load['cells']:
+            Cell.load(self, cell_data)
 
     def save(self):
         return {
             'cols': self.cols,
             'rows': self.rows,
-            'cells': [cell.save() for cell in self._cells],
+            'cells': [cell.save() for cell in self.cells()],
         }
 
     def _generate_empty_map(self, screen_size, cols, rows):
         self._init_dimensions(screen_size, cols, rows)
 
+        self.grid = bytearray([Cell.INITIAL_STATE]) * len(self)
+
+    def cells(self):
         for y in range(0, self.rows):
             for x in range(0, self.cols):
-                cell = Cell(x, y)
-                self._cells.append(cell)
+                yield Cell(self, x, y)
 
     def get_cell(self, x, y):
         if x < 0 or y < 0 or \
            x > self.cols - 1 or y > self.rows - 1:
             return None
 
-        return self._cells[y * self.cols + x]
+        return Cell(self, x, y)
 
     def get_random_cell(self):
-        return random.sample(self._cells, 1)[0]
+        return self.get_cell(*self.get_random_cell_pos())
 
     def get_random_cell_pos(self):
-        return (random.randint(0, self.cols - 1), random.randint(0, self.rows - 1))
+        return (self.random.randint(0, self.cols - 1), self.random.randint(0, self.rows - 1))
 
     def _is_neighbor(self, cell, wall_cardinality=None):
         if cell is None:
@@ -101,7 +191,212 @@ class Map():
 
         return neighbors
 
+    def get_neighbors(self, cell):
+        neighbors = []
+
+        for offset in self._NEIGHBOR_OFFSETS:
+            n = self.get_cell(cell.x + offset[0], cell.y + offset[1])
+            if n is not None:
+                neighbors.append(n)
+
+        return neighbors
+
+    @property
+    def has_adjacency(self):
+        return self._open_masks is not None
+
+    def build_adjacency(self):
+        '''
+        Index of the passages, to build once the maze is generated: one 4 bits mask per cell
+        with the bit of each wall (see Cell.WALL_BITS) leading to a reachable neighbor.
+        The index is a snapshot of the walls, it has to be rebuilt when a wall changes.
+        '''
+        walls = self.grid_array & Cell.WALLS_MASK
+        masks = np.zeros_like(walls)
+
+        # a neighbor is reachable when its wall facing the cell is open (same as find_neighbors)
+        def open_bit(neighbor_walls, neighbor_cardinality, cardinality):
+            return np.where(neighbor_walls & Cell.WALL_BITS[neighbor_cardinality], np.uint8(0), np.uint8(Cell.WALL_BITS[cardinality]))
+
+        masks[1:, :] |= open_bit(walls[:-1, :], 'S', 'N')
+        masks[:-1, :] |= open_bit(walls[1:, :], 'N', 'S')
+        masks[:, :-1] |= open_bit(walls[:, 1:], 'W', 'E')
+        masks[:, 1:] |= open_bit(walls[:, :-1], 'E', 'W')
+
+        masks = masks.tobytes()
+        if masks != self._open_masks:
+            # the walls changed: the indexes built from the former passages are outdated
+            self._tree = None
+            self._hierarchy = None
+            self._flow_fields.clear()
+        self._open_masks = bytearray(masks)
+        self._open_offsets = tuple(
+            tuple(offset for cardinality, offset in self._WALL_OFFSETS if mask & Cell.WALL_BITS[cardinality])
+            for mask in range(0, Cell.WALLS_MASK + 1)
+        )
+        self._open_deltas = tuple(
+            tuple(d_y * self.cols + d_x for d_x, d_y in offsets)
+            for offsets in self._open_offsets
+        )
+
+    def start_generation(self, maze):
+        '''
+        The walls are carved by maze (a Maze or a ParallelMaze): the indexes of the former walls are dropped,
+        the walls can be changed at runtime once it is done (see set_wall).
+        '''
+        self._maze = maze
+        self.clear_adjacency()
+
+    @property
+    def was_generated(self):
+        if self._maze is None:
+            return self._is_loaded
+        return self._maze.was_generated
+
+    def subscribe(self, callback):
+        '''
+        callback(index_a, index_b, closed) is called after each wall changed by set_wall.
+        '''
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def set_wall(self, pos_a, pos_b, closed):
+        '''
+        Add (closed) or remove the wall between two neighbor cells, once the maze is generated.
+        The adjacency index is updated, the indexes built from the former walls are dropped (see build_adjacency),
+        then the subscribers are notified (see subscribe).
+        '''
+        assert(self.was_generated), f'Error: The walls cannot be changed before the maze is generated ({pos_a} {pos_b})'
+
+        offset = (pos_b[0] - pos_a[0], pos_b[1] - pos_a[1])
+        assert(offset in self._NEIGHBOR_OFFSETS), f'Error: {pos_a} and {pos_b} are not neighbors'
+
+        cell_a = self.get_cell(*pos_a)
+        cell_b = self.get_cell(*pos_b)
+        assert(cell_a is not None and cell_b is not None), f'Error: Invalid cells {pos_a} {pos_b}'
+
+        # wall of b facing a, and of a facing b
+        cardinality_b = self._NEIGHBOR_OFFSETS[offset]
+        cardinality_a = next(cardinality for cardinality, wall_offset in self._WALL_OFFSETS if wall_offset == offset)
+        if cell_a.is_wall(cardinality_a) == closed and cell_b.is_wall(cardinality_b) == closed:
+            return
+
+        if closed:
+            cell_a.add_wall(cardinality_a)
+            cell_b.add_wall(cardinality_b)
+        else:
+            cell_a.remove_wall(cardinality_a)
+            cell_b.remove_wall(cardinality_b)
+
+        index_a = pos_a[1] * self.cols + pos_a[0]
+        index_b = pos_b[1] * self.cols + pos_b[0]
+        if self._open_masks is not None:
+            bit_a, bit_b = Cell.WALL_BITS[cardinality_a], Cell.WALL_BITS[cardinality_b]
+            if closed:
+                self._open_masks[index_a] &= ~bit_a
+                self._open_masks[index_b] &= ~bit_b
+            else:
+                self._open_masks[index_a] |= bit_a
+                self._open_masks[index_b] |= bit_b
+        self._tree = None
+        self._hierarchy = None
+        self._flow_fields.clear()
+
+        for callback in self._subscribers:
+            callback(index_a, index_b, closed)
+
+    def add_wall(self, pos_a, pos_b):
+        self.set_wall(pos_a, pos_b, True)
+
+    def remove_wall(self, pos_a, pos_b):
+        self.set_wall(pos_a, pos_b, False)
+
+    @property
+    def open_masks(self):
+        # open directions mask of each cell (see build_adjacency), None if the index is not built
+        return self._open_masks
+
+    def get_open_arrays(self):
+        '''
+        Open directions of the cells as 4 boolean arrays (N, S, E, W) of shape (rows, cols) (requires build_adjacency).
+        '''
+        masks = np.frombuffer(self._open_masks, dtype=np.uint8).reshape(self.rows, self.cols)
+        return tuple(masks & Cell.WALL_BITS[cardinality] != 0 for cardinality in Cell.CARDINALITIES)
+
+    def clear_adjacency(self):
+        self._open_masks = None
+        self._open_offsets = None
+        self._open_deltas = None
+        self._tree = None
+        self._hierarchy = None
+        self._flow_fields.clear()
+
+    @property
+    def tree(self):
+        '''
+        Paths index of the maze (see MazeTree), built on first use once the maze is generated:
+        many paths can then be queried without solving the maze each time.
+        '''
+        if self._tree is None:
+            self._tree = MazeTree(self)
+        return self._tree
+
+    @property
+    def hierarchy(self):
+        '''
+        Abstract graph of the maze by clusters (see MazeHierarchy), built on first use once the maze is generated
+        and shared by the hierarchical path finding queries.
+        '''
+        if self._hierarchy is None:
+            self.build_hierarchy()
+        return self._hierarchy
+
+    def build_hierarchy(self, cluster_size=MazeHierarchy.CLUSTER_SIZE):
+        self._hierarchy = MazeHierarchy(self, cluster_size)
+        return self._hierarchy
+
+    def get_path_length(self, start_pos, end_pos):
+        assert(self.tree.is_perfect), 'Error: The paths index requires a perfect maze (no loop)'
+        return self.tree.get_path_length(start_pos, end_pos)
+
+    def get_path(self, start_pos, end_pos):
+        assert(self.tree.is_perfect), 'Error: The paths index requires a perfect maze (no loop)'
+        return self.tree.get_path(start_pos, end_pos)
+
+    def get_flow_field(self, goal_pos):
+        '''
+        Paths of all the cells to goal_pos (see FlowField), computed once per goal and kept until the walls change
+        (see build_adjacency): the paths from many starts to the same goal are not searched again.
+        '''
+        assert(0 <= goal_pos[0] < self.cols and 0 <= goal_pos[1] < self.rows), f'Error: Invalid goal {goal_pos}'
+
+        if not self.has_adjacency:
+            self.build_adjacency()
+
+        key = goal_pos[1] * self.cols + goal_pos[0]
+        flow_field = self._flow_fields.get(key)
+        if flow_field is None:
+            flow_field = FlowField(self, goal_pos)
+            self._flow_fields[key] = flow_field
+            while len(self._flow_fields) > self.FLOW_FIELDS_MAX:
+                self._flow_fields.popitem(last=False)
+        self._flow_fields.move_to_end(key)
+
+        return flow_field
+
+    def find_neighbor_indexes(self, index):
+        '''
+        Indexes (y * cols + x) of the reachable neighbors of the cell at index (requires build_adjacency).
+        '''
+        return [index + delta for delta in self._open_deltas[self._open_masks[index]]]
+
     def find_neighbors(self, cell):
+        if self._open_masks is not None:
+            x, y = cell.x, cell.y
+            return [Cell(self, x + d_x, y + d_y) for d_x, d_y in self._open_offsets[self._open_masks[y * self.cols + x]]]
+
         neighbors = []
 
         for offset, cardinality in self._NEIGHBOR_OFFSETS.items():
@@ -114,8 +409,27 @@ class Map():
     def draw_all_cells(self, screen):
         self.draw(screen)
 
-        for cell in self._cells:
-            cell.draw(screen)
+        # the cells to redraw blit their tile at once (see Cell.get_tile)
+        states = self.grid_array.ravel()
+        indexes = np.flatnonzero(states & Cell.REDRAW)
+        keys = states[indexes] & Cell.TILE_MASK
+        tiles = {key: Cell.get_tile(screen, key) for key in np.unique(keys).tolist()}
+        positions = zip(((indexes % self.cols) * Cell.SIZE).tolist(), ((indexes // self.cols) * Cell.SIZE).tolist())
+        screen.blits(zip(map(tiles.__getitem__, keys.tolist()), positions), doreturn=False)
+
+        if isinstance(self.grid, bytearray):
+            states &= ~np.uint8(Cell.REDRAW)
+
+        return [screen.get_rect()]
 
     def draw(self, screen):
+        w, h = screen.get_size()
         pygame.draw.rect(screen, Cell.WALL_COLOR, screen.get_rect(), 1)
+
+        # only the border lines are updated
+        return [
+            pygame.Rect(0, 0, w, 1),
+            pygame.Rect(0, h - 1, w, 1),
+            pygame.Rect(0, 0, 1, h),
+            pygame.Rect(w - 1, 0, 1, h),
+        ]
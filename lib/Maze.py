@@ -1,72 +1,42 @@
 
-import random
+from .Cell import Cell
+from .MazeGenerators import GENERATORS
 
 
 class Maze():
 
-    def __init__(self, map_grid):
+    DEFAULT_ALGORITHM = 'backtracker'
+    ALGORITHMS = list(GENERATORS)
+
+    def __init__(self, map_grid, algorithm=DEFAULT_ALGORITHM, publish=False):
+        assert(algorithm in GENERATORS), f'Error: Unknown algorithm "{algorithm}" (available: {", ".join(self.ALGORITHMS)})'
+
         self._map = map_grid
+        # the passages index of the former walls is outdated, the walls cannot be changed until the maze is generated
+        self._map.start_generation(self)
 
-        self._current_cell = self._map.get_cell(0, 0)
-        self._stack = [self._current_cell]
+        self._generator = GENERATORS[algorithm](self._map)
 
-        self._visited_cells_count = 0
+        # updated in a worker thread (see Simulation): the cells are drawn from the published changes, not from the grid
+        self._publish = publish
+        self._published_cells = []
+        self._published_current = None
 
-        self._cells_to_redraw = set()
+    @property
+    def algorithm(self):
+        return self._generator.NAME
 
     @property
     def was_generated(self):
-        return len(self._stack) == 0
+        return self._generator.was_generated
+
+    @property
+    def is_simulation_done(self):
+        return self.was_generated
 
     @property
     def progression(self):
-        return self._visited_cells_count * 100.0 / len(self._map)
-
-    def _stack_pull(self, cell):
-        self._stack.append(cell)
-        cell.stack()
-
-    def _stack_pop(self):
-        cell = self._stack.pop()
-        cell.unstack()
-        return cell
-
-    def _find_random_neighbor(self, cell):
-        neighbors = self._map.discover_new_neighbors(cell)
-        if len(neighbors) > 0:
-            return random.sample(neighbors, 1)[0]
-
-    def _remove_wall(self, cell_cur, cell_next):
-        d_x = cell_cur.x - cell_next.x
-        if d_x == 1:            # goto to left
-            cell_cur.remove_wall('W')
-            cell_next.remove_wall('E')
-        elif d_x == -1:         # goto to right
-            cell_cur.remove_wall('E')
-            cell_next.remove_wall('W')
-
-        d_y = cell_cur.y - cell_next.y
-        if d_y == 1:            # goto to up
-            cell_cur.remove_wall('N')
-            cell_next.remove_wall('S')
-        elif d_y == -1:         # goto to down
-            cell_cur.remove_wall('S')
-            cell_next.remove_wall('N')
-
-    def _update_generator(self):
-        self._current_cell.visit()
-        self._visited_cells_count += 1
-
-        self._cells_to_redraw.add(self._current_cell)
-
-        next_cell = self._find_random_neighbor(self._current_cell)
-        if next_cell is not None:
-            self._remove_wall(self._current_cell, next_cell)
-            self._stack_pull(self._current_cell)
-            self._visited_cells_count -= 1
-            self._current_cell = next_cell
-        elif len(self._stack) > 0:
-            self._current_cell = self._stack_pop()
+        return self._generator.progression
 
     def update(self, multiple_update_counter=1):
         assert(multiple_update_counter > 0)
@@ -74,12 +44,56 @@ class Maze():
             return
 
         for _ in range(0, multiple_update_counter):
-            self._update_generator()
+            if self.was_generated:
+                return
+            self._generator.step()
+
+    def generate(self):
+        if self.was_generated:
+            return
+
+        self._generator.generate()
+
+    def pop_changes(self):
+        '''
+        States of the cells updated since the last call and the current cell (see Simulation).
+        '''
+        grid = self._map.grid
+        cols = self._map.cols
+        current_cell = self._generator.current_cell
+
+        return {
+            'cells': [(cell.x, cell.y, grid[cell.y * cols + cell.x]) for cell in self._generator.pop_cells_to_redraw()],
+            'current': (current_cell.x, current_cell.y) if current_cell is not None and not self.was_generated else None,
+        }
+
+    def apply_changes(self, changes):
+        # drawn at the next draw
+        self._published_cells += changes['cells']
+        self._published_current = changes['current']
+
+    def _draw_published(self, screen):
+        dirty_rects = [Cell.draw_state(screen, x, y, state) for x, y, state in self._published_cells]
+        self._published_cells = []
+
+        if self._published_current is not None:
+            dirty_rects.append(Cell(self._map, *self._published_current).hightlight(screen))
+
+        return dirty_rects
 
     def draw(self, screen):
-        for cell_to_redraw in self._cells_to_redraw:
-            cell_to_redraw.draw(screen)
-        self._cells_to_redraw.clear()
+        if self._publish:
+            return self._draw_published(screen)
+
+        dirty_rects = []
+
+        for cell_to_redraw in self._generator.pop_cells_to_redraw():
+            rect = cell_to_redraw.draw(screen)
+            if rect is not None:
+                dirty_rects.append(rect)
+
+        current_cell = self._generator.current_cell
+        if current_cell is not None and not self.was_generated:
+            dirty_rects.append(current_cell.hightlight(screen))
 
-        if len(self._stack) > 0:
-            self._current_cell.hightlight(screen)
+        return dirty_rects
@@ -0,0 +1,206 @@
+
+import json
+import struct
+
+import numpy as np
+
+from .Cell import Cell
+from .Map import Map
+from .Maze import Maze
+from .ParallelMaze import ParallelMaze
+
+
+class PackedGrid():
+    '''
+    Map grid backed by packed walls: 4 bits per cell (low nibble for even cells, high nibble for odd cells).
+    Only the walls are stored, the cells are always visited and to be drawn.
+    '''
+
+    CELL_FLAGS = Cell.VISITED | Cell.REDRAW
+
+    def __init__(self, packed, cells_count):
+        assert(len(packed) == (cells_count + 1) // 2)
+        self._packed = packed
+        self._data = memoryview(packed).cast('B')
+        self._cells_count = cells_count
+
+    def __len__(self):
+        return self._cells_count
+
+    def __getitem__(self, index):
+        return ((self._data[index >> 1] >> ((index & 1) << 2)) & Cell.WALLS_MASK) | self.CELL_FLAGS
+
+    def __setitem__(self, index, value):
+        shift = (index & 1) << 2
+        byte = self._data[index >> 1]
+        self._data[index >> 1] = (byte & ~(Cell.WALLS_MASK << shift) & 0xFF) | ((value & Cell.WALLS_MASK) << shift)
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    @property
+    def packed(self):
+        return self._packed
+
+    @classmethod
+    def pack(cls, grid):
+        walls = np.frombuffer(grid, dtype=np.uint8) & Cell.WALLS_MASK
+        if len(walls) % 2 == 1:
+            walls = np.append(walls, np.uint8(0))
+        return walls[0::2] | (walls[1::2] << 4)
+
+    def unpack(self):
+        packed = np.frombuffer(self._data, dtype=np.uint8)
+        walls = np.empty(len(packed) * 2, dtype=np.uint8)
+        walls[0::2] = packed & Cell.WALLS_MASK
+        walls[1::2] = packed >> 4
+        return walls[:self._cells_count] | self.CELL_FLAGS
+
+
+class MazeFile():
+    '''
+    Binary maze file:
+        - header (32 bytes): magic, version, flags, cols, rows, seed, algorithm (index in ALGORITHMS, version 2)
+        - walls: 4 bits per cell (see PackedGrid), cells indexed by y * cols + x
+
+    The walls are memory mapped (copy on write) so opening a maze does not read the file.
+    Without walls (FLAG_NO_WALLS) the file is only the header: the maze is generated again from the seed,
+    the dimensions and the algorithm.
+    '''
+
+    MAGIC = b'MAZE'
+    VERSION = 2
+    HEADER = struct.Struct('<4sHHIIqH6x')
+
+    FLAG_SEED = 0x0001
+    FLAG_NO_WALLS = 0x0002
+
+    # the index of an algorithm is stored in the file: only append to this list
+    ALGORITHMS = ['backtracker', 'kruskal', 'prim', 'eller', 'wilson', 'binary-tree', 'sidewinder', 'parallel']
+    UNKNOWN_ALGORITHM = 0xFFFF
+
+    EXTENSION = '.maze'
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            header = f.read(self.HEADER.size)
+
+        assert(len(header) == self.HEADER.size), f'Error: Invalid maze file "{path}"'
+        magic, version, flags, cols, rows, seed, algorithm = self.HEADER.unpack(header)
+        assert(magic == self.MAGIC), f'Error: Invalid maze file "{path}"'
+        assert(version <= self.VERSION), f'Error: Unsupported maze file version {version} "{path}"'
+        assert(cols > 0 and rows > 0), f'Error: Invalid maze dimensions {cols}x{rows} "{path}"'
+
+        self.path = path
+        self.version = version
+        self.cols = cols
+        self.rows = rows
+        self.seed = seed if flags & self.FLAG_SEED else None
+        # the algorithm is not stored in the version 1 files
+        self.algorithm = self.ALGORITHMS[algorithm] if version >= 2 and algorithm < len(self.ALGORITHMS) else None
+
+        if flags & self.FLAG_NO_WALLS:
+            assert(self.seed is not None and self.algorithm is not None), f'Error: Maze file without walls nor seed "{path}"'
+            self.grid = self._generate_grid(cols, rows, self.seed, self.algorithm)
+            return
+
+        packed = np.memmap(path, dtype=np.uint8, mode='c', offset=self.HEADER.size, shape=((cols * rows + 1) // 2,))
+        self.grid = PackedGrid(packed, cols * rows)
+
+    @classmethod
+    def _generate_grid(cls, cols, rows, seed, algorithm):
+        map_grid = Map(None, cols, rows, headless=True, seed=seed)
+        if algorithm == 'parallel':
+            ParallelMaze(map_grid).generate()
+        else:
+            Maze(map_grid, algorithm).generate()
+
+        # packed like the walls read from a file
+        return PackedGrid(PackedGrid.pack(map_grid.grid), cols * rows)
+
+    @classmethod
+    def is_maze_file(cls, path):
+        with open(path, 'rb') as f:
+            return f.read(len(cls.MAGIC)) == cls.MAGIC
+
+    @classmethod
+    def load(cls, path):
+        '''
+        Data to load a Map: a MazeFile for binary files, the JSON data otherwise.
+        '''
+        if cls.is_maze_file(path):
+            return cls(path)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @classmethod
+    def _write_header(cls, f, cols, rows, seed=None, algorithm=None, walls=True):
+        flags = 0
+        if seed is not None:
+            flags |= cls.FLAG_SEED
+        if not walls:
+            flags |= cls.FLAG_NO_WALLS
+
+        algorithm_index = cls.ALGORITHMS.index(algorithm) if algorithm in cls.ALGORITHMS else cls.UNKNOWN_ALGORITHM
+
+        f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, flags, cols, rows, seed if seed is not None else 0, algorithm_index))
+
+    @classmethod
+    def write(cls, path, map_grid, seed=None, algorithm=None, walls=True):
+        '''
+        Without walls only the header is written, the maze must be determined by the seed and the algorithm (see Map.seed).
+        '''
+        assert(walls or (seed is not None and algorithm in cls.ALGORITHMS)), f'Error: The maze cannot be saved without walls (seed: {seed}, algorithm: {algorithm})'
+
+        with open(path, 'wb') as f:
+            cls._write_header(f, map_grid.cols, map_grid.rows, seed, algorithm, walls)
+            if not walls:
+                return
+
+            if isinstance(map_grid.grid, PackedGrid):
+                packed = map_grid.grid.packed
+            else:
+                packed = PackedGrid.pack(map_grid.grid)
+            f.write(memoryview(packed).cast('B'))
+
+    @classmethod
+    def write_rows(cls, path, cols, rows, rows_walls, seed=None, algorithm=None):
+        '''
+        Write a maze row by row without map: rows_walls yields the walls of each row (cols bytes, see Cell bits),
+        only one row is in memory at a time (see EllerRows).
+        '''
+        rows_count = 0
+
+        with open(path, 'wb') as f:
+            cls._write_header(f, cols, rows, seed, algorithm)
+
+            # a row can start in the middle of a byte when cols is odd
+            last_walls = np.empty(0, dtype=np.uint8)
+            for walls in rows_walls:
+                assert(len(walls) == cols)
+                walls = np.concatenate((last_walls, np.frombuffer(walls, dtype=np.uint8) & Cell.WALLS_MASK))
+
+                pairs_count = len(walls) // 2
+                f.write((walls[0:pairs_count * 2:2] | (walls[1:pairs_count * 2:2] << 4)).tobytes())
+                last_walls = walls[pairs_count * 2:]
+
+                rows_count += 1
+
+            if len(last_walls) > 0:
+                f.write(last_walls.tobytes())
+
+        assert(rows_count == rows), f'Error: {rows_count} rows written instead of {rows}'
+
+    @classmethod
+    def convert(cls, json_path, path=None):
+        if path is None:
+            path = json_path.rsplit('.', 1)[0] + cls.EXTENSION
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            map_grid = Map(None, None, None, json.load(f), headless=True)
+
+        cls.write(path, map_grid)
+
+        return path
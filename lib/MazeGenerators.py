@@ -0,0 +1,511 @@
+
+import random
+
+import numpy as np
+
+from .Cell import Cell
+
+
+class MazeGenerator():
+    '''
+    Base of the maze generation algorithms.
+    A generator carves the walls of the map step by step (see step()), or at once (see generate()).
+    '''
+
+    NAME = None
+
+    def __init__(self, map_grid):
+        self._map = map_grid
+
+        # random generator of the map: the seed of the map determines the maze
+        self._random = map_grid.random
+
+        self._current_cell = None
+        self._visited_cells_count = 0
+
+        self._cells_to_redraw = set()
+
+    @property
+    def was_generated(self):
+        raise NotImplementedError
+
+    @property
+    def progression(self):
+        return self._visited_cells_count * 100.0 / len(self._map)
+
+    @property
+    def current_cell(self):
+        return self._current_cell
+
+    def pop_cells_to_redraw(self):
+        cells_to_redraw = self._cells_to_redraw
+        self._cells_to_redraw = set()
+        return cells_to_redraw
+
+    def _visit(self, cell):
+        if not cell.is_visited:
+            self._visited_cells_count += 1
+        cell.visit()
+
+        if not self._map.headless:
+            self._cells_to_redraw.add(cell)
+
+    def _redraw(self, cell):
+        if not self._map.headless:
+            self._cells_to_redraw.add(cell)
+
+    def _remove_wall(self, cell_cur, cell_next):
+        d_x = cell_cur.x - cell_next.x
+        if d_x == 1:            # goto to left
+            cell_cur.remove_wall('W')
+            cell_next.remove_wall('E')
+        elif d_x == -1:         # goto to right
+            cell_cur.remove_wall('E')
+            cell_next.remove_wall('W')
+
+        d_y = cell_cur.y - cell_next.y
+        if d_y == 1:            # goto to up
+            cell_cur.remove_wall('N')
+            cell_next.remove_wall('S')
+        elif d_y == -1:         # goto to down
+            cell_cur.remove_wall('S')
+            cell_next.remove_wall('N')
+
+        self._redraw(cell_cur)
+        self._redraw(cell_next)
+
+    def step(self):
+        raise NotImplementedError
+
+    def generate(self):
+        while not self.was_generated:
+            self.step()
+
+
+class BacktrackerGenerator(MazeGenerator):
+    '''
+    Randomized depth first search: long corridors, few dead ends.
+    One step: one move forward or backward.
+    '''
+
+    NAME = 'backtracker'
+
+    def __init__(self, map_grid):
+        super().__init__(map_grid)
+
+        self._current_cell = self._map.get_cell(0, 0)
+        self._stack = [self._current_cell]
+
+    @property
+    def was_generated(self):
+        return len(self._stack) == 0
+
+    def _stack_pull(self, cell):
+        self._stack.append(cell)
+        cell.stack()
+
+    def _stack_pop(self):
+        cell = self._stack.pop()
+        cell.unstack()
+        return cell
+
+    def _find_random_neighbor(self, cell):
+        neighbors = self._map.discover_new_neighbors(cell)
+        if len(neighbors) > 0:
+            return self._random.sample(neighbors, 1)[0]
+
+    def step(self):
+        self._visit(self._current_cell)
+
+        next_cell = self._find_random_neighbor(self._current_cell)
+        if next_cell is not None:
+            self._remove_wall(self._current_cell, next_cell)
+            self._stack_pull(self._current_cell)
+            self._current_cell = next_cell
+        elif len(self._stack) > 0:
+            self._current_cell = self._stack_pop()
+
+
+class KruskalGenerator(MazeGenerator):
+    '''
+    Randomized Kruskal: the walls are removed in a random order when they separate two distinct sets of cells (union-find).
+    One step: one wall.
+    '''
+
+    NAME = 'kruskal'
+
+    def __init__(self, map_grid):
+        super().__init__(map_grid)
+
+        cols, rows = self._map.cols, self._map.rows
+
+        # walls encoded as: cell index * 2 (+ 0: east wall, + 1: south wall)
+        self._walls = [(y * cols + x) * 2 for y in range(0, rows) for x in range(0, cols - 1)]
+        self._walls += [(y * cols + x) * 2 + 1 for y in range(0, rows - 1) for x in range(0, cols)]
+        self._random.shuffle(self._walls)
+
+        self._parents = list(range(0, len(self._map)))
+        self._links_count = 0
+
+        # no wall at all to remove
+        if len(self._map) == 1:
+            self._visit(self._map.get_cell(0, 0))
+
+    @property
+    def was_generated(self):
+        return self._links_count == len(self._map) - 1 or len(self._walls) == 0
+
+    def _find(self, index):
+        root = index
+        while self._parents[root] != root:
+            root = self._parents[root]
+        # path compression
+        while self._parents[index] != root:
+            self._parents[index], index = root, self._parents[index]
+        return root
+
+    def _get_cell(self, index):
+        return self._map.get_cell(index % self._map.cols, index // self._map.cols)
+
+    def step(self):
+        wall = self._walls.pop()
+        index_a = wall >> 1
+        index_b = index_a + (self._map.cols if wall & 1 else 1)
+
+        root_a = self._find(index_a)
+        root_b = self._find(index_b)
+        if root_a == root_b:
+            return
+
+        self._parents[root_b] = root_a
+        self._links_count += 1
+
+        cell_a = self._get_cell(index_a)
+        cell_b = self._get_cell(index_b)
+        self._remove_wall(cell_a, cell_b)
+        self._visit(cell_a)
+        self._visit(cell_b)
+        self._current_cell = cell_b
+
+
+class PrimGenerator(MazeGenerator):
+    '''
+    Randomized Prim: the maze grows from a random cell, a random cell of the frontier is linked to the maze at each step.
+    Short corridors, many dead ends.
+    One step: one cell.
+    '''
+
+    NAME = 'prim'
+
+    def __init__(self, map_grid):
+        super().__init__(map_grid)
+
+        self._in_frontier = bytearray(len(self._map))
+        self._frontier = []
+
+        start = self._map.get_random_cell()
+        self._visit(start)
+        self._add_to_frontier(start)
+        self._current_cell = start
+
+    @property
+    def was_generated(self):
+        return len(self._frontier) == 0
+
+    def _add_to_frontier(self, cell):
+        for n in self._map.discover_new_neighbors(cell):
+            index = n.y * self._map.cols + n.x
+            if not self._in_frontier[index]:
+                self._in_frontier[index] = 1
+                self._frontier.append(n)
+
+    def step(self):
+        # random pick in O(1): swap with the last one
+        i = self._random.randrange(len(self._frontier))
+        self._frontier[i], self._frontier[-1] = self._frontier[-1], self._frontier[i]
+        cell = self._frontier.pop()
+
+        neighbors = [n for n in self._map.get_neighbors(cell) if n.is_visited]
+        self._remove_wall(cell, self._random.choice(neighbors))
+        self._visit(cell)
+        self._add_to_frontier(cell)
+        self._current_cell = cell
+
+
+class EllerRows():
+    '''
+    Eller algorithm without map: the rows are yielded one by one as soon as they are finalized
+    (walls bits of each cell, see Cell), only the sets of the current row are kept (O(cols) memory).
+    The rows are determined by the random generator: EllerRows(cols, rows, random.Random(seed)) yields the
+    same maze as EllerGenerator on a Map with that seed.
+    '''
+
+    JOIN_PROBABILITY = 0.5
+
+    def __init__(self, cols, rows, rng=None):
+        assert(cols > 0 and rows > 0)
+
+        self.cols = cols
+        self.rows = rows
+        self._random = rng if rng is not None else random.Random()
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        cols = self.cols
+
+        row_sets = [None] * cols
+        next_set_id = 0
+        # cells linked to the previous row
+        north_links = bytearray(cols)
+
+        for y in range(0, self.rows):
+            last_row = y == self.rows - 1
+
+            walls = bytearray([Cell.WALLS_MASK]) * cols
+
+            # columns of each set of the row
+            sets = {}
+            for x in range(0, cols):
+                if row_sets[x] is None:
+                    row_sets[x] = next_set_id
+                    next_set_id += 1
+                sets.setdefault(row_sets[x], []).append(x)
+
+                if north_links[x]:
+                    walls[x] &= ~Cell.WALL_BITS['N']
+
+            # horizontal links (all the remaining sets are joined on the last row)
+            for x in range(0, cols - 1):
+                set_a = row_sets[x]
+                set_b = row_sets[x + 1]
+                if set_a == set_b:
+                    continue
+                if last_row or self._random.random() < self.JOIN_PROBABILITY:
+                    walls[x] &= ~Cell.WALL_BITS['E']
+                    walls[x + 1] &= ~Cell.WALL_BITS['W']
+                    # the smallest set is merged in the biggest one
+                    if len(sets[set_a]) < len(sets[set_b]):
+                        set_a, set_b = set_b, set_a
+                    for i in sets[set_b]:
+                        row_sets[i] = set_a
+                    sets[set_a] += sets.pop(set_b)
+
+            # vertical links: at least one per set
+            next_row_sets = [None] * cols
+            north_links = bytearray(cols)
+            if not last_row:
+                for set_id, members in sets.items():
+                    self._random.shuffle(members)
+                    for x in members[:self._random.randint(1, len(members))]:
+                        walls[x] &= ~Cell.WALL_BITS['S']
+                        next_row_sets[x] = set_id
+                        north_links[x] = 1
+
+            row_sets = next_row_sets
+
+            yield walls
+
+
+class EllerGenerator(MazeGenerator):
+    '''
+    Eller: the maze is carved row by row (see EllerRows).
+    One step: one row.
+    '''
+
+    NAME = 'eller'
+
+    def __init__(self, map_grid):
+        super().__init__(map_grid)
+
+        self._row = 0
+        self._rows = iter(EllerRows(self._map.cols, self._map.rows, self._random))
+
+    @property
+    def was_generated(self):
+        return self._row >= self._map.rows
+
+    def step(self):
+        y = self._row
+        walls = next(self._rows)
+
+        for x in range(0, self._map.cols):
+            self._current_cell = self._map.get_cell(x, y)
+            for cardinality in Cell.CARDINALITIES:
+                if not walls[x] & Cell.WALL_BITS[cardinality]:
+                    self._current_cell.remove_wall(cardinality)
+            self._visit(self._current_cell)
+
+        self._row += 1
+
+
+class WilsonGenerator(MazeGenerator):
+    '''
+    Wilson: loop-erased random walks from the cells out of the maze until they reach the maze.
+    Unbiased (uniform spanning tree), slow start.
+    One step: one move of the random walk.
+    '''
+
+    NAME = 'wilson'
+
+    def __init__(self, map_grid):
+        super().__init__(map_grid)
+
+        # cells in a random order, the walks start from the first one not in the maze
+        self._starts = list(range(0, len(self._map)))
+        self._random.shuffle(self._starts)
+
+        self._visit(self._get_cell(self._starts.pop()))
+
+        # the last exit of each cell of the walk (erases the loops)
+        self._walk_start = None
+        self._walk_next = {}
+
+    @property
+    def was_generated(self):
+        return self._walk_start is None and len(self._starts) == 0
+
+    def _get_cell(self, index):
+        return self._map.get_cell(index % self._map.cols, index // self._map.cols)
+
+    def _carve_walk(self):
+        cell = self._walk_start
+        while not cell.is_visited:
+            next_cell = self._walk_next[cell]
+            self._remove_wall(cell, next_cell)
+            self._visit(cell)
+            cell = next_cell
+
+        self._walk_start = None
+        self._walk_next.clear()
+
+    def step(self):
+        if self._walk_start is None:
+            while len(self._starts) > 0 and self._walk_start is None:
+                cell = self._get_cell(self._starts.pop())
+                if not cell.is_visited:
+                    self._walk_start = cell
+                    self._current_cell = cell
+            if self._walk_start is None:
+                return
+
+        next_cell = self._random.choice(self._map.get_neighbors(self._current_cell))
+        self._walk_next[self._current_cell] = next_cell
+        self._current_cell = next_cell
+
+        if next_cell.is_visited:
+            self._carve_walk()
+
+
+class BinaryTreeGenerator(MazeGenerator):
+    '''
+    Binary tree: each cell is linked to its north or west neighbor.
+    Strongly biased (open first row and column) but the fastest one, fully vectorized in generate().
+    One step: one cell.
+    '''
+
+    NAME = 'binary-tree'
+
+    def __init__(self, map_grid):
+        super().__init__(map_grid)
+
+        self._index = 0
+
+        # north (True) or west (False) of each cell, drawn at once so that step() and generate() carve the same maze
+        rng = np.random.default_rng(self._random.getrandbits(64))
+        self._go_north = rng.random((self._map.rows, self._map.cols)) < 0.5
+        self._go_north[0, :] = False
+        self._go_north[:, 0] = True
+        self._go_north[0, 0] = False
+
+    @property
+    def was_generated(self):
+        return self._index >= len(self._map)
+
+    def step(self):
+        x = self._index % self._map.cols
+        y = self._index // self._map.cols
+        self._index += 1
+
+        cell = self._map.get_cell(x, y)
+        self._current_cell = cell
+
+        if self._go_north[y, x]:
+            self._remove_wall(cell, self._map.get_cell(x, y - 1))
+        elif x > 0:
+            self._remove_wall(cell, self._map.get_cell(x - 1, y))
+        self._visit(cell)
+
+    def generate(self):
+        if not isinstance(self._map.grid, bytearray) or self._index > 0:
+            super().generate()
+            return
+
+        grid = self._map.grid_array
+
+        go_north = self._go_north
+        go_west = ~go_north
+        go_west[0, 0] = False
+
+        grid[go_north] &= ~np.uint8(Cell.WALL_BITS['N'])
+        grid[:-1, :][go_north[1:, :]] &= ~np.uint8(Cell.WALL_BITS['S'])
+        grid[go_west] &= ~np.uint8(Cell.WALL_BITS['W'])
+        grid[:, :-1][go_west[:, 1:]] &= ~np.uint8(Cell.WALL_BITS['E'])
+        grid |= np.uint8(Cell.VISITED | Cell.REDRAW)
+
+        self._index = len(self._map)
+        self._visited_cells_count = len(self._map)
+
+
+class SidewinderGenerator(MazeGenerator):
+    '''
+    Sidewinder: each row is cut in runs of cells linked eastward, each run is linked once to the row above.
+    Open first row, fast and simple.
+    One step: one cell.
+    '''
+
+    NAME = 'sidewinder'
+
+    CLOSE_RUN_PROBABILITY = 0.5
+
+    def __init__(self, map_grid):
+        super().__init__(map_grid)
+
+        self._index = 0
+        self._run = []
+
+    @property
+    def was_generated(self):
+        return self._index >= len(self._map)
+
+    def step(self):
+        x = self._index % self._map.cols
+        y = self._index // self._map.cols
+        self._index += 1
+
+        cell = self._map.get_cell(x, y)
+        self._current_cell = cell
+        self._visit(cell)
+        self._run.append(cell)
+
+        last_col = x == self._map.cols - 1
+        if y > 0 and (last_col or self._random.random() < self.CLOSE_RUN_PROBABILITY):
+            run_cell = self._random.choice(self._run)
+            self._remove_wall(run_cell, self._map.get_cell(run_cell.x, y - 1))
+            self._run = []
+        elif not last_col:
+            self._remove_wall(cell, self._map.get_cell(x + 1, y))
+        else:
+            self._run = []
+
+
+GENERATORS = {generator.NAME: generator for generator in (
+    BacktrackerGenerator,
+    KruskalGenerator,
+    PrimGenerator,
+    EllerGenerator,
+    WilsonGenerator,
+    BinaryTreeGenerator,
+    SidewinderGenerator,
+)}
@@ -0,0 +1,198 @@
+from collections import deque
+
+import numpy as np
+
+from .Cell import Cell
+
+
+class MazeHierarchy():
+    '''
+    Abstract graph of a maze for the hierarchical path finding (HPA*, see HierarchicalSolver):
+    the map is split in clusters of cluster_size x cluster_size cells, each passage through the border
+    of two clusters (an entrance, one cell wide in a maze) gives a node on each side, linked at a distance of 1.
+    The nodes of a cluster are linked by their distances inside the cluster, precomputed once.
+    A path is then searched on the nodes, and refined cell by cell only in the clusters it goes through.
+    All the passages are entrances: the paths found are the shortest ones.
+
+    The distances inside the clusters are computed by breadth first searches in array operations
+    (see Wavefront), from the k-th node of all the clusters at once (the passages between clusters are cut).
+
+    Source: https://webdocs.cs.ualberta.ca/~mmueller/ps/hpastar.pdf
+    '''
+
+    CLUSTER_SIZE = 16
+
+    def __init__(self, map_grid, cluster_size=CLUSTER_SIZE):
+        assert(cluster_size > 1), f'Error: Invalid cluster size {cluster_size}'
+
+        if not map_grid.has_adjacency:
+            map_grid.build_adjacency()
+
+        self._map = map_grid
+        self._cols = map_grid.cols
+        self._rows = map_grid.rows
+        self.cluster_size = cluster_size
+        self._clusters_cols = -(-self._cols // cluster_size)
+
+        masks = np.frombuffer(map_grid.open_masks, dtype=np.uint8).reshape(self._rows, self._cols)
+        entrances = self._init_nodes(masks)
+        self._init_edges(masks, entrances)
+
+    def _init_nodes(self, masks):
+        size = self.cluster_size
+        indexes = np.arange(self._cols * self._rows, dtype=np.int64).reshape(self._rows, self._cols)
+
+        # passages from the last column (row) of a cluster to the first one of the next cluster
+        east = indexes[:, size - 1:-1:size][masks[:, size - 1:-1:size] & Cell.WALL_BITS['E'] != 0]
+        south = indexes[size - 1:-1:size, :][masks[size - 1:-1:size, :] & Cell.WALL_BITS['S'] != 0]
+
+        # nodes ordered by cluster: nodes_cells[clusters_offsets[c]:clusters_offsets[c + 1]] are the nodes of the cluster c
+        cells = np.unique(np.concatenate((east, east + 1, south, south + self._cols)))
+        clusters = self.get_cluster(cells)
+        order = np.argsort(clusters, kind='stable')
+        self._nodes_cells = cells[order].astype(np.int32)
+        self._nodes_clusters = clusters[order].astype(np.int32)
+
+        clusters_count = self._clusters_cols * -(-self._rows // size)
+        self._clusters_offsets = np.zeros(clusters_count + 1, dtype=np.int32)
+        np.cumsum(np.bincount(self._nodes_clusters, minlength=clusters_count), out=self._clusters_offsets[1:])
+
+        # passages between the nodes of two clusters
+        return np.concatenate((
+            np.stack((east, east + 1), axis=1),
+            np.stack((south, south + self._cols), axis=1),
+        ))
+
+    def _get_nodes(self, cells):
+        # nodes of the cells (sorted by cell, then by cluster as the nodes)
+        sorted_cells = np.argsort(self._nodes_cells, kind='stable')
+        return sorted_cells[np.searchsorted(self._nodes_cells, cells, sorter=sorted_cells)]
+
+    def _get_cluster_masks(self, masks):
+        # open directions without the passages between clusters
+        size = self.cluster_size
+        masks = masks.copy()
+        masks[:, size - 1::size] &= ~np.uint8(Cell.WALL_BITS['E'])
+        masks[:, 0::size] &= ~np.uint8(Cell.WALL_BITS['W'])
+        masks[size - 1::size, :] &= ~np.uint8(Cell.WALL_BITS['S'])
+        masks[0::size, :] &= ~np.uint8(Cell.WALL_BITS['N'])
+        return masks.ravel()
+
+    def _init_edges(self, masks, entrances):
+        cluster_masks = self._get_cluster_masks(masks)
+        directions = tuple((np.uint8(Cell.WALL_BITS[cardinality]), delta) for cardinality, delta in (
+            ('N', -self._cols),
+            ('S', +self._cols),
+            ('E', +1),
+            ('W', -1),
+        ))
+
+        nodes_count = len(self._nodes_cells)
+        ranks = np.arange(nodes_count, dtype=np.int32) - self._clusters_offsets[self._nodes_clusters]
+        clusters_firsts = self._clusters_offsets[self._nodes_clusters]
+
+        sources = []
+        targets = []
+        costs = []
+
+        distances = np.empty(self._cols * self._rows, dtype=np.int32)
+        for rank in range(0, int(ranks.max()) + 1 if nodes_count > 0 else 0):
+            # breadth first search from the node of this rank of each cluster
+            distances.fill(-1)
+            wavefront = self._nodes_cells[ranks == rank]
+            distances[wavefront] = 0
+            level = 0
+            while len(wavefront) > 0:
+                level += 1
+                cells_masks = cluster_masks[wavefront]
+                reached = np.concatenate([wavefront[cells_masks & bit != 0] + delta for bit, delta in directions])
+                reached = reached[distances[reached] == -1]
+                distances[reached] = level
+                wavefront = np.unique(reached)
+
+            # nodes of the same cluster reached (each pair is found from both nodes)
+            nodes_distances = distances[self._nodes_cells]
+            reached_nodes = np.flatnonzero((nodes_distances > 0) & (ranks != rank))
+            sources.append(clusters_firsts[reached_nodes] + rank)
+            targets.append(reached_nodes)
+            costs.append(nodes_distances[reached_nodes])
+
+        # entrances: both ways
+        entrances = self._get_nodes(entrances.ravel()).reshape(-1, 2)
+        sources += [entrances[:, 0], entrances[:, 1]]
+        targets += [entrances[:, 1], entrances[:, 0]]
+        costs += [np.ones(len(entrances), dtype=np.int32)] * 2
+
+        # edges by source node: targets[edges_offsets[n]:edges_offsets[n + 1]] are the neighbors of the node n
+        sources = np.concatenate(sources).astype(np.int32)
+        order = np.argsort(sources, kind='stable')
+        self._edges_targets = np.concatenate(targets).astype(np.int32)[order]
+        self._edges_costs = np.concatenate(costs).astype(np.int32)[order]
+        self._edges_offsets = np.zeros(nodes_count + 1, dtype=np.int32)
+        np.cumsum(np.bincount(sources, minlength=nodes_count), out=self._edges_offsets[1:])
+
+    @property
+    def nodes_count(self):
+        return len(self._nodes_cells)
+
+    @property
+    def edges_count(self):
+        return len(self._edges_targets)
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in (
+            self._nodes_cells,
+            self._nodes_clusters,
+            self._clusters_offsets,
+            self._edges_targets,
+            self._edges_costs,
+            self._edges_offsets,
+        ))
+
+    def get_node_cell(self, node):
+        return int(self._nodes_cells[node])
+
+    def get_edges(self, node):
+        '''
+        (neighbor node, distance) of the node.
+        '''
+        start, end = self._edges_offsets[node], self._edges_offsets[node + 1]
+        return zip(self._edges_targets[start:end].tolist(), self._edges_costs[start:end].tolist())
+
+    def get_cluster(self, index):
+        # cluster of the cell at index (or of each cell of an array of indexes)
+        return (index // self._cols // self.cluster_size) * self._clusters_cols + index % self._cols // self.cluster_size
+
+    def get_cluster_nodes(self, cluster):
+        '''
+        Cells of the nodes of the cluster, mapped to their nodes.
+        '''
+        start, end = self._clusters_offsets[cluster], self._clusters_offsets[cluster + 1]
+        return dict(zip(self._nodes_cells[start:end].tolist(), range(start, end)))
+
+    def search_cluster(self, index, targets=None):
+        '''
+        Breadth first search inside the cluster of the cell at index: the parents and the distances of the cells reached
+        (stopped once all the targets cells are reached).
+        '''
+        cluster = self.get_cluster(index)
+        find_neighbors = self._map.find_neighbor_indexes
+        get_cluster = self.get_cluster
+
+        parents = {index: -1}
+        distances = {index: 0}
+        remaining = set(targets) - {index} if targets is not None else None
+        queue = deque([index])
+        while len(queue) > 0 and (remaining is None or len(remaining) > 0):
+            cell = queue.popleft()
+            for neighbor in find_neighbors(cell):
+                if neighbor in parents or get_cluster(neighbor) != cluster:
+                    continue
+                parents[neighbor] = cell
+                distances[neighbor] = distances[cell] + 1
+                queue.append(neighbor)
+                if remaining is not None:
+                    remaining.discard(neighbor)
+
+        return parents, distances
@@ -0,0 +1,199 @@
+from array import array
+from collections import deque
+
+import numpy as np
+
+
+class MazeTree():
+    '''
+    Paths index of a perfect maze: the passages form a tree (a forest if some cells are not connected),
+    rooted by a breadth first search, with the depth of each cell and the ancestors at each power of 2
+    (binary lifting) to find the lowest common ancestor of two cells in O(log n).
+    The length of the path between two cells is then depth(a) + depth(b) - 2 * depth(lca),
+    and the path is the way up from each cell to the lowest common ancestor: O(path length).
+
+    Source: https://cp-algorithms.com/graph/lca_binary_lifting.html
+    '''
+
+    def __init__(self, map_grid):
+        self._cols = map_grid.cols
+
+        if not map_grid.has_adjacency:
+            map_grid.build_adjacency()
+
+        cells_count = len(map_grid)
+        parents = array('i', [-1]) * cells_count
+        depths = array('i', [0]) * cells_count
+        components = array('i', [-1]) * cells_count
+
+        # breadth first search from the first cell of each component, the root is its own parent
+        find_neighbors = map_grid.find_neighbor_indexes
+        edges_count = 0
+        components_count = 0
+        for root in range(0, cells_count):
+            if components[root] != -1:
+                continue
+
+            parents[root] = root
+            components[root] = components_count
+            queue = deque([root])
+            while len(queue) > 0:
+                index = queue.popleft()
+                for neighbor in find_neighbors(index):
+                    edges_count += 1
+                    if components[neighbor] != -1:
+                        continue
+                    parents[neighbor] = index
+                    depths[neighbor] = depths[index] + 1
+                    components[neighbor] = components_count
+                    queue.append(neighbor)
+
+            components_count += 1
+
+        # each passage is seen from both of its cells
+        self._is_perfect = edges_count // 2 == cells_count - components_count
+        self._components_count = components_count
+
+        # the arrays are read one by one for a query, their numpy views (same memory) for many queries at once
+        self._parents = parents
+        self._depths = depths
+        self._components = components
+        self._depths_array = np.frombuffer(depths, dtype=np.int32)
+        self._components_array = np.frombuffer(components, dtype=np.int32)
+
+        # ancestors[k][i]: ancestor 2^k levels above the cell i (the root for the higher levels)
+        self._ancestors = [parents]
+        self._ancestors_arrays = [np.frombuffer(parents, dtype=np.int32)]
+        max_depth = int(self._depths_array.max())
+        while (1 << len(self._ancestors)) <= max_depth:
+            ancestors = array('i', bytes(cells_count * 4))
+            ancestors_array = np.frombuffer(ancestors, dtype=np.int32)
+            ancestors_array[:] = self._ancestors_arrays[-1][self._ancestors_arrays[-1]]
+            self._ancestors.append(ancestors)
+            self._ancestors_arrays.append(ancestors_array)
+
+    @property
+    def is_perfect(self):
+        return self._is_perfect
+
+    @property
+    def components_count(self):
+        return self._components_count
+
+    @property
+    def nbytes(self):
+        return self._depths_array.nbytes + self._components_array.nbytes + sum(ancestors.nbytes for ancestors in self._ancestors_arrays)
+
+    def _to_index(self, pos):
+        return pos[1] * self._cols + pos[0]
+
+    def _to_pos(self, index):
+        return (index % self._cols, index // self._cols)
+
+    def get_lca(self, a, b):
+        '''
+        Lowest common ancestor of the cells indexes a and b, None if they are not connected.
+        '''
+        if self._components[a] != self._components[b]:
+            return None
+
+        depths = self._depths
+        if depths[a] < depths[b]:
+            a, b = b, a
+
+        # a goes up to the depth of b
+        diff = depths[a] - depths[b]
+        level = 0
+        while diff > 0:
+            if diff & 1:
+                a = self._ancestors[level][a]
+            diff >>= 1
+            level += 1
+
+        if a == b:
+            return a
+
+        for ancestors in reversed(self._ancestors):
+            if ancestors[a] != ancestors[b]:
+                a = ancestors[a]
+                b = ancestors[b]
+
+        return self._parents[a]
+
+    def get_lcas(self, a, b):
+        '''
+        Same as get_lca for arrays of cells indexes at once (-1 for the cells not connected).
+        '''
+        a = np.array(a, dtype=np.int32)
+        b = np.array(b, dtype=np.int32)
+
+        depths = self._depths_array
+
+        swap = depths[a] < depths[b]
+        a[swap], b[swap] = b[swap], a[swap]
+
+        diff = depths[a] - depths[b]
+        for level, ancestors in enumerate(self._ancestors_arrays):
+            up = (diff >> level) & 1 == 1
+            a[up] = ancestors[a[up]]
+
+        for ancestors in reversed(self._ancestors_arrays):
+            up = ancestors[a] != ancestors[b]
+            a[up] = ancestors[a[up]]
+            b[up] = ancestors[b[up]]
+
+        lcas = np.where(a == b, a, self._ancestors_arrays[0][a])
+        lcas[self._components_array[a] != self._components_array[b]] = -1
+        return lcas
+
+    def get_path_length(self, start_pos, end_pos):
+        a = self._to_index(start_pos)
+        b = self._to_index(end_pos)
+
+        lca = self.get_lca(a, b)
+        if lca is None:
+            return None
+
+        return self._depths[a] + self._depths[b] - 2 * self._depths[lca]
+
+    def get_paths_lengths(self, starts, ends):
+        '''
+        Lengths of the paths between the (N, 2) arrays of start and end positions (-1 if not connected).
+        '''
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=np.int64).reshape(-1, 2)
+        a = starts[:, 1] * self._cols + starts[:, 0]
+        b = ends[:, 1] * self._cols + ends[:, 0]
+
+        lcas = self.get_lcas(a, b)
+        depths = self._depths_array
+        lengths = depths[a] + depths[b] - 2 * depths[lcas]
+        lengths[lcas == -1] = -1
+        return lengths
+
+    def get_path(self, start_pos, end_pos):
+        '''
+        Positions of the cells of the path from start_pos to end_pos, None if they are not connected.
+        '''
+        a = self._to_index(start_pos)
+        b = self._to_index(end_pos)
+
+        lca = self.get_lca(a, b)
+        if lca is None:
+            return None
+
+        parents = self._parents
+
+        path = []
+        while a != lca:
+            path.append(self._to_pos(a))
+            a = parents[a]
+        path.append(self._to_pos(lca))
+
+        end_path = []
+        while b != lca:
+            end_path.append(self._to_pos(b))
+            b = parents[b]
+
+        path.extend(reversed(end_path))
+        return path
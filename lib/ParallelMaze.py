@@ -0,0 +1,168 @@
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .Cell import Cell
+
+
+def _carve_tile(task):
+    '''
+    Carve a perfect maze (recursive backtracker) in a tile of cols x rows cells.
+    Return the cells of the tile (see Cell bits) indexed by y * cols + x.
+    '''
+    cols, rows, seed = task
+    rng = random.Random(seed)
+
+    wall_n = Cell.WALL_BITS['N']
+    wall_s = Cell.WALL_BITS['S']
+    wall_e = Cell.WALL_BITS['E']
+    wall_w = Cell.WALL_BITS['W']
+
+    cells = bytearray([Cell.WALLS_MASK | Cell.VISITED | Cell.REDRAW]) * (cols * rows)
+    visited = bytearray(cols * rows)
+
+    start = rng.randrange(cols * rows)
+    visited[start] = 1
+    stack = [start]
+
+    while len(stack) > 0:
+        i = stack[-1]
+        x = i % cols
+
+        neighbors = []
+        if i >= cols and not visited[i - cols]:
+            neighbors.append((i - cols, wall_n, wall_s))
+        if i + cols < cols * rows and not visited[i + cols]:
+            neighbors.append((i + cols, wall_s, wall_n))
+        if x + 1 < cols and not visited[i + 1]:
+            neighbors.append((i + 1, wall_e, wall_w))
+        if x > 0 and not visited[i - 1]:
+            neighbors.append((i - 1, wall_w, wall_e))
+
+        if len(neighbors) == 0:
+            stack.pop()
+            continue
+
+        j, wall, opposite_wall = neighbors[rng.randrange(len(neighbors))]
+        cells[i] &= ~wall
+        cells[j] &= ~opposite_wall
+        visited[j] = 1
+        stack.append(j)
+
+    return bytes(cells)
+
+
+class ParallelMaze():
+    '''
+    Generate the maze by tiles carved in parallel (one process per tile),
+    the tiles are then linked following a random spanning tree of the tiles graph:
+    each tile is a perfect maze and two linked tiles share exactly one passage, so the maze is perfect.
+    '''
+
+    TILE_SIZE = 256
+
+    def __init__(self, map_grid, tile_size=TILE_SIZE, workers=None, seed=None):
+        assert(tile_size > 0)
+        assert(workers is None or workers > 0)
+
+        assert(isinstance(map_grid.grid, bytearray))
+
+        self._map = map_grid
+        # the passages index of the former walls is outdated, the walls cannot be changed until the maze is generated
+        self._map.start_generation(self)
+        self._tile_size = tile_size
+        self._workers = workers if workers is not None else os.cpu_count()
+
+        # the tiles seeds are drawn in order whatever the number of workers: the seed of the map determines the maze
+        self._random = random.Random(seed) if seed is not None else map_grid.random
+
+        self._tiles_cols = (self._map.cols + tile_size - 1) // tile_size
+        self._tiles_rows = (self._map.rows + tile_size - 1) // tile_size
+
+        self._generated_tiles_count = 0
+        self._tiles_linked = False
+
+    @property
+    def was_generated(self):
+        return self._tiles_linked
+
+    @property
+    def progression(self):
+        return self._generated_tiles_count * 100.0 / (self._tiles_cols * self._tiles_rows)
+
+    def _get_tile_area(self, tile_x, tile_y):
+        x = tile_x * self._tile_size
+        y = tile_y * self._tile_size
+        return (x, y, min(self._tile_size, self._map.cols - x), min(self._tile_size, self._map.rows - y))
+
+    def _get_tasks(self):
+        tasks = []
+        for tile_y in range(0, self._tiles_rows):
+            for tile_x in range(0, self._tiles_cols):
+                _, _, cols, rows = self._get_tile_area(tile_x, tile_y)
+                tasks.append((cols, rows, self._random.getrandbits(64)))
+        return tasks
+
+    def _write_tile(self, tile_index, cells):
+        x, y, cols, rows = self._get_tile_area(tile_index % self._tiles_cols, tile_index // self._tiles_cols)
+        grid = self._map.grid_array
+        grid[y:y + rows, x:x + cols] = np.frombuffer(cells, dtype=np.uint8).reshape(rows, cols)
+        self._generated_tiles_count += 1
+
+    def _link_tiles(self):
+        # random spanning tree of the tiles graph (randomized depth first search)
+        visited = set([(0, 0)])
+        stack = [(0, 0)]
+
+        while len(stack) > 0:
+            tile_x, tile_y = stack[-1]
+
+            neighbors = [(tile_x + d_x, tile_y + d_y) for d_x, d_y in ((0, -1), (0, 1), (1, 0), (-1, 0))
+                         if 0 <= tile_x + d_x < self._tiles_cols and 0 <= tile_y + d_y < self._tiles_rows
+                         and (tile_x + d_x, tile_y + d_y) not in visited]
+
+            if len(neighbors) == 0:
+                stack.pop()
+                continue
+
+            next_tile = self._random.choice(neighbors)
+            self._open_tiles_border((tile_x, tile_y), next_tile)
+            visited.add(next_tile)
+            stack.append(next_tile)
+
+    def _open_tiles_border(self, tile_a, tile_b):
+        # open one random passage on the border shared by two adjacent tiles
+        (tile_a, tile_b) = sorted((tile_a, tile_b))
+        x_a, y_a, cols_a, rows_a = self._get_tile_area(*tile_a)
+
+        if tile_a[0] != tile_b[0]:
+            # tile_b is on the right of tile_a
+            x = x_a + cols_a - 1
+            y = y_a + self._random.randrange(rows_a)
+            self._map.get_cell(x, y).remove_wall('E')
+            self._map.get_cell(x + 1, y).remove_wall('W')
+        else:
+            # tile_b is below tile_a
+            x = x_a + self._random.randrange(cols_a)
+            y = y_a + rows_a - 1
+            self._map.get_cell(x, y).remove_wall('S')
+            self._map.get_cell(x, y + 1).remove_wall('N')
+
+    def generate(self):
+        assert(not self.was_generated)
+
+        tasks = self._get_tasks()
+
+        if self._workers == 1 or len(tasks) == 1:
+            for tile_index, task in enumerate(tasks):
+                self._write_tile(tile_index, _carve_tile(task))
+        else:
+            with ProcessPoolExecutor(max_workers=self._workers) as executor:
+                for tile_index, cells in enumerate(executor.map(_carve_tile, tasks)):
+                    self._write_tile(tile_index, cells)
+
+        self._link_tiles()
+        self._tiles_linked = True
@@ -0,0 +1,145 @@
+import os
+import hashlib
+from array import array
+from collections import OrderedDict
+
+
+class PathCache():
+    '''
+    Cache of the solved paths, keyed by (maze hash, start, end, solver), see Map.walls_hash.
+    The paths are kept in memory (least recently used evicted first) and, with a directory,
+    on disk too (one file per path: the cells indexes as int32) to be reused across runs.
+    Both are bounded to max_entries paths: the files on disk are indexed once (least recently used first),
+    then the index is kept up to date, the directory is not scanned again.
+    '''
+
+    MAX_ENTRIES = 1000
+
+    def __init__(self, max_entries=MAX_ENTRIES, directory=None):
+        assert(max_entries > 0)
+
+        self._max_entries = max_entries
+        self._directory = directory
+
+        self._paths = OrderedDict()
+
+        # files names => sizes (in bytes)
+        self._files = OrderedDict()
+        if self._directory is not None:
+            os.makedirs(self._directory, exist_ok=True)
+            self._init_files()
+
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return len(self._paths)
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def hit_rate(self):
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups > 0 else 0.0
+
+    @classmethod
+    def get_key(cls, maze_hash, start_pos, end_pos, solver):
+        return (maze_hash, tuple(start_pos), tuple(end_pos), solver)
+
+    @property
+    def disk_size(self):
+        return sum(self._files.values())
+
+    def _init_files(self):
+        # files of the former runs, least recently used first (see _load)
+        files = []
+        for entry in os.scandir(self._directory):
+            if entry.name.endswith('.path'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        files.sort()
+
+        for _, name, size in files:
+            self._files[name] = size
+        self._evict_files()
+
+    def _get_file_name(self, key):
+        return hashlib.blake2b(repr(key).encode('utf-8'), digest_size=16).hexdigest() + '.path'
+
+    def _load(self, key):
+        name = self._get_file_name(key)
+        file_path = os.path.join(self._directory, name)
+        try:
+            with open(file_path, 'rb') as f:
+                path = array('i', f.read())
+        except FileNotFoundError:
+            self._files.pop(name, None)
+            return None
+
+        # most recently used files are kept on eviction (by this run and the next ones)
+        os.utime(file_path)
+        self._files[name] = path.itemsize * len(path)
+        self._files.move_to_end(name)
+        return path
+
+    def _store(self, key, path):
+        name = self._get_file_name(key)
+        file_path = os.path.join(self._directory, name)
+        tmp_file_path = file_path + '.tmp'
+        with open(tmp_file_path, 'wb') as f:
+            f.write(path.tobytes())
+        os.replace(tmp_file_path, file_path)
+
+        self._files[name] = path.itemsize * len(path)
+        self._files.move_to_end(name)
+        self._evict_files()
+
+    def _evict_files(self):
+        while len(self._files) > self._max_entries:
+            name, _ = self._files.popitem(last=False)
+            try:
+                os.remove(os.path.join(self._directory, name))
+            except FileNotFoundError:
+                # already removed (by another run)
+                pass
+
+    def get(self, key):
+        '''
+        Cells indexes (y * cols + x) of the path from the start to the end, None if the path is not cached.
+        '''
+        path = self._paths.get(key)
+        if path is not None:
+            self._paths.move_to_end(key)
+        elif self._directory is not None:
+            path = self._load(key)
+            if path is not None:
+                self._put_in_memory(key, path)
+
+        if path is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+
+        return path
+
+    def _put_in_memory(self, key, path):
+        self._paths[key] = path
+        self._paths.move_to_end(key)
+        while len(self._paths) > self._max_entries:
+            self._paths.popitem(last=False)
+
+    def put(self, key, path):
+        path = array('i', path)
+
+        self._put_in_memory(key, path)
+        if self._directory is not None:
+            self._store(key, path)
+
+    def get_stats(self):
+        return f'{self._hits} hits / {self._hits + self._misses} lookups ({self.hit_rate * 100:.1f}%), {len(self)} paths'
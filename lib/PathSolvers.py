@@ -0,0 +1,903 @@
+import heapq
+import itertools
+import math
+from array import array
+from collections import deque
+
+import numpy as np
+
+from .Cell import Cell
+
+
+class PathSolver():
+    '''
+    Base of the path finding algorithms, on the cells indexes (y * cols + x).
+    A solver explores the map step by step (see step()), or at once (see solve()):
+    the parent of each reached cell leads back to the start.
+    '''
+
+    NAME = None
+
+    # cell states
+    UNSEEN = 0
+    OPENED = 1
+    CLOSED = 2
+
+    def __init__(self, map_grid, start_pos, end_pos):
+        self._map = map_grid
+        self._cols = map_grid.cols
+
+        if not self._map.has_adjacency:
+            self._map.build_adjacency()
+        self._find_neighbors = self._map.find_neighbor_indexes
+
+        self._start = self.to_index(start_pos)
+        self._end = self.to_index(end_pos)
+
+        # search state in flat arrays indexed by cell index, no object is created per node
+        cells_count = len(self._map)
+        self._g = array('d', [math.inf]) * cells_count
+        self._parents = array('i', [-1]) * cells_count
+        self._states = bytearray(cells_count)
+
+        self._g[self._start] = 0
+
+        self._current = None
+        self._winner = None
+        self._exhausted = False
+        self._expanded_count = 0
+
+        self._touched_cells = set()
+
+    @property
+    def start(self):
+        return self._start
+
+    @property
+    def end(self):
+        return self._end
+
+    @property
+    def current(self):
+        return self._current
+
+    @property
+    def winner(self):
+        return self._winner
+
+    @property
+    def is_exhausted(self):
+        return self._exhausted
+
+    @property
+    def expanded_count(self):
+        return self._expanded_count
+
+    def to_index(self, pos):
+        return pos[1] * self._cols + pos[0]
+
+    def to_pos(self, index):
+        return (index % self._cols, index // self._cols)
+
+    def get_state(self, index):
+        return self._states[index]
+
+    def get_length(self, index):
+        return int(self._g[index])
+
+    def get_path(self, index):
+        while index != -1:
+            yield index
+            index = self._parents[index]
+
+    def pop_touched_cells(self):
+        touched_cells = self._touched_cells
+        self._touched_cells = set()
+        return touched_cells
+
+    def _touch(self, index):
+        if not self._map.headless:
+            self._touched_cells.add(index)
+
+    def _step(self):
+        raise NotImplementedError
+
+    def step(self):
+        if self._winner is not None or self._exhausted:
+            return
+
+        self._step()
+
+    def solve(self):
+        while self._winner is None and not self._exhausted:
+            self._step()
+
+    def close(self):
+        # to call once the solver is not used anymore (see DStarLiteSolver)
+        pass
+
+
+class AStarSolver(PathSolver):
+    '''
+    A* with the euclidean distance as heuristic.
+    One step: one cell expanded.
+    '''
+
+    NAME = 'astar'
+
+    def __init__(self, map_grid, start_pos, end_pos):
+        super().__init__(map_grid, start_pos, end_pos)
+
+        self._end_x, self._end_y = self.to_pos(self._end)
+
+        self._f = array('d', [math.inf]) * len(self._map)
+        self._f[self._start] = 0
+
+        # open set is a binary heap of (f, h, tiebreak, index) entries with lazy deletion:
+        # an entry is stale when its cell is closed or has a better f since the entry was pushed
+        self._open_heap = []
+        self._open_tiebreak = itertools.count()
+        self._states[self._start] = self.OPENED
+        self._open_set_push(self._start, 0, 0)
+
+    def _heuristic(self, index):
+        return math.hypot(index % self._cols - self._end_x, index // self._cols - self._end_y)
+
+    def _open_set_push(self, index, f, h):
+        # a better entry for an already opened cell replaces it (decrease-key),
+        # the previous heap entry becomes stale and is skipped when it reaches the top
+        heapq.heappush(self._open_heap, (f, h, next(self._open_tiebreak), index))
+
+    def _open_set_peek(self):
+        while len(self._open_heap) > 0:
+            f, _, _, index = self._open_heap[0]
+            if self._states[index] == self.OPENED and self._f[index] == f:
+                return index
+            heapq.heappop(self._open_heap)
+
+    def _open_set_pop(self):
+        return heapq.heappop(self._open_heap)[3]
+
+    def _relax(self, index, neighbor, g_score):
+        neighbor_state = self._states[neighbor]
+        if neighbor_state == self.CLOSED:
+            return
+        if neighbor_state == self.OPENED and g_score >= self._g[neighbor]:
+            return
+
+        h = self._heuristic(neighbor)
+        f = g_score + h
+
+        self._g[neighbor] = g_score
+        self._f[neighbor] = f
+        self._parents[neighbor] = index
+        self._states[neighbor] = self.OPENED
+
+        self._open_set_push(neighbor, f, h)
+        self._touch(neighbor)
+
+    def _expand(self, index):
+        # the neighbors are at a distance of 1
+        g_score = self._g[index] + 1
+        for neighbor in self._find_neighbors(index):
+            self._relax(index, neighbor, g_score)
+
+    def _step(self):
+        index = self._open_set_peek()
+        if index is None:
+            self._exhausted = True
+            return
+
+        self._current = index
+
+        if index == self._end:
+            # Finish
+            self._winner = index
+            return
+
+        self._open_set_pop()
+        self._states[index] = self.CLOSED
+        self._touch(index)
+        self._expanded_count += 1
+
+        self._expand(index)
+
+
+class ManhattanAStarSolver(AStarSolver):
+    '''
+    A* with the manhattan distance as heuristic: the exact distance without walls on a 4 directions grid.
+    '''
+
+    NAME = 'manhattan'
+
+    def _heuristic(self, index):
+        return abs(index % self._cols - self._end_x) + abs(index // self._cols - self._end_y)
+
+
+class JumpPointSolver(AStarSolver):
+    '''
+    Jump point search adapted to the walled grids (4 directions): the search jumps along the corridors
+    and only stops on the cells with a side passage (junctions and turns), the dead ends are pruned.
+    The parent of a jump point is the previous jump point, on the same row or column.
+    One step: one jump point expanded.
+
+    Source: https://en.wikipedia.org/wiki/Jump_point_search
+    '''
+
+    NAME = 'jps'
+
+    def __init__(self, map_grid, start_pos, end_pos):
+        super().__init__(map_grid, start_pos, end_pos)
+
+        n, s, e, w = (Cell.WALL_BITS[cardinality] for cardinality in 'NSEW')
+        # (direction bit, index delta, side directions bits)
+        self._directions = (
+            (n, -self._cols, e | w),
+            (s, +self._cols, e | w),
+            (e, +1, n | s),
+            (w, -1, n | s),
+        )
+
+    def _jump(self, index, direction, delta, sides):
+        masks = self._map.open_masks
+        distance = 0
+
+        while True:
+            index += delta
+            distance += 1
+
+            if index == self._end:
+                return index, distance
+
+            mask = masks[index]
+            if mask & sides:
+                return index, distance
+            if not mask & direction:
+                # dead end
+                return None, distance
+
+    def _expand(self, index):
+        mask = self._map.open_masks[index]
+
+        # the search never goes back toward the parent
+        parent = self._parents[index]
+        if parent != -1:
+            if index // self._cols == parent // self._cols:
+                mask &= ~Cell.WALL_BITS['W' if index > parent else 'E']
+            else:
+                mask &= ~Cell.WALL_BITS['N' if index > parent else 'S']
+
+        for direction, delta, sides in self._directions:
+            if mask & direction:
+                jump_point, distance = self._jump(index, direction, delta, sides)
+                if jump_point is not None:
+                    self._relax(index, jump_point, self._g[index] + distance)
+
+
+class BFSSolver(PathSolver):
+    '''
+    Breadth first search: shortest path without heuristic.
+    One step: one cell expanded.
+    '''
+
+    NAME = 'bfs'
+
+    def __init__(self, map_grid, start_pos, end_pos):
+        super().__init__(map_grid, start_pos, end_pos)
+
+        self._queue = deque([self._start])
+        self._states[self._start] = self.OPENED
+
+    def _step(self):
+        if len(self._queue) == 0:
+            self._exhausted = True
+            return
+
+        index = self._queue.popleft()
+        self._current = index
+
+        if index == self._end:
+            self._winner = index
+            return
+
+        self._states[index] = self.CLOSED
+        self._touch(index)
+        self._expanded_count += 1
+
+        g_score = self._g[index] + 1
+        for neighbor in self._find_neighbors(index):
+            if self._states[neighbor] != self.UNSEEN:
+                continue
+
+            self._g[neighbor] = g_score
+            self._parents[neighbor] = index
+            self._states[neighbor] = self.OPENED
+            self._queue.append(neighbor)
+            self._touch(neighbor)
+
+
+class BidirectionalAStarSolver(PathSolver):
+    '''
+    Two A* searches, from the start and from the end, expanded alternately.
+    Each cell belongs to the search which reached it first (its parent leads to the start or to the end),
+    the searches stop when no path through their open sets can be shorter than the best meeting found.
+    The half path of the end search is then reversed to lead to the start.
+    One step: one cell expanded.
+    '''
+
+    NAME = 'bidirectional-astar'
+
+    FORWARD = 1
+    BACKWARD = 2
+
+    def __init__(self, map_grid, start_pos, end_pos):
+        super().__init__(map_grid, start_pos, end_pos)
+
+        self._targets = {
+            self.FORWARD: self.to_pos(self._end),
+            self.BACKWARD: self.to_pos(self._start),
+        }
+
+        self._f = array('d', [math.inf]) * len(self._map)
+        self._sides = bytearray(len(self._map))
+
+        self._open_heaps = {self.FORWARD: [], self.BACKWARD: []}
+        self._open_tiebreak = itertools.count()
+
+        # best meeting: (forward cell, backward cell) and the length of the path through them
+        self._meeting = None
+        self._meeting_length = math.inf
+
+        self._side = self.FORWARD
+
+        if self._start == self._end:
+            self._current = self._winner = self._end
+            return
+
+        self._g[self._end] = 0
+        for side, index in ((self.FORWARD, self._start), (self.BACKWARD, self._end)):
+            self._sides[index] = side
+            self._states[index] = self.OPENED
+            self._f[index] = self._heuristic(index, side)
+            self._open_set_push(side, index, self._f[index], self._f[index])
+
+    def _heuristic(self, index, side):
+        target_x, target_y = self._targets[side]
+        return math.hypot(index % self._cols - target_x, index // self._cols - target_y)
+
+    def _open_set_push(self, side, index, f, h):
+        heapq.heappush(self._open_heaps[side], (f, h, next(self._open_tiebreak), index))
+
+    def _open_set_peek(self, side):
+        open_heap = self._open_heaps[side]
+        while len(open_heap) > 0:
+            f, _, _, index = open_heap[0]
+            if self._states[index] == self.OPENED and self._f[index] == f:
+                return index
+            heapq.heappop(open_heap)
+
+    def _lower_bound(self, forward_top, backward_top):
+        # length of the shortest path not found yet
+        return max(self._f[forward_top], self._f[backward_top])
+
+    def _join(self):
+        forward_index, index = self._meeting
+
+        prev = forward_index
+        while index != -1:
+            next_index = self._parents[index]
+            self._parents[index] = prev
+            self._g[index] = self._g[prev] + 1
+            prev = index
+            index = next_index
+
+        self._current = self._winner = self._end
+
+    def _step(self):
+        forward_top = self._open_set_peek(self.FORWARD)
+        backward_top = self._open_set_peek(self.BACKWARD)
+
+        if forward_top is None or backward_top is None or self._meeting_length <= self._lower_bound(forward_top, backward_top):
+            if self._meeting is None:
+                self._exhausted = True
+            else:
+                self._join()
+            return
+
+        side = self._side
+        self._side = self.BACKWARD if side == self.FORWARD else self.FORWARD
+
+        index = heapq.heappop(self._open_heaps[side])[3]
+        self._current = index
+        self._states[index] = self.CLOSED
+        self._touch(index)
+        self._expanded_count += 1
+
+        g_score = self._g[index] + 1
+        for neighbor in self._find_neighbors(index):
+            neighbor_side = self._sides[neighbor]
+            if neighbor_side != 0 and neighbor_side != side:
+                # the searches meet
+                length = g_score + self._g[neighbor]
+                if length < self._meeting_length:
+                    self._meeting_length = length
+                    self._meeting = (index, neighbor) if side == self.FORWARD else (neighbor, index)
+                continue
+
+            neighbor_state = self._states[neighbor]
+            if neighbor_state == self.CLOSED:
+                continue
+            if neighbor_state == self.OPENED and g_score >= self._g[neighbor]:
+                continue
+
+            h = self._heuristic(neighbor, side)
+            f = g_score + h
+
+            self._g[neighbor] = g_score
+            self._f[neighbor] = f
+            self._parents[neighbor] = index
+            self._sides[neighbor] = side
+            self._states[neighbor] = self.OPENED
+
+            self._open_set_push(side, neighbor, f, h)
+            self._touch(neighbor)
+
+
+class BidirectionalBFSSolver(BidirectionalAStarSolver):
+    '''
+    Two breadth first searches, from the start and from the end (see BidirectionalAStarSolver).
+    '''
+
+    NAME = 'bidirectional-bfs'
+
+    def _heuristic(self, index, side):
+        return 0
+
+    def _lower_bound(self, forward_top, backward_top):
+        return self._g[forward_top] + self._g[backward_top]
+
+
+class DeadEndFillingSolver(BFSSolver):
+    '''
+    Dead end filling, for the perfect mazes: the dead ends are filled up to the next junction
+    until only the path between the start and the end remains, then the path is followed
+    (breadth first search on the cells not filled).
+    One step: one cell filled, then one cell of the path.
+    '''
+
+    NAME = 'dead-end-filling'
+
+    # number of open directions of each 4 bits mask
+    _DEGREES = np.array([bin(mask).count('1') for mask in range(0, Cell.WALLS_MASK + 1)], dtype=np.uint8)
+
+    def __init__(self, map_grid, start_pos, end_pos):
+        super().__init__(map_grid, start_pos, end_pos)
+
+        degrees = self._DEGREES[np.frombuffer(self._map.open_masks, dtype=np.uint8)]
+        self._degrees = bytearray(degrees.tobytes())
+
+        self._dead_ends = [index for index in np.flatnonzero(degrees == 1).tolist() if index not in (self._start, self._end)]
+
+    def _fill(self, index):
+        # the filled cells are closed: the breadth first search skips them
+        self._states[index] = self.CLOSED
+        self._touch(index)
+        self._expanded_count += 1
+
+        for neighbor in self._find_neighbors(index):
+            if self._states[neighbor] == self.CLOSED:
+                continue
+
+            self._degrees[neighbor] -= 1
+            if self._degrees[neighbor] == 1 and neighbor != self._start and neighbor != self._end:
+                self._dead_ends.append(neighbor)
+
+    def _step(self):
+        while len(self._dead_ends) > 0:
+            index = self._dead_ends.pop()
+            if self._states[index] != self.CLOSED:
+                self._fill(index)
+                return
+
+        super()._step()
+
+
+class WallFollowerSolver(PathSolver):
+    '''
+    Wall follower (right hand rule), for the perfect mazes: the walk keeps the walls on its right.
+    The path is the walk without the dead ends it came back from.
+    The walk is given up when it goes round in circles (a loop around the end in an imperfect maze).
+    One step: one move.
+    '''
+
+    NAME = 'wall-follower'
+
+    def __init__(self, map_grid, start_pos, end_pos):
+        super().__init__(map_grid, start_pos, end_pos)
+
+        # clockwise directions: (direction bit, index delta)
+        self._directions = tuple((Cell.WALL_BITS[cardinality], delta) for cardinality, delta in (
+            ('N', -self._cols),
+            ('E', +1),
+            ('S', +self._cols),
+            ('W', -1),
+        ))
+        self._direction = 0
+
+        # directions already taken from each cell (4 bits)
+        self._moves = bytearray(len(self._map))
+
+        self._current = self._start
+        self._states[self._start] = self.OPENED
+
+    def _step(self):
+        index = self._current
+
+        if index == self._end:
+            self._winner = index
+            return
+
+        mask = self._map.open_masks[index]
+
+        # right, straight ahead, left, back
+        for turn in (1, 0, 3, 2):
+            direction = (self._direction + turn) % 4
+            if mask & self._directions[direction][0]:
+                break
+        else:
+            self._exhausted = True
+            return
+
+        move = 1 << direction
+        if self._moves[index] & move:
+            self._exhausted = True
+            return
+        self._moves[index] |= move
+
+        self._direction = direction
+        next_index = index + self._directions[direction][1]
+
+        if self._states[next_index] == self.UNSEEN:
+            self._g[next_index] = self._g[index] + 1
+            self._parents[next_index] = index
+            self._states[next_index] = self.OPENED
+        elif next_index == self._parents[index]:
+            # back from a dead end
+            self._states[index] = self.CLOSED
+
+        self._expanded_count += 1
+        self._touch(index)
+        self._touch(next_index)
+
+        self._current = next_index
+
+
+class HierarchicalSolver(PathSolver):
+    '''
+    Hierarchical path finding (HPA*): A* on the abstract graph of the maze (see Map.hierarchy),
+    the start and the end are linked to the nodes of their clusters by a search inside their clusters.
+    Once the end is reached, the path is refined cell by cell inside the clusters it goes through.
+    One step: one node expanded (the path is only known at the end).
+
+    Source: https://webdocs.cs.ualberta.ca/~mmueller/ps/hpastar.pdf
+    '''
+
+    NAME = 'hpa'
+
+    def __init__(self, map_grid, start_pos, end_pos):
+        super().__init__(map_grid, start_pos, end_pos)
+
+        self._hierarchy = self._map.hierarchy
+        self._end_x, self._end_y = self.to_pos(self._end)
+
+        # the start and the end are 2 more nodes
+        nodes_count = self._hierarchy.nodes_count
+        self._start_node = nodes_count
+        self._end_node = nodes_count + 1
+
+        self._nodes_g = array('d', [math.inf]) * (nodes_count + 2)
+        self._nodes_parents = array('i', [-1]) * (nodes_count + 2)
+        self._nodes_closed = bytearray(nodes_count + 2)
+
+        if self._start == self._end:
+            self._current = self._winner = self._end
+            return
+
+        # paths inside the clusters of the start and the end, to their nodes
+        start_nodes = self._hierarchy.get_cluster_nodes(self._hierarchy.get_cluster(self._start))
+        end_nodes = self._hierarchy.get_cluster_nodes(self._hierarchy.get_cluster(self._end))
+        self._start_parents, start_distances = self._hierarchy.search_cluster(self._start)
+        self._end_parents, end_distances = self._hierarchy.search_cluster(self._end)
+
+        self._start_edges = [(node, start_distances[cell]) for cell, node in start_nodes.items() if cell in start_distances]
+        if self._end in start_distances:
+            self._start_edges.append((self._end_node, start_distances[self._end]))
+        self._end_edges = {node: end_distances[cell] for cell, node in end_nodes.items() if cell in end_distances}
+
+        self._open_heap = []
+        self._open_tiebreak = itertools.count()
+        self._nodes_g[self._start_node] = 0
+        heapq.heappush(self._open_heap, (0, next(self._open_tiebreak), self._start_node))
+
+    def _get_node_cell(self, node):
+        if node == self._start_node:
+            return self._start
+        if node == self._end_node:
+            return self._end
+        return self._hierarchy.get_node_cell(node)
+
+    def _heuristic(self, node):
+        index = self._get_node_cell(node)
+        return abs(index % self._cols - self._end_x) + abs(index // self._cols - self._end_y)
+
+    def _get_edges(self, node):
+        if node == self._start_node:
+            return self._start_edges
+
+        edges = list(self._hierarchy.get_edges(node))
+        distance = self._end_edges.get(node)
+        if distance is not None:
+            edges.append((self._end_node, distance))
+        return edges
+
+    def _get_cells_path(self, node, next_node):
+        # cells from the cell of node (excluded) to the cell of next_node
+        if node == self._start_node:
+            parents, index = self._start_parents, self._get_node_cell(next_node)
+        elif next_node == self._end_node:
+            # way back from the end
+            cells = []
+            index = self._end_parents[self._get_node_cell(node)]
+            while index != -1:
+                cells.append(index)
+                index = self._end_parents[index]
+            return cells
+        else:
+            cell, next_cell = self._get_node_cell(node), self._get_node_cell(next_node)
+            if self._hierarchy.get_cluster(cell) != self._hierarchy.get_cluster(next_cell):
+                # entrance
+                return [next_cell]
+            parents, _ = self._hierarchy.search_cluster(cell, (next_cell,))
+            index = next_cell
+
+        cells = []
+        while parents[index] != -1:
+            cells.append(index)
+            index = parents[index]
+        cells.reverse()
+        return cells
+
+    def _refine(self):
+        nodes = []
+        node = self._end_node
+        while node != -1:
+            nodes.append(node)
+            node = self._nodes_parents[node]
+        nodes.reverse()
+
+        prev = self._start
+        for node, next_node in zip(nodes, nodes[1:]):
+            for index in self._get_cells_path(node, next_node):
+                self._parents[index] = prev
+                self._g[index] = self._g[prev] + 1
+                prev = index
+
+        self._current = self._winner = self._end
+
+    def _step(self):
+        while len(self._open_heap) > 0:
+            _, _, node = heapq.heappop(self._open_heap)
+            if not self._nodes_closed[node]:
+                break
+        else:
+            self._exhausted = True
+            return
+
+        if node == self._end_node:
+            self._refine()
+            return
+
+        self._nodes_closed[node] = 1
+        self._touch(self._get_node_cell(node))
+        self._expanded_count += 1
+
+        g = self._nodes_g[node]
+        for neighbor, distance in self._get_edges(node):
+            g_score = g + distance
+            if self._nodes_closed[neighbor] or g_score >= self._nodes_g[neighbor]:
+                continue
+            self._nodes_g[neighbor] = g_score
+            self._nodes_parents[neighbor] = node
+            heapq.heappush(self._open_heap, (g_score + self._heuristic(neighbor), next(self._open_tiebreak), neighbor))
+
+
+class DStarLiteSolver(PathSolver):
+    '''
+    D* Lite: A* backward from the end (distances to the end), kept up to date when the walls change
+    (see Map.set_wall) and when the start moves (see move_start): only the cells whose distance
+    is inconsistent with their neighbors are expanded again, the rest of the search is reused.
+    The path is then followed from the start to the end along the decreasing distances.
+    One step: one cell expanded (the path is only known at the end).
+
+    Source: http://idm-lab.org/bib/abstracts/papers/aaai02b.pdf
+    '''
+
+    NAME = 'dstar-lite'
+
+    def __init__(self, map_grid, start_pos, end_pos):
+        super().__init__(map_grid, start_pos, end_pos)
+
+        cells_count = len(self._map)
+        # distance to the end of each cell, and its one step lookahead (from the distances of the neighbors)
+        self._distances = array('d', [math.inf]) * cells_count
+        self._rhs = array('d', [math.inf]) * cells_count
+
+        # open set: binary heap of (key, tiebreak, index) entries with lazy deletion,
+        # an entry is stale when its key is not the one of the cell anymore
+        self._open_heap = []
+        self._open_tiebreak = itertools.count()
+        self._keys = {}
+
+        # sum of the heuristic changes since the start moved: the keys already in the heap stay valid lower bounds
+        self._key_modifier = 0
+        self._last_start = self._start
+
+        self._rhs[self._end] = 0
+        self._open_set_push(self._end)
+
+        self._map.subscribe(self._on_wall_changed)
+        self._is_subscribed = True
+
+    def close(self):
+        # no more updated by the walls changes: the map does not keep the solver anymore
+        if self._is_subscribed:
+            self._map.unsubscribe(self._on_wall_changed)
+            self._is_subscribed = False
+
+    def _heuristic(self, a, b):
+        return abs(a % self._cols - b % self._cols) + abs(a // self._cols - b // self._cols)
+
+    def _get_key(self, index):
+        distance = min(self._distances[index], self._rhs[index])
+        return (distance + self._heuristic(self._start, index) + self._key_modifier, distance)
+
+    def _open_set_push(self, index):
+        key = self._get_key(index)
+        self._keys[index] = key
+        heapq.heappush(self._open_heap, (key, next(self._open_tiebreak), index))
+
+    def _open_set_peek(self):
+        while len(self._open_heap) > 0:
+            key, _, index = self._open_heap[0]
+            if self._keys.get(index) == key:
+                return key, index
+            heapq.heappop(self._open_heap)
+        return None, None
+
+    def _update_key(self, index):
+        # in the open set while the cell is inconsistent
+        self._keys.pop(index, None)
+        if self._distances[index] != self._rhs[index]:
+            self._open_set_push(index)
+
+    def _update_cell(self, index):
+        if index != self._end:
+            rhs = math.inf
+            for neighbor in self._find_neighbors(index):
+                distance = self._distances[neighbor] + 1
+                if distance < rhs:
+                    rhs = distance
+            self._rhs[index] = rhs
+
+        self._update_key(index)
+
+    def _is_start_consistent(self, top_key):
+        return (top_key is None or top_key >= self._get_key(self._start)) and self._rhs[self._start] == self._distances[self._start]
+
+    def _follow_path(self):
+        # from the start, the neighbor with the lowest distance to the end at each cell
+        index = self._start
+        self._parents[index] = -1
+        self._g[index] = 0
+        while index != self._end:
+            next_index = min(self._find_neighbors(index), key=lambda neighbor: self._distances[neighbor])
+            self._parents[next_index] = index
+            self._g[next_index] = self._g[index] + 1
+            index = next_index
+
+        self._current = self._winner = self._end
+
+    def _step(self):
+        top_key, index = self._open_set_peek()
+
+        if self._is_start_consistent(top_key):
+            if self._distances[self._start] == math.inf:
+                self._exhausted = True
+            else:
+                self._follow_path()
+            return
+
+        new_key = self._get_key(index)
+        if top_key < new_key:
+            # the start moved since the cell was pushed
+            self._open_set_push(index)
+            return
+
+        heapq.heappop(self._open_heap)
+        del self._keys[index]
+        self._touch(index)
+        self._expanded_count += 1
+
+        if self._distances[index] > self._rhs[index]:
+            # shorter: the lookaheads of the neighbors can only decrease
+            distance = self._rhs[index] + 1
+            self._distances[index] = self._rhs[index]
+            for neighbor in self._find_neighbors(index):
+                if neighbor != self._end and distance < self._rhs[neighbor]:
+                    self._rhs[neighbor] = distance
+                    self._update_key(neighbor)
+        else:
+            # longer: the lookaheads which came through the cell are computed again
+            distance = self._distances[index] + 1
+            self._distances[index] = math.inf
+            self._update_cell(index)
+            for neighbor in self._find_neighbors(index):
+                if self._rhs[neighbor] == distance:
+                    self._update_cell(neighbor)
+
+    def _replan(self):
+        # the path is searched again from the last search
+        self._winner = None
+        self._exhausted = False
+
+    def _on_wall_changed(self, index_a, index_b, closed):
+        self._key_modifier += self._heuristic(self._last_start, self._start)
+        self._last_start = self._start
+
+        # only the lookaheads of the cells of the passage change
+        self._update_cell(index_a)
+        self._update_cell(index_b)
+        self._replan()
+
+    def move_start(self, start_pos):
+        '''
+        New start (e.g. the next cell of the path): the search is kept, the distances to the end do not change.
+        '''
+        self._start = self.to_index(start_pos)
+        self._replan()
+
+
+class CachedSolver(PathSolver):
+    '''
+    Path already known (see PathCache): solved at once, nothing is expanded.
+    The path is given as the cells indexes from the start to the end.
+    '''
+
+    NAME = 'cached'
+
+    def __init__(self, map_grid, start_pos, end_pos, path):
+        super().__init__(map_grid, start_pos, end_pos)
+        assert(len(path) > 0 and path[0] == self._start and path[-1] == self._end), 'Error: Invalid cached path'
+
+        prev = -1
+        for length, index in enumerate(path):
+            self._parents[index] = prev
+            self._g[index] = length
+            self._states[index] = self.CLOSED
+            prev = index
+
+        self._current = self._winner = self._end
+
+
+SOLVERS = {solver.NAME: solver for solver in (
+    AStarSolver,
+    ManhattanAStarSolver,
+    JumpPointSolver,
+    BFSSolver,
+    BidirectionalAStarSolver,
+    BidirectionalBFSSolver,
+    DeadEndFillingSolver,
+    WallFollowerSolver,
+    HierarchicalSolver,
+    DStarLiteSolver,
+)}
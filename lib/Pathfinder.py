@@ -1,201 +1,346 @@
 
+from array import array
+
 import pygame
 from pygame.math import Vector2 as Vec
 
 from .Cell import Cell
+from .PathCache import PathCache
+from .PathSolvers import SOLVERS, PathSolver, CachedSolver
 
-class AStarCell():
 
-    def __init__(self, cell, previous=None):
-        self._cell = cell
+class Pathfinder():
+    '''
+    Find and draw the path between two cells of a generated maze with a solver (see PathSolvers),
+    on the cells indexes (y * cols + x).
+    '''
 
-        self.previous_cell = previous
-        self._last_next_cell = None
-        self._last_link_cells_update = None
+    COLOR_START       = pygame.Color('green')
+    COLOR_END         = pygame.Color('red')
+    COLOR_PATH        = pygame.Color('blue')
+    COLOR_STABLE_PATH = pygame.Color('cyan')
 
-        self.length = previous.length + 1 if previous is not None else 0
+    DEFAULT_SOLVER = 'astar'
 
-        self.f = float('inf')
-        self.g = float('inf')
-        self.h = 0
+    # links of the current path drawn from its head
+    PATH_DEPTH_MAX = 10
+    SOLVERS = list(SOLVERS)
 
-    def __eq__(self, other):
-        return self._cell.x == other._cell.x and self._cell.y == other._cell.y
+    def __init__(self, map_grid, start_pos=None, end_pos=None, solver=DEFAULT_SOLVER, cache=None, publish=False, flow_field=False):
+        assert(solver in SOLVERS), f'Error: Unknown solver "{solver}" (available: {", ".join(self.SOLVERS)})'
 
-    def __hash__(self):
-        return hash((self._cell.x, self._cell.y))
+        if start_pos is None:
+            start_pos = map_grid.get_random_cell_pos()
+        if end_pos is None:
+            end_pos = map_grid.get_random_cell_pos()
+            while Vec(start_pos).distance_to(Vec(end_pos)) <= min(map_grid.cols, map_grid.rows) // 4:
+                end_pos = map_grid.get_random_cell_pos()
 
-    def __str__(self):
-        return f'{self.__class__.__name__}: {self._cell}'
+        self._map = map_grid
+        self._headless = map_grid.headless
+        self._cols = map_grid.cols
+
+        # the maze is generated: its passages are indexed once for all the neighbors queries and pathfinders
+        # (kept up to date by Map.set_wall, dropped when a maze is generated again)
+        if not self._map.has_adjacency:
+            self._map.build_adjacency()
+
+        self._solver_name = solver
+
+        # a path already solved is taken from the cache, a new one is put in it once found
+        self._cache = cache
+        self._cache_key = None
+        cached_path = None
+        if self._cache is not None:
+            self._cache_key = PathCache.get_key(self._map.walls_hash, start_pos, end_pos, solver)
+            cached_path = self._cache.get(self._cache_key)
+
+        self._is_cached = cached_path is not None
+
+        # the path is read from the flow field of the map to the end (see Map.get_flow_field): no search
+        # (not a hit of the cache)
+        self._is_flow_field = False
+        if cached_path is None and flow_field:
+            cached_path = self._map.get_flow_field(end_pos).get_path_indexes(start_pos)
+            self._is_flow_field = cached_path is not None
+
+        if cached_path is not None:
+            self._cache_key = None
+            self._solver = CachedSolver(self._map, start_pos, end_pos, cached_path)
+        else:
+            self._solver = SOLVERS[solver](self._map, start_pos, end_pos)
 
-    @property
-    def x(self):
-        return self._cell.x
+        self._update_count = 0
 
-    @property
-    def y(self):
-        return self._cell.y
+        cells_count = len(self._map)
 
-    def get_next_cell(self):
-        return self._last_next_cell
+        # stable path: next cell linked to each cell of the path and the update count of the link
+        self._next = array('i', [-1]) * cells_count
+        self._next_update = array('q', [0]) * cells_count
 
-    def get_next_stable_cell(self, current_update_count, stable_min_duration=100):
-        if self._last_next_cell is None:
-            return
+        self._index_start = self._solver.start
+        self._index_end = self._solver.end
+        self._index_cur = self._solver.current
 
-        if current_update_count - self._last_link_cells_update > stable_min_duration:
-            return self.get_next_cell()
+        self._stable_min_duration = max(min(map_grid.cols, map_grid.rows) // 2, 1)
+        self._last_stable = self._index_start
+        self._last_rendered_stable = self._index_start
 
-    def link_next_cell(self, cell, update_count):
-        if self._last_next_cell is None or cell != self._last_next_cell:
-            self._last_next_cell = cell
-            self._last_link_cells_update = update_count
+        self._surface_path = None
+        self._surface_stable_path = None
+        self._surface_points = None
+        self._surface_debug_set = None
+
+        # areas of the surfaces updated since the last draw
+        self._dirty_rects = []
+        # area of the current path drawn on _surface_path
+        self._path_rect = None
+        if not self._headless:
+            self._surface_path = pygame.Surface((self._map.cols * Cell.SIZE, self._map.rows * Cell.SIZE), flags=pygame.SRCALPHA)
+            self._surface_stable_path = self._surface_path.copy()
+            self._surface_stable_path.fill((0, 0, 0, 0))
+            self._surface_debug_set = self._surface_path.copy()
+            self._surface_debug_set.fill((0, 0, 0, 0))
 
-    def heuristic(self, other):
-        return Vec(self.x, self.y).distance_to(Vec(other.x, other.y))
+        self._debug_set = set()
 
-    def get_path(self):
-        current = self
-        while current is not None:
-            yield current
-            current = current.previous_cell
+        # updated in a worker thread (see Simulation): nothing is drawn by update(), the changes are published
+        # (see pop_changes) and drawn by the render thread (see apply_changes)
+        self._publish = publish
+        # links of the stable path since the last published changes: (index, next index, erased when it went in a dead end)
+        self._stable_links = []
+        self._published_path = []
+        self._published_last_stable = self._index_start
+        self._published_debug_set = set()
+        self._published_done = False
 
-    def draw(self, screen, prev_cell=None, next_cell=None, stable=False):
-        if prev_cell is None and next_cell is None:
-            return
+        self.is_final_path_full_rendered = False
 
-        if prev_cell is None:
-            prev_cell = self
-            cur_cell = next_cell
-        else:
-            # prev_cell = prev_cell
-            cur_cell = self
+    def __len__(self):
+        if self._index_cur is None:
+            return 0
+        return self._solver.get_length(self._index_cur)
 
-        prev_x, prev_y = (prev_cell.x * Cell.SIZE, prev_cell.y * Cell.SIZE)
-        cur_x, cur_y = (cur_cell.x * Cell.SIZE, cur_cell.y * Cell.SIZE)
+    @property
+    def solver(self):
+        return self._solver_name
 
-        half_cell_size = Cell.SIZE // 2
-        pos_prev = (prev_x + half_cell_size, prev_y + half_cell_size)
-        pos_cur = (cur_x + half_cell_size, cur_y + half_cell_size)
+    def close(self):
+        # to call when the pathfinder is replaced (the solver can be subscribed to the map, see DStarLiteSolver)
+        self._solver.close()
 
-        color = Pathfinder.COLOR_STABLE_PATH if stable else Pathfinder.COLOR_PATH
+    @property
+    def is_cached(self):
+        return self._is_cached
 
-        # draw path line
-        thickness = max(Cell.SIZE // 4, 1)
-        pygame.draw.line(screen, color, pos_prev, pos_cur, thickness)
+    @property
+    def is_flow_field(self):
+        return self._is_flow_field
 
-        # draw round corners
-        thickness = max(Cell.SIZE // 8, 1)
-        pygame.draw.circle(screen, color, pos_prev, thickness - 1)
+    @property
+    def expanded_count(self):
+        return self._solver.expanded_count
 
+    @property
+    def start_pos(self):
+        return self._to_pos(self._index_start)
 
-class Pathfinder():
+    @property
+    def end_pos(self):
+        return self._to_pos(self._index_end)
 
-    COLOR_START       = pygame.Color('green')
-    COLOR_END         = pygame.Color('red')
-    COLOR_PATH        = pygame.Color('blue')
-    COLOR_STABLE_PATH = pygame.Color('cyan')
+    @property
+    def is_exhausted(self):
+        return self._solver.is_exhausted
 
-    def __init__(self, map_grid, start_pos=None, end_pos=None):
+    def _is_path_complete(self):
+        winner = self._solver.winner
+        if self._headless or self._is_cached or self._is_flow_field:
+            return winner is not None
+        return winner is not None and self._last_rendered_stable == winner
 
-        if start_pos is None:
-            start_pos = map_grid.get_random_cell_pos()
-        if end_pos is None:
-            end_pos = map_grid.get_random_cell_pos()
-            while Vec(start_pos).distance_to(Vec(end_pos)) <= min(map_grid.cols, map_grid.rows) // 4:
-                end_pos = map_grid.get_random_cell_pos()
+    def path_found(self):
+        if self._publish:
+            # once the last changes are drawn
+            return self._published_done and self._solver.winner is not None
+        return self._is_path_complete()
 
-        self._update_count = 0
+    @property
+    def is_simulation_done(self):
+        return self._is_path_complete() or self.is_exhausted
 
-        self._cell_start = AStarCell(map_grid.get_cell(*start_pos))
-        self._cell_end = AStarCell(map_grid.get_cell(*end_pos))
-        self._cell_cur = None
+    def _to_index(self, pos):
+        return pos[1] * self._cols + pos[0]
 
-        self._cell_start.g = 0
-        self._cell_start.f = self._cell_start.heuristic(self._cell_start)
+    def _to_pos(self, index):
+        return (index % self._cols, index // self._cols)
 
-        self._stable_path = []
-        self._last_stable = None
+    def _get_path(self, index):
+        return self._solver.get_path(index)
 
-        self._stable_min_duration = max(min(map_grid.cols, map_grid.rows) // 2, 1)
-        self._last_stable = self._cell_start
-        self._last_rendered_stable = self._cell_start
+    def _get_full_path(self, index):
+        prev = None
+        for index in self._get_path(index):
+            if prev is not None:
+                # cells skipped between two linked cells of the same row / column (see JumpPointSolver)
+                if index // self._cols == prev // self._cols:
+                    step = 1 if index > prev else -1
+                else:
+                    step = self._cols if index > prev else -self._cols
+                yield from range(prev + step, index, step)
+            yield index
+            prev = index
 
-        self._map = map_grid
+    def get_path(self):
+        '''
+        Positions of the cells of the current path, from the current cell to the start.
+        '''
+        if self._index_cur is None:
+            return
 
-        self._surface_path = pygame.Surface((self._map.cols * Cell.SIZE, self._map.rows * Cell.SIZE), flags=pygame.SRCALPHA)
-        self._surface_stable_path = self._surface_path.copy()
-        self._surface_stable_path.fill((0, 0, 0, 0))
-        self._surface_points = None
-        self._surface_debug_set = self._surface_path.copy()
-        self._surface_debug_set.fill((0, 0, 0, 0))
+        for index in self._get_full_path(self._index_cur):
+            yield self._to_pos(index)
 
-        self._open_set = set([self._cell_start])
-        self._closed_set = set()
-        self._debug_set = set()
+    def _solve_step(self):
+        self._solver.step()
+        self._index_cur = self._solver.current
 
-        self._winner = None
+        if self._cache_key is not None and self._solver.winner is not None:
+            self._cache.put(self._cache_key, reversed(list(self._get_full_path(self._solver.winner))))
+            self._cache_key = None
 
-        self.is_final_path_full_rendered = False
+        if not self._headless:
+            self._debug_set |= self._solver.pop_touched_cells()
 
-    def __len__(self):
-        if self._cell_cur is None:
-            return 0
-        return self._cell_cur.length
+    def _link_next_cell(self, index, next_index):
+        if self._next[index] != next_index:
+            self._next[index] = next_index
+            self._next_update[index] = self._update_count
 
-    def path_found(self):
-        return self._winner is not None and self._last_rendered_stable == self._winner
+    def _get_next_stable_cell(self, index):
+        next_index = self._next[index]
+        if next_index == -1:
+            return None
 
-    def _A_star(self):
-        if len(self._open_set) == 0:
-            return
+        if self._update_count - self._next_update[index] > self._stable_min_duration:
+            return next_index
 
-        self._cell_cur = min(self._open_set, key=lambda cell: cell.f)
+    def _draw_link(self, surface, index, next_index, stable=False, erase=False):
+        if index is None or next_index is None:
+            return None
 
-        if self._cell_cur == self._cell_end:
-            # Finish
-            self._winner = self._cell_cur
-            return
+        half_cell_size = Cell.SIZE // 2
+        x, y = self._to_pos(index)
+        next_x, next_y = self._to_pos(next_index)
+        pos = (x * Cell.SIZE + half_cell_size, y * Cell.SIZE + half_cell_size)
+        next_pos = (next_x * Cell.SIZE + half_cell_size, next_y * Cell.SIZE + half_cell_size)
 
-        self._open_set.remove(self._cell_cur)
-        self._closed_set.add(self._cell_cur)
-        self._debug_set.add(self._cell_cur)
+        color = self.COLOR_STABLE_PATH if stable else self.COLOR_PATH
+        if erase:
+            # the pixels are replaced (not blended)
+            color = (0, 0, 0, 0)
 
-        for neighbor in self._map.find_neighbors(self._cell_cur):
-            n = AStarCell(neighbor, previous=self._cell_cur)
+        # draw path line
+        thickness = max(Cell.SIZE // 4, 1)
+        rect = pygame.draw.line(surface, color, pos, next_pos, thickness)
 
-            if n in self._closed_set:
-                continue
+        # draw round corners
+        thickness = max(Cell.SIZE // 8, 1)
+        rect.union_ip(pygame.draw.circle(surface, color, pos, thickness - 1))
+
+        return rect
+
+    def _get_fork(self, index, other_index):
+        # last cell shared by the paths of two cells (the length to the start increases along a path),
+        # None if they have none (e.g. a cell reached from the end, see BidirectionalAStarSolver)
+        path = self._get_path(index)
+        other_path = self._get_path(other_index)
+        index = next(path, None)
+        other_index = next(other_path, None)
+        while index != other_index:
+            if index is None or other_index is None:
+                return None
+            if self._solver.get_length(index) >= self._solver.get_length(other_index):
+                index = next(path, None)
+            else:
+                other_index = next(other_path, None)
+        return index
+
+    def _reset_stable_path(self, fork):
+        # the links drawn past the fork are erased, the rest of the stable path is kept
+        rendered_fork = self._get_fork(self._last_rendered_stable, fork)
+
+        links = []
+        prev = None
+        for p in self._get_path(self._last_rendered_stable):
+            if prev is not None:
+                links.append((p, prev, True))
+            if p == rendered_fork:
+                break
+            prev = p
 
-            g_score = self._cell_cur.g + self._cell_cur.heuristic(n)
+        # links up to the fork not rendered yet
+        kept_links = []
+        prev = None
+        for p in self._get_path(fork):
+            if prev is not None:
+                kept_links.append((p, prev, False))
+            if p == rendered_fork:
+                break
+            prev = p
 
-            if g_score >= n.g:
-                continue
+        if len(links) > 0:
+            # the end of the last link kept was erased with the first link of the branch
+            path = self._get_path(rendered_fork)
+            next(path)
+            parent = next(path, None)
+            if parent is not None:
+                links.append((parent, rendered_fork, False))
+        links += reversed(kept_links)
+
+        self._last_stable = fork
+        self._last_rendered_stable = fork
+
+        if self._publish:
+            self._stable_links += links
+            return
 
-            n.g = g_score
-            n.h = n.heuristic(self._cell_end)
-            n.f = n.g + n.h
+        for index, next_index, erase in links:
+            self._draw_stable_link(index, next_index, erase)
 
-            self._open_set.add(n)
-            self._debug_set.add(n)
+    def _draw_stable_link(self, index, next_index, erase=False):
+        self._add_dirty_rect(self._draw_link(self._surface_stable_path, index, next_index, stable=True, erase=erase))
 
     def _update_stable_path(self):
+        last_stable_length = self._solver.get_length(self._last_stable)
+
+        path = self._get_path(self._index_cur)
         prev = None
-        for p in self._cell_cur.get_path():
+        for p in path:
             if prev is not None:
-                p.link_next_cell(prev, self._update_count)
+                self._link_next_cell(p, prev)
             if p == self._last_stable:
                 break
+            if self._solver.get_length(p) <= last_stable_length:
+                # the stable path went in a dead end: it restarts from the fork with the current path
+                fork = self._get_fork(p, self._last_stable)
+                if fork is not None:
+                    self._reset_stable_path(fork)
+                    # the cells from the fork lead to the current path, not to the dead end anymore
+                    while p != fork:
+                        prev, p = p, next(path)
+                        self._link_next_cell(p, prev)
+                break
             prev = p
 
         cur = self._last_stable
 
-        while cur != self._cell_cur:
-            next_cell = cur.get_next_stable_cell(self._update_count, self._stable_min_duration)
+        while cur != self._index_cur:
+            next_index = self._get_next_stable_cell(cur)
 
-            if next_cell is None:
+            if next_index is None:
                 break
-            cur = next_cell
+            cur = next_index
 
             self._last_stable = cur
 
@@ -208,56 +353,122 @@ class Pathfinder():
             if step_count > step_max:
                 break
 
-            next_cell = cur.get_next_stable_cell(self._update_count, self._stable_min_duration)
-            cur.draw(self._surface_stable_path, next_cell=next_cell, stable=True)
-            cur = next_cell
+            next_index = self._get_next_stable_cell(cur)
+            if self._publish:
+                self._stable_links.append((cur, next_index, False))
+            else:
+                self._draw_stable_link(cur, next_index)
+            cur = next_index
             self._last_rendered_stable = cur
             step_count += 1
 
+    def pop_changes(self):
+        '''
+        Changes since the last call (see Simulation): links of the stable path, head of the current path
+        (up to the stable path) and cells touched by the solver.
+        '''
+        path = []
+        if self._index_cur is not None:
+            for depth, p in enumerate(self._get_path(self._index_cur)):
+                path.append(p)
+                if depth > self.PATH_DEPTH_MAX or p == self._last_stable:
+                    break
+
+        changes = {
+            'stable_links': self._stable_links,
+            'path': path,
+            'last_stable': self._last_stable,
+            'debug_set': self._debug_set,
+            'done': self.is_simulation_done,
+        }
+        self._stable_links = []
+        self._debug_set = set()
+
+        return changes
+
+    def apply_changes(self, changes):
+        for index, next_index, erase in changes['stable_links']:
+            self._draw_stable_link(index, next_index, erase)
+
+        self._published_path = changes['path']
+        self._published_last_stable = changes['last_stable']
+        self._published_debug_set |= changes['debug_set']
+        self._published_done = changes['done']
+
     def update(self, multiple_update_counter=1):
         assert(multiple_update_counter > 0)
 
         for _ in range(0, multiple_update_counter):
-            if self.path_found():
+            if self._is_path_complete():
                 return
 
             self._update_count += 1
 
-            self._A_star()
+            self._solve_step()
+
+            if self._headless:
+                if self.is_exhausted:
+                    return
+                continue
+
+            if self._index_cur is None:
+                continue
+
             self._update_stable_path()
             self._render_stable_path()
 
-    def _render_path_gen(self, cur_cell_to_render, last_cell_to_render, depth_max):
+    def _render_path_gen(self, path, last_index_to_render, depth_max):
         prev = None
-        for depth, p in enumerate(cur_cell_to_render.get_path()):
+        for depth, p in enumerate(path):
             if depth_max is not None and depth > depth_max:
                 break
 
-            p.draw(self._surface_path, prev)
+            rect = self._draw_link(self._surface_path, prev, p)
+            self._add_dirty_rect(rect)
+            if rect is not None:
+                self._path_rect = rect if self._path_rect is None else self._path_rect.union(rect)
             yield p
 
-            if p == last_cell_to_render:
+            if p == last_index_to_render:
                 break
 
             prev = p
 
-    def _render_path(self, last_cell_to_render=None, depth_max=100):
-        self._surface_path.fill((0, 0, 0, 0))
-        for _ in self._render_path_gen(self._cell_cur, last_cell_to_render, depth_max):
+    def _render_path(self, last_index_to_render=None, depth_max=100):
+        # only the previous path is erased
+        if self._path_rect is not None:
+            self._surface_path.fill((0, 0, 0, 0), self._path_rect)
+            self._add_dirty_rect(self._path_rect)
+            self._path_rect = None
+
+        path = self._published_path if self._publish else self._get_path(self._index_cur)
+        for _ in self._render_path_gen(path, last_index_to_render, depth_max):
             pass
 
     def draw_full_path(self, screen):
-        assert(self._cell_cur is not None)
+        assert(self._index_cur is not None)
         if self.is_final_path_full_rendered:
-            return
+            return []
+
+        dirty_rects = []
+        if self._surface_points is None:
+            # path from the cache: it was found without being drawn
+            self._draw_start_end_points()
+            dirty_rects = self._pop_dirty_rects()
+            for rect in dirty_rects:
+                screen.blit(self._surface_points, rect, rect)
 
-        for cell in self._render_path_gen(self._cell_cur, self._cell_start, max(self._cell_cur.length // 60, 50)):
-            self._cell_cur = cell
+        for index in self._render_path_gen(self._get_path(self._index_cur), self._index_start, max(len(self) // 60, 50)):
+            self._index_cur = index
 
-        if self._cell_cur == self._cell_start:
+        if self._index_cur == self._index_start:
             self.is_final_path_full_rendered = True
 
-        screen.blit(self._surface_path, (0, 0))
+        path_dirty_rects = self._pop_dirty_rects()
+        for rect in path_dirty_rects:
+            screen.blit(self._surface_path, rect, rect)
+
+        return dirty_rects + path_dirty_rects
 
     def _draw_start_end_points(self):
         if self._surface_points is not None:
@@ -273,49 +484,78 @@ class Pathfinder():
         assert(Cell.SIZE // 2 >= 1), f'Size: {Cell.SIZE // 2}'
 
         # Start point
-        start_x, start_y = (self._cell_start.x * Cell.SIZE, self._cell_start.y * Cell.SIZE)
-        start_pos = (start_x + half_cell_size, start_y + half_cell_size)
-        pygame.draw.circle(self._surface_points, Pathfinder.COLOR_START, start_pos, radius)
+        start_x, start_y = self.start_pos
+        start_pos = (start_x * Cell.SIZE + half_cell_size, start_y * Cell.SIZE + half_cell_size)
+        self._add_dirty_rect(pygame.draw.circle(self._surface_points, Pathfinder.COLOR_START, start_pos, radius))
 
         # End point
-        end_x, end_y = (self._cell_end.x * Cell.SIZE, self._cell_end.y * Cell.SIZE)
-        end_pos = (end_x + half_cell_size, end_y + half_cell_size)
-        pygame.draw.circle(self._surface_points, Pathfinder.COLOR_END, end_pos, radius)
+        end_x, end_y = self.end_pos
+        end_pos = (end_x * Cell.SIZE + half_cell_size, end_y * Cell.SIZE + half_cell_size)
+        self._add_dirty_rect(pygame.draw.circle(self._surface_points, Pathfinder.COLOR_END, end_pos, radius))
 
     def _draw_stable_path(self):
         pass
 
     def _draw_path(self):
-        if self._cell_cur is None:
+        if self._publish:
+            self._render_path(last_index_to_render=self._published_last_stable, depth_max=self.PATH_DEPTH_MAX)
             return
 
-        self._render_path(last_cell_to_render=self._last_stable, depth_max=10)
+        if self._index_cur is None:
+            return
+
+        self._render_path(last_index_to_render=self._last_stable, depth_max=self.PATH_DEPTH_MAX)
 
     def _draw_debug_set(self):
-        for cell in self._debug_set:
+        debug_set = self._published_debug_set if self._publish else self._debug_set
+        for index in debug_set:
             color = pygame.Color('cyan')
-            if cell in self._closed_set:
+            state = self._solver.get_state(index)
+            if state == PathSolver.CLOSED:
                 color = pygame.Color('black')
-            elif cell in self._open_set:
+            elif state == PathSolver.OPENED:
                 color = pygame.Color('green')
-            elif cell == self._cell_cur:
+            elif index == self._index_cur:
                 color = pygame.Color('red')
-            self._surface_debug_set.fill(color, pygame.Rect(cell.x * Cell.SIZE, cell.y * Cell.SIZE, Cell.SIZE, Cell.SIZE))
+            x, y = self._to_pos(index)
+            self._add_dirty_rect(self._surface_debug_set.fill(color, pygame.Rect(x * Cell.SIZE, y * Cell.SIZE, Cell.SIZE, Cell.SIZE)))
+
+        debug_set.clear()
 
-        self._debug_set.clear()
+    def _add_dirty_rect(self, rect):
+        if rect is not None:
+            self._dirty_rects.append(rect)
 
-    def draw(self, screen, debug=False):
+    def _pop_dirty_rects(self):
+        dirty_rects = self._dirty_rects
+        self._dirty_rects = []
+        return dirty_rects
+
+    def draw(self, screen, debug=False, full_redraw=False):
+        '''
+        Draw only the areas updated since the last draw (all the surfaces if full_redraw).
+        Return the list of the updated rects of the screen.
+        '''
         self._draw_stable_path()
         self._draw_path()
         self._draw_start_end_points()
 
         if debug:
             self._draw_debug_set()
-            screen.blit(self._surface_debug_set, (0, 0))
 
-        screen.blit(self._surface_stable_path, (0, 0))
-        screen.blit(self._surface_path, (0, 0))
-        screen.blit(self._surface_points, (0, 0))
+        dirty_rects = self._pop_dirty_rects()
+        if full_redraw:
+            dirty_rects = [self._surface_path.get_rect()]
+
+        for rect in dirty_rects:
+            screen.fill((0, 0, 0, 0), rect)
+            if debug:
+                screen.blit(self._surface_debug_set, rect, rect)
+            screen.blit(self._surface_stable_path, rect, rect)
+            screen.blit(self._surface_path, rect, rect)
+            screen.blit(self._surface_points, rect, rect)
+
+        return dirty_rects
 
 
 
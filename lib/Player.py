@@ -4,6 +4,9 @@ from pygame.math import Vector2 as Vec
 import numpy as np
 import math
 
+from .Map import Map
+from .RayCaster import RayCaster, GridRayCaster
+
 class Ray():
 
     COLOR = (0, 255, 0, 100)
@@ -18,6 +21,10 @@ class Ray():
     def heading(self):
         return self._angle
 
+    @property
+    def direction(self):
+        return self._dir
+
     def rotate(self, angle):
         self._dir = Vec(0, -1).rotate(angle)
 
@@ -74,6 +81,8 @@ class Player():
         self._rays = [Ray(self._pos, angle) for angle in range(-self._fov // 2, self._fov // 2)]
         self._rays_view = []
 
+        self._ray_caster = RayCaster()
+
     def move(self, forward, add=True):
         self._speed = Player.SPEED
         if not forward: self._speed *= -1
@@ -108,23 +117,22 @@ class Player():
             i += 1
 
     def _rays_cast(self, walls):
-        self._rays_view = [(None, None) for _ in range(-self._fov // 2, self._fov // 2)]
+        # walls: list of Wall, (N, 4) array of segments or a Map (DDA through the cells)
+        if isinstance(walls, Map):
+            if not isinstance(self._ray_caster, GridRayCaster) or self._ray_caster.map is not walls:
+                self._ray_caster = GridRayCaster(walls)
+        else:
+            if not isinstance(self._ray_caster, RayCaster):
+                self._ray_caster = RayCaster()
+            self._ray_caster.set_walls(walls)
 
-        for i,ray in enumerate(self._rays):
-            closest = None
-            dist_min = float('inf')
-            for wall in walls:
-                pt = ray.cast(wall)
-                if pt != None:
-                    d = self._pos.distance_to(pt)
-                    #a = ray.heading #- self._heading
-                    #d *= math.cos(a)
-                    if d < dist_min:
-                        dist_min = d
-                        closest = pt
-
-            if closest != None:
-                self._rays_view[i] = (closest, dist_min)
+        dirs = [(ray.direction.x, ray.direction.y) for ray in self._rays]
+        pts, dists = self._ray_caster.cast(self._pos, dirs)
+
+        self._rays_view = [(None, None) for _ in range(-self._fov // 2, self._fov // 2)]
+        for i, d in enumerate(dists):
+            if d != float('inf'):
+                self._rays_view[i] = (Vec(pts[i, 0], pts[i, 1]), float(d))
 
     def update(self, walls):
         if self._rotation != 0:
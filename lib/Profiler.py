@@ -0,0 +1,141 @@
+import csv
+import json
+import time
+import cProfile
+import tracemalloc
+from functools import wraps
+
+
+class Profiler():
+    '''
+    Wall time and calls count of the instrumented methods (see instrument), and optional
+    cProfile (all the functions) and tracemalloc (memory allocations) sessions.
+    The stats are reset at each report (see write_report): one report per maze in the App.
+    '''
+
+    TRACEMALLOC_TOP = 10
+
+    def __init__(self):
+        # name => [calls count, total time, max time]
+        self._stats = {}
+        self._time_start = time.perf_counter()
+
+        self._cprofile = None
+
+    def instrument(self, obj, method_name, name=None):
+        '''
+        Time the calls of obj.method_name: the bound method is replaced on the instance only,
+        so the calls through self (e.g. self._solve_step()) are timed too.
+        '''
+        method = getattr(obj, method_name)
+        name = name if name is not None else f'{type(obj).__name__}.{method_name}'
+        stats = self._stats.setdefault(name, [0, 0.0, 0.0])
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                stats[0] += 1
+                stats[1] += duration
+                if duration > stats[2]:
+                    stats[2] = duration
+
+        setattr(obj, method_name, timed)
+
+    def instrument_all(self, obj, methods_names):
+        for method_name in methods_names:
+            self.instrument(obj, method_name)
+
+    def get_stats(self):
+        wall_time = time.perf_counter() - self._time_start
+        return {
+            name: {
+                'calls': calls,
+                'total_time': total_time,
+                'mean_time': total_time / calls if calls > 0 else 0.0,
+                'max_time': max_time,
+                'wall_time_percent': total_time / wall_time * 100 if wall_time > 0 else 0.0,
+            }
+            for name, (calls, total_time, max_time) in sorted(self._stats.items(), key=lambda item: -item[1][1])
+        }
+
+    def reset(self):
+        for stats in self._stats.values():
+            stats[:] = [0, 0.0, 0.0]
+        self._time_start = time.perf_counter()
+
+    @property
+    def is_cprofile_enabled(self):
+        return self._cprofile is not None
+
+    @property
+    def is_tracemalloc_enabled(self):
+        return tracemalloc.is_tracing()
+
+    def toggle_cprofile(self, path=None):
+        '''
+        Start a cProfile session, or stop it and write its stats (pstats format, see snakeviz or python -m pstats).
+        '''
+        if self._cprofile is None:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+            return
+
+        self._cprofile.disable()
+        if path is not None:
+            self._cprofile.dump_stats(path)
+        self._cprofile = None
+
+    def dump_cprofile(self, path):
+        # the session goes on after the dump
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(path)
+            self._cprofile.enable()
+
+    def toggle_tracemalloc(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        else:
+            tracemalloc.start()
+
+    def get_tracemalloc_stats(self):
+        if not tracemalloc.is_tracing():
+            return None
+
+        current, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().statistics('lineno')[:self.TRACEMALLOC_TOP]
+        tracemalloc.reset_peak()
+        return {
+            'current': current,
+            'peak': peak,
+            'top': [{'line': str(stat.traceback), 'size': stat.size, 'count': stat.count} for stat in top],
+        }
+
+    def write_report(self, path, infos=None):
+        '''
+        Write the stats (JSON or CSV according to the extension of path) and reset them.
+        '''
+        stats = self.get_stats()
+
+        if path.endswith('.csv'):
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['name', 'calls', 'total_time', 'mean_time', 'max_time', 'wall_time_percent'])
+                for name, values in stats.items():
+                    writer.writerow([name, values['calls'], values['total_time'], values['mean_time'], values['max_time'], values['wall_time_percent']])
+        else:
+            report = dict(infos) if infos is not None else {}
+            report['wall_time'] = time.perf_counter() - self._time_start
+            report['stats'] = stats
+            memory = self.get_tracemalloc_stats()
+            if memory is not None:
+                report['tracemalloc'] = memory
+
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+
+        self.reset()
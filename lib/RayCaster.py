@@ -0,0 +1,175 @@
+import numpy as np
+
+from .Cell import Cell
+
+
+class RayCaster():
+    '''
+    Cast all the rays against all the walls at once.
+    The walls are stored as an (N, 4) array of segments: (a.x, a.y, b.x, b.y).
+
+    Source: https://en.wikipedia.org/wiki/Line-line_intersection
+    '''
+
+    WALLS_CHUNK_SIZE = 16384        # bounds the size of the (rays, walls) temporary arrays
+
+    def __init__(self, walls=None):
+        self._walls = None
+        self._segments = np.empty((0, 4), dtype=np.float64)
+
+        if walls is not None:
+            self.set_walls(walls)
+
+    def __len__(self):
+        return len(self._segments)
+
+    @classmethod
+    def segments_from_walls(cls, walls):
+        if isinstance(walls, np.ndarray):
+            return np.asarray(walls, dtype=np.float64).reshape(-1, 4)
+        return np.array([(wall.a.x, wall.a.y, wall.b.x, wall.b.y) for wall in walls], dtype=np.float64).reshape(-1, 4)
+
+    def set_walls(self, walls):
+        # the segments are only rebuilt when the walls change
+        if walls is self._walls and len(walls) == len(self._segments):
+            return
+
+        self._walls = walls
+        self._segments = self.segments_from_walls(walls)
+
+    def _cast_chunk(self, pos_x, pos_y, dirs, segments):
+        x1 = segments[:, 0][np.newaxis, :]
+        y1 = segments[:, 1][np.newaxis, :]
+        x2 = segments[:, 2][np.newaxis, :]
+        y2 = segments[:, 3][np.newaxis, :]
+
+        d_x = dirs[:, 0][:, np.newaxis]
+        d_y = dirs[:, 1][:, np.newaxis]
+
+        # (x3, y3) is the ray position, (x4, y4) = (x3, y3) + dir
+        with np.errstate(divide='ignore', invalid='ignore'):
+            den = (x1 - x2) * -d_y - (y1 - y2) * -d_x
+            t = ((x1 - pos_x) * -d_y - (y1 - pos_y) * -d_x) / den
+            u = -((x1 - x2) * (y1 - pos_y) - (y1 - y2) * (x1 - pos_x)) / den
+
+        hit = (den != 0) & (t > 0) & (t < 1) & (u > 0)
+
+        pts_x = x1 + t * (x2 - x1)
+        pts_y = y1 + t * (y2 - y1)
+        dists = np.where(hit, np.hypot(pts_x - pos_x, pts_y - pos_y), np.inf)
+
+        nearest = np.argmin(dists, axis=1)
+        rays = np.arange(len(dirs))
+        return pts_x[rays, nearest], pts_y[rays, nearest], dists[rays, nearest]
+
+    def cast(self, pos, dirs):
+        '''
+        Nearest hit of each ray starting from pos with the given directions ((R, 2) array).
+        Return the hit points ((R, 2) array) and the distances ((R,) array, inf when nothing is hit).
+        '''
+        dirs = np.asarray(dirs, dtype=np.float64).reshape(-1, 2)
+        pos_x, pos_y = float(pos[0]), float(pos[1])
+
+        pts = np.full((len(dirs), 2), np.nan)
+        dists = np.full(len(dirs), np.inf)
+
+        for start in range(0, len(self._segments), self.WALLS_CHUNK_SIZE):
+            segments = self._segments[start:start + self.WALLS_CHUNK_SIZE]
+            pts_x, pts_y, chunk_dists = self._cast_chunk(pos_x, pos_y, dirs, segments)
+
+            closer = chunk_dists < dists
+            dists[closer] = chunk_dists[closer]
+            pts[closer, 0] = pts_x[closer]
+            pts[closer, 1] = pts_y[closer]
+
+        return pts, dists
+
+
+class GridRayCaster():
+    '''
+    Cast the rays through the cells of a Map with a DDA (digital differential analyzer):
+    each ray walks from cell to cell and stops on the first wall, so the cost only depends
+    on the distance travelled and not on the size of the map.
+
+    Source: https://lodev.org/cgtutor/raycasting.html
+    '''
+
+    MAX_DISTANCE = 1000     # in cells
+
+    def __init__(self, map_grid, max_distance=MAX_DISTANCE):
+        self._map = map_grid
+        self._max_distance = max_distance
+
+    @property
+    def map(self):
+        return self._map
+
+    def _cast_ray(self, pos_x, pos_y, dir_x, dir_y):
+        grid = self._map.grid
+        cols = self._map.cols
+        rows = self._map.rows
+
+        map_x = int(pos_x)
+        map_y = int(pos_y)
+        if not (0 <= map_x < cols and 0 <= map_y < rows):
+            return None
+
+        # distance (along the ray) between two vertical / horizontal cell borders
+        delta_x = abs(1 / dir_x) if dir_x != 0 else float('inf')
+        delta_y = abs(1 / dir_y) if dir_y != 0 else float('inf')
+
+        # wall of the current cell crossed when the ray goes to the next cell
+        if dir_x < 0:
+            step_x, wall_x = -1, Cell.WALL_BITS['W']
+            side_x = (pos_x - map_x) * delta_x
+        else:
+            step_x, wall_x = 1, Cell.WALL_BITS['E']
+            side_x = (map_x + 1 - pos_x) * delta_x
+        if dir_y < 0:
+            step_y, wall_y = -1, Cell.WALL_BITS['N']
+            side_y = (pos_y - map_y) * delta_y
+        else:
+            step_y, wall_y = 1, Cell.WALL_BITS['S']
+            side_y = (map_y + 1 - pos_y) * delta_y
+
+        while True:
+            if side_x < side_y:
+                dist = side_x
+                if dist > self._max_distance:
+                    return None
+                if grid[map_y * cols + map_x] & wall_x:
+                    return dist
+                side_x += delta_x
+                map_x += step_x
+                if not (0 <= map_x < cols):
+                    return dist
+            else:
+                dist = side_y
+                if dist > self._max_distance:
+                    return None
+                if grid[map_y * cols + map_x] & wall_y:
+                    return dist
+                side_y += delta_y
+                map_y += step_y
+                if not (0 <= map_y < rows):
+                    return dist
+
+    def cast(self, pos, dirs):
+        '''
+        Same as RayCaster.cast, pos and the returned points / distances are in pixels.
+        '''
+        dirs = np.asarray(dirs, dtype=np.float64).reshape(-1, 2)
+        pos_x, pos_y = float(pos[0]) / Cell.SIZE, float(pos[1]) / Cell.SIZE
+
+        pts = np.full((len(dirs), 2), np.nan)
+        dists = np.full(len(dirs), np.inf)
+
+        for i, (dir_x, dir_y) in enumerate(dirs.tolist()):
+            dist = self._cast_ray(pos_x, pos_y, dir_x, dir_y)
+            if dist is None:
+                continue
+            pts[i, 0] = (pos_x + dir_x * dist) * Cell.SIZE
+            pts[i, 1] = (pos_y + dir_y * dist) * Cell.SIZE
+            dists[i] = dist * Cell.SIZE
+
+        return pts, dists
@@ -0,0 +1,69 @@
+import queue
+import threading
+import time
+
+
+class Simulation():
+    '''
+    Updates of a Maze or a Pathfinder (created with publish=True) in a worker thread.
+    After each batch of updates the changes are published in a queue (see pop_changes of the target),
+    the render loop applies them (see apply_changes of the target) before drawing:
+    a slow frame does not stall the simulation, and nothing is drawn from the state being updated.
+    '''
+
+    BATCH_DURATION = 0.005      # in sec of updates between two published changes
+
+    def __init__(self, target):
+        self._target = target
+
+        self._queue = queue.SimpleQueue()
+        self._stop_event = threading.Event()
+        self._error = None
+
+        # updates done by the worker (only increased)
+        self.steps_count = 0
+
+        self._thread = threading.Thread(target=self._run, name=f'{type(target).__name__}Simulation', daemon=True)
+        self._thread.start()
+
+    @property
+    def is_done(self):
+        # all the changes are published and popped
+        return not self._thread.is_alive() and self._queue.empty()
+
+    def _run(self):
+        updates_count = 1
+        try:
+            while not self._stop_event.is_set() and not self._target.is_simulation_done:
+                start = time.perf_counter()
+                self._target.update(multiple_update_counter=updates_count)
+                duration = time.perf_counter() - start
+
+                self.steps_count += updates_count
+                self._queue.put(self._target.pop_changes())
+
+                # batches of about BATCH_DURATION, at most doubled from a batch to the next one
+                if duration > 0:
+                    updates_count = max(1, min(int(updates_count * self.BATCH_DURATION / duration), updates_count * 2))
+
+            self._queue.put(self._target.pop_changes())
+        except Exception as e:
+            self._error = e
+
+    def pop_changes(self):
+        '''
+        Changes published since the last call, in order.
+        '''
+        if self._error is not None:
+            raise self._error
+
+        changes = []
+        while True:
+            try:
+                changes.append(self._queue.get_nowait())
+            except queue.Empty:
+                return changes
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
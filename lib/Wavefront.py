@@ -0,0 +1,117 @@
+import numpy as np
+
+from .Cell import Cell
+
+
+class Wavefront():
+    '''
+    Distances from a source cell to all the cells of the map, by a breadth first search in array operations:
+    the wavefront of each distance level is expanded at once. The path to any cell is then found
+    by gradient descent on the distances (a neighbor one step closer to the source at each cell).
+
+    The neighbors of all the cells are indexed once from the open directions arrays (see Map.get_open_arrays),
+    each level then only reads the neighbors of its wavefront: on a grid the wavefront is much smaller
+    than the grid, so whole grid operations at each level would cost far more.
+    '''
+
+    UNREACHABLE = -1
+
+    def __init__(self, map_grid, source_pos):
+        assert(0 <= source_pos[0] < map_grid.cols and 0 <= source_pos[1] < map_grid.rows)
+
+        if not map_grid.has_adjacency:
+            map_grid.build_adjacency()
+
+        self._cols = map_grid.cols
+        self._rows = map_grid.rows
+        self._source = source_pos[1] * self._cols + source_pos[0]
+
+        self._neighbors = self._get_neighbors(map_grid)
+        self.distances = self._expand()
+
+    def _get_neighbors(self, map_grid):
+        # neighbors[i, d]: index of the neighbor of the cell i in the direction d (N, S, E, W), cells_count if closed
+        cells_count = self._cols * self._rows
+        indexes = np.arange(cells_count, dtype=np.int32).reshape(self._rows, self._cols)
+
+        neighbors = np.full((self._rows, self._cols, 4), cells_count, dtype=np.int32)
+        open_n, open_s, open_e, open_w = map_grid.get_open_arrays()
+        neighbors[1:, :, 0] = np.where(open_n[1:, :], indexes[:-1, :], cells_count)
+        neighbors[:-1, :, 1] = np.where(open_s[:-1, :], indexes[1:, :], cells_count)
+        neighbors[:, :-1, 2] = np.where(open_e[:, :-1], indexes[:, 1:], cells_count)
+        neighbors[:, 1:, 3] = np.where(open_w[:, 1:], indexes[:, :-1], cells_count)
+
+        return neighbors.reshape(cells_count, 4)
+
+    def _expand(self):
+        cells_count = self._cols * self._rows
+
+        # one more cell: the closed directions lead to it, never unreached
+        distances = np.full(cells_count + 1, self.UNREACHABLE, dtype=np.int32)
+        distances[cells_count] = 0
+        distances[self._source] = 0
+
+        wavefront = np.array([self._source], dtype=np.int32)
+        level = 0
+        while len(wavefront) > 0:
+            level += 1
+            reached = self._neighbors[wavefront].ravel()
+            reached = reached[distances[reached] == self.UNREACHABLE]
+            distances[reached] = level
+            # a cell can be reached from two cells of the wavefront
+            wavefront = np.unique(reached) if len(reached) > 1 else reached
+
+        self.levels_count = level - 1
+
+        return distances[:cells_count].reshape(self._rows, self._cols)
+
+    @property
+    def source_pos(self):
+        return (self._source % self._cols, self._source // self._cols)
+
+    def get_distance(self, pos):
+        '''
+        Length of the shortest path from the source to pos, None if not reachable.
+        '''
+        distance = int(self.distances[pos[1], pos[0]])
+        return distance if distance != self.UNREACHABLE else None
+
+    def get_directions(self):
+        '''
+        Wall bit (see Cell.WALL_BITS) of the direction of a neighbor one step closer to the source for each cell,
+        shape: (rows, cols), 0 for the source and the unreachable cells.
+        '''
+        cells_count = self._cols * self._rows
+        distances = self.distances.ravel()
+        # closed directions lead to the last one: never one step closer
+        neighbors_distances = np.append(distances, self.UNREACHABLE)[self._neighbors]
+        closer = (neighbors_distances == (distances - 1)[:, np.newaxis]) & (distances > 0)[:, np.newaxis]
+
+        directions = np.zeros(cells_count, dtype=np.uint8)
+        for column, cardinality in reversed(tuple(enumerate(Cell.CARDINALITIES))):
+            directions[closer[:, column]] = Cell.WALL_BITS[cardinality]
+
+        return directions.reshape(self._rows, self._cols)
+
+    def get_path(self, target_pos):
+        '''
+        Positions of the cells of a shortest path from the source to target_pos, None if not reachable.
+        '''
+        distance = self.get_distance(target_pos)
+        if distance is None:
+            return None
+
+        distances = self.distances.ravel()
+        neighbors = self._neighbors
+
+        index = target_pos[1] * self._cols + target_pos[0]
+        path = [index]
+        while distance > 0:
+            distance -= 1
+            for neighbor in neighbors[index].tolist():
+                if neighbor < len(distances) and distances[neighbor] == distance:
+                    index = neighbor
+                    break
+            path.append(index)
+
+        return [(index % self._cols, index // self._cols) for index in reversed(path)]
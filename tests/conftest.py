@@ -0,0 +1,65 @@
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lib.Map import Map
+from lib.Maze import Maze
+from lib.ParallelMaze import ParallelMaze
+from lib.PathSolvers import SOLVERS
+from lib.Wavefront import Wavefront
+
+
+def generate(cols, rows, seed, braid=0.0, algorithm='parallel', screen_size=None):
+    '''
+    Maze determined by the seed, with some more passages (the ratio braid of the cells): the paths can go round a closed passage.
+    Drawn on a screen of screen_size (headless if None).
+    '''
+    map_grid = Map(screen_size, cols, rows, headless=screen_size is None, seed=seed)
+    if algorithm == 'parallel':
+        ParallelMaze(map_grid).generate()
+    else:
+        Maze(map_grid, algorithm).generate()
+
+    rng = random.Random(seed)
+    for _ in range(0, int(len(map_grid) * braid)):
+        x, y = rng.randrange(cols - 1), rng.randrange(rows - 1)
+        map_grid.remove_wall((x, y), (x + 1, y) if rng.random() < 0.5 else (x, y + 1))
+
+    map_grid.build_adjacency()
+    return map_grid
+
+
+def check_solver(map_grid, solver, start_pos, end_pos):
+    '''
+    Path of the solver (from the end to the start) once solved, checked against the shortest one (see Wavefront),
+    None if the end is not reachable.
+    '''
+    distance = Wavefront(map_grid, start_pos).get_distance(end_pos)
+    solver.solve()
+
+    if distance is None:
+        assert solver.is_exhausted
+        assert solver.winner is None
+        return None
+
+    assert solver.winner == solver.end
+    assert solver.get_length(solver.end) == distance
+    path = list(solver.get_path(solver.end))
+    assert len(path) == distance + 1
+    assert path[0] == solver.end and path[-1] == solver.start
+    for index, next_index in zip(path, path[1:]):
+        assert next_index in map_grid.find_neighbor_indexes(index)
+    return path
+
+
+def check_path(map_grid, solver_name, start_pos, end_pos):
+    '''
+    Same as check_solver with a new solver.
+    '''
+    solver = SOLVERS[solver_name](map_grid, start_pos, end_pos)
+    try:
+        return check_solver(map_grid, solver, start_pos, end_pos)
+    finally:
+        solver.close()
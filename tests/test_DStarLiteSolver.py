@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from conftest import generate, check_solver
+from lib.PathSolvers import SOLVERS
+from lib.Pathfinder import Pathfinder
+
+
+@pytest.mark.parametrize('cols, rows, braid, seed', [
+    (30, 25, 0.1, 1),
+    (41, 37, 0.0, 2),
+    (20, 20, 0.3, 3),
+])
+def test_replan(cols, rows, braid, seed):
+    map_grid = generate(cols, rows, seed, braid)
+    start_pos, end_pos = (0, 0), (cols - 1, rows - 1)
+    solver = SOLVERS['dstar-lite'](map_grid, start_pos, end_pos)
+    path = check_solver(map_grid, solver, start_pos, end_pos)
+
+    rng = random.Random(seed)
+    for _ in range(0, 150):
+        if path is not None and len(path) > 2 and rng.random() < 0.5:
+            # a passage of the path closed: the path has to change
+            i = rng.randrange(len(path) - 1)
+            map_grid.add_wall(solver.to_pos(path[i]), solver.to_pos(path[i + 1]))
+        else:
+            x, y = rng.randrange(cols - 1), rng.randrange(rows - 1)
+            map_grid.set_wall((x, y), (x + 1, y) if rng.random() < 0.5 else (x, y + 1), rng.random() < 0.5)
+
+        # the start goes on along the path
+        if path is not None and len(path) > 2 and rng.random() < 0.3:
+            start_pos = solver.to_pos(path[-2])
+            solver.move_start(start_pos)
+
+        path = check_solver(map_grid, solver, start_pos, end_pos)
+
+    solver.close()
+
+
+def test_replan_expands_less():
+    map_grid = generate(60, 60, 4, 0.1)
+    solver = SOLVERS['dstar-lite'](map_grid, (0, 0), (59, 59))
+    solver.solve()
+    expanded_count = solver.expanded_count
+
+    # far from the path: the search is reused
+    path = set(solver.get_path(solver.end))
+    x, y = next((x, y) for y in range(0, 59) for x in range(0, 59) if y * 60 + x not in path and y * 60 + x + 1 not in path)
+    map_grid.set_wall((x, y), (x + 1, y), (y * 60 + x + 1) in map_grid.find_neighbor_indexes(y * 60 + x))
+    check_solver(map_grid, solver, (0, 0), (59, 59))
+    assert solver.expanded_count - expanded_count < expanded_count
+
+    solver.close()
+
+
+def test_unreachable():
+    map_grid = generate(20, 10, 5, 0.1)
+    solver = SOLVERS['dstar-lite'](map_grid, (0, 0), (19, 9))
+    path = check_solver(map_grid, solver, (0, 0), (19, 9))
+
+    # a wall through the whole map, then the former passages opened again
+    passages = [y for y in range(0, map_grid.rows) if 10 + y * 20 in map_grid.find_neighbor_indexes(9 + y * 20)]
+    for y in passages:
+        map_grid.add_wall((9, y), (10, y))
+    assert check_solver(map_grid, solver, (0, 0), (19, 9)) is None
+
+    for y in passages:
+        map_grid.remove_wall((9, y), (10, y))
+    assert len(check_solver(map_grid, solver, (0, 0), (19, 9))) == len(path)
+
+    solver.close()
+
+
+def test_close():
+    map_grid = generate(10, 10, 6)
+    solver = SOLVERS['dstar-lite'](map_grid, (0, 0), (9, 9))
+    solver.solve()
+    length = solver.get_length(solver.end)
+
+    # not updated anymore once closed (closed twice: no error)
+    solver.close()
+    solver.close()
+    path = list(solver.get_path(solver.end))
+    map_grid.add_wall(solver.to_pos(path[0]), solver.to_pos(path[1]))
+    assert solver.get_length(solver.end) == length
+    assert map_grid._subscribers == []
+
+
+def test_pathfinder_close():
+    map_grid = generate(10, 10, 7)
+    pathfinder = Pathfinder(map_grid, (0, 0), (9, 9), solver='dstar-lite')
+    assert len(map_grid._subscribers) == 1
+
+    pathfinder.close()
+    assert map_grid._subscribers == []
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from conftest import generate, check_path
+from lib.MazeHierarchy import MazeHierarchy
+from lib.Pathfinder import Pathfinder
+from lib.Wavefront import Wavefront
+
+
+def check_queries(map_grid, queries_count, seed):
+    rng = random.Random(seed)
+    for _ in range(0, queries_count):
+        start_pos = (rng.randrange(map_grid.cols), rng.randrange(map_grid.rows))
+        end_pos = (rng.randrange(map_grid.cols), rng.randrange(map_grid.rows))
+        check_path(map_grid, 'hpa', start_pos, end_pos)
+
+
+@pytest.mark.parametrize('cols, rows, braid, seed', [
+    (57, 43, 0.0, 1),
+    (61, 39, 0.1, 2),
+    (40, 33, 0.3, 3),
+    (16, 16, 0.0, 4),
+    (5, 7, 0.0, 5),
+])
+def test_shortest_paths(cols, rows, braid, seed):
+    map_grid = generate(cols, rows, seed, braid)
+    check_queries(map_grid, 60, seed)
+
+
+@pytest.mark.parametrize('cluster_size', [2, 5, 32])
+def test_cluster_sizes(cluster_size):
+    map_grid = generate(45, 30, 6, 0.1)
+    map_grid.build_hierarchy(cluster_size)
+    assert map_grid.hierarchy.cluster_size == cluster_size
+    check_queries(map_grid, 30, cluster_size)
+
+
+def test_same_cell():
+    map_grid = generate(20, 20, 7)
+    check_path(map_grid, 'hpa', (3, 4), (3, 4))
+    check_path(map_grid, 'hpa', (17, 17), (17, 17))
+
+
+def test_unreachable():
+    map_grid = generate(40, 20, 8, 0.1)
+    # a wall through the whole map: two parts
+    for y in range(0, map_grid.rows):
+        map_grid.add_wall((19, y), (20, y))
+
+    check_queries(map_grid, 40, 8)
+    check_path(map_grid, 'hpa', (0, 0), (39, 19))
+
+
+def test_hierarchy():
+    map_grid = generate(48, 32, 9)
+    hierarchy = MazeHierarchy(map_grid, 16)
+
+    # a perfect maze: the clusters are linked by exactly the passages through their borders
+    for node in range(0, hierarchy.nodes_count):
+        cell = hierarchy.get_node_cell(node)
+        assert node in hierarchy.get_cluster_nodes(hierarchy.get_cluster(cell)).values()
+        for neighbor, distance in hierarchy.get_edges(node):
+            neighbor_cell = hierarchy.get_node_cell(neighbor)
+            if hierarchy.get_cluster(neighbor_cell) != hierarchy.get_cluster(cell):
+                assert distance == 1
+                assert neighbor_cell in map_grid.find_neighbor_indexes(cell)
+            else:
+                _, distances = hierarchy.search_cluster(cell, [neighbor_cell])
+                assert distances[neighbor_cell] == distance
+
+
+def test_hierarchy_dropped_on_wall_change():
+    map_grid = generate(32, 32, 10)
+    hierarchy = map_grid.hierarchy
+    assert map_grid.hierarchy is hierarchy
+
+    map_grid.remove_wall((15, 3), (16, 3))
+    assert map_grid.hierarchy is not hierarchy
+    check_path(map_grid, 'hpa', (15, 3), (16, 3))
+
+
+def test_pathfinder():
+    map_grid = generate(30, 20, 11)
+    pathfinder = Pathfinder(map_grid, (0, 0), (29, 19), solver='hpa')
+    while not pathfinder.path_found() and not pathfinder.is_exhausted:
+        pathfinder.update(100)
+
+    assert pathfinder.path_found()
+    assert len(pathfinder) == Wavefront(map_grid, (0, 0)).get_distance((29, 19))
+    pathfinder.close()
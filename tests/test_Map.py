@@ -0,0 +1,123 @@
+import random
+
+import pytest
+
+from conftest import generate
+from lib.Map import Map
+from lib.Maze import Maze
+from lib.MazeFile import MazeFile
+from lib.ParallelMaze import ParallelMaze
+from lib.Pathfinder import Pathfinder
+
+
+def check_adjacency(map_grid):
+    # the index patched by set_wall is the one built from the walls
+    masks = bytes(map_grid.open_masks)
+    map_grid.clear_adjacency()
+    map_grid.build_adjacency()
+    assert bytes(map_grid.open_masks) == masks
+
+
+def test_set_wall():
+    map_grid = generate(20, 15, 1)
+    changes = []
+    map_grid.subscribe(lambda index_a, index_b, closed: changes.append((index_a, index_b, closed)))
+
+    rng = random.Random(1)
+    for _ in range(0, 200):
+        x, y = rng.randrange(map_grid.cols - 1), rng.randrange(map_grid.rows - 1)
+        pos_b = (x + 1, y) if rng.random() < 0.5 else (x, y + 1)
+        closed = rng.random() < 0.5
+        index_a, index_b = y * map_grid.cols + x, pos_b[1] * map_grid.cols + pos_b[0]
+        was_open = index_b in map_grid.find_neighbor_indexes(index_a)
+
+        changes.clear()
+        map_grid.set_wall((x, y), pos_b, closed)
+
+        # both cells see the same passage, the subscribers are notified only of a change
+        assert (index_b in map_grid.find_neighbor_indexes(index_a)) == (not closed)
+        assert (index_a in map_grid.find_neighbor_indexes(index_b)) == (not closed)
+        assert changes == ([(index_a, index_b, closed)] if was_open == closed else [])
+        check_adjacency(map_grid)
+
+
+def test_set_wall_without_adjacency():
+    map_grid = generate(10, 10, 2)
+    map_grid.clear_adjacency()
+    map_grid.remove_wall((4, 4), (4, 5))
+    map_grid.add_wall((4, 4), (5, 4))
+    assert not map_grid.has_adjacency
+
+    map_grid.build_adjacency()
+    assert 4 * 10 + 4 in map_grid.find_neighbor_indexes(5 * 10 + 4)
+    assert 4 * 10 + 5 not in map_grid.find_neighbor_indexes(4 * 10 + 4)
+
+
+def test_set_wall_invalid_cells():
+    map_grid = generate(10, 10, 3)
+    with pytest.raises(AssertionError):
+        map_grid.remove_wall((0, 0), (1, 1))
+    with pytest.raises(AssertionError):
+        map_grid.remove_wall((0, 0), (0, 2))
+    with pytest.raises(AssertionError):
+        map_grid.remove_wall((9, 9), (10, 9))
+
+
+def test_set_wall_before_generation():
+    map_grid = Map(None, 10, 10, headless=True, seed=4)
+    maze = Maze(map_grid)
+    maze.update(5)
+    with pytest.raises(AssertionError):
+        map_grid.remove_wall((0, 0), (1, 0))
+
+    maze.generate()
+    map_grid.add_wall((0, 0), (1, 0))
+
+    map_grid = Map(None, 10, 10, headless=True, seed=4)
+    maze = ParallelMaze(map_grid)
+    with pytest.raises(AssertionError):
+        map_grid.remove_wall((0, 0), (1, 0))
+
+    maze.generate()
+    map_grid.add_wall((0, 0), (1, 0))
+
+
+def test_set_wall_loaded_map(tmp_path):
+    path = tmp_path / f'maze{MazeFile.EXTENSION}'
+    MazeFile.write(path, generate(9, 7, 5))
+
+    map_grid = Map(None, None, None, MazeFile.load(path), headless=True)
+    assert map_grid.was_generated
+    map_grid.build_adjacency()
+    map_grid.remove_wall((3, 3), (4, 3))
+    map_grid.add_wall((3, 3), (3, 4))
+    check_adjacency(map_grid)
+
+
+def test_indexes_dropped():
+    map_grid = generate(16, 16, 6)
+    tree = map_grid.tree
+    hierarchy = map_grid.hierarchy
+    flow_field = map_grid.get_flow_field((15, 15))
+    assert map_grid.get_flow_field((15, 15)) is flow_field
+
+    # a loop: not a perfect maze anymore
+    x = next(x for x in range(0, 15) if 1 + x not in map_grid.find_neighbor_indexes(x))
+    map_grid.remove_wall((x, 0), (x + 1, 0))
+    assert not map_grid.tree.is_perfect
+    assert map_grid.tree is not tree
+    assert map_grid.hierarchy is not hierarchy
+    assert map_grid.get_flow_field((15, 15)) is not flow_field
+
+
+def test_adjacency_kept_by_pathfinder():
+    map_grid = generate(12, 12, 7)
+    map_grid.remove_wall((5, 5), (6, 5))
+    masks = map_grid.open_masks
+
+    Pathfinder(map_grid, (0, 0), (11, 11)).close()
+    assert map_grid.open_masks is masks
+
+    # generated again: the index of the former walls is dropped
+    ParallelMaze(map_grid).generate()
+    assert not map_grid.has_adjacency
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from conftest import generate
+from lib.Map import Map
+from lib.MazeFile import MazeFile, PackedGrid
+from lib.MazeGenerators import EllerRows
+
+
+def load(path, seed=None):
+    return Map(None, None, None, MazeFile.load(path), headless=True, seed=seed)
+
+
+@pytest.mark.parametrize('cols, rows', [(1, 1), (7, 5), (8, 3), (37, 23)])
+def test_walls_round_trip(tmp_path, cols, rows):
+    map_grid = generate(cols, rows, 1, algorithm='backtracker')
+    path = tmp_path / f'maze{MazeFile.EXTENSION}'
+    MazeFile.write(path, map_grid, map_grid.seed, 'backtracker')
+
+    maze_file = MazeFile(path)
+    assert (maze_file.cols, maze_file.rows) == (cols, rows)
+    assert maze_file.seed == map_grid.seed
+    assert maze_file.algorithm == 'backtracker'
+    assert isinstance(maze_file.grid, PackedGrid)
+
+    loaded = load(path)
+    assert loaded.walls_hash == map_grid.walls_hash
+    assert all(loaded.grid[i] == map_grid.grid[i] for i in range(0, len(map_grid)))
+
+    # a packed grid is written as is
+    path_again = tmp_path / f'again{MazeFile.EXTENSION}'
+    MazeFile.write(path_again, loaded)
+    assert path_again.read_bytes()[MazeFile.HEADER.size:] == path.read_bytes()[MazeFile.HEADER.size:]
+
+
+def test_header_without_seed_nor_algorithm(tmp_path):
+    map_grid = generate(10, 10, 2, algorithm='prim')
+    path = tmp_path / f'maze{MazeFile.EXTENSION}'
+    MazeFile.write(path, map_grid)
+
+    maze_file = MazeFile(path)
+    assert maze_file.version == MazeFile.VERSION
+    assert maze_file.seed is None
+    assert maze_file.algorithm is None
+    assert load(path, seed=3).seed == 3
+
+
+@pytest.mark.parametrize('algorithm', MazeFile.ALGORITHMS)
+def test_seed_only(tmp_path, algorithm):
+    map_grid = generate(21, 13, 42, algorithm=algorithm)
+    path = tmp_path / f'maze{MazeFile.EXTENSION}'
+    MazeFile.write(path, map_grid, 42, algorithm, walls=False)
+
+    # only the header: the maze is generated again on load
+    assert path.stat().st_size == MazeFile.HEADER.size
+    maze_file = MazeFile(path)
+    assert maze_file.seed == 42
+    assert maze_file.algorithm == algorithm
+
+    loaded = load(path, seed=7)
+    assert loaded.walls_hash == map_grid.walls_hash
+    # saved again with the seed of the file, not the one given to the map
+    assert loaded.seed == 42
+    path_again = tmp_path / f'again{MazeFile.EXTENSION}'
+    MazeFile.write(path_again, loaded, loaded.seed, algorithm, walls=False)
+    assert load(path_again).walls_hash == map_grid.walls_hash
+
+
+def test_seed_only_requires_seed_and_algorithm(tmp_path):
+    map_grid = generate(5, 5, 1, algorithm='backtracker')
+    with pytest.raises(AssertionError):
+        MazeFile.write(tmp_path / 'maze.maze', map_grid, None, 'backtracker', walls=False)
+    with pytest.raises(AssertionError):
+        MazeFile.write(tmp_path / 'maze.maze', map_grid, 1, None, walls=False)
+
+
+def test_write_rows(tmp_path):
+    path = tmp_path / f'stream{MazeFile.EXTENSION}'
+    MazeFile.write_rows(path, 41, 17, EllerRows(41, 17, random.Random(5)), seed=5, algorithm='eller')
+
+    # same maze as the eller generator with this seed
+    assert load(path).walls_hash == generate(41, 17, 5, algorithm='eller').walls_hash
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / f'invalid{MazeFile.EXTENSION}'
+    path.write_bytes(b'MAZX' + bytes(MazeFile.HEADER.size - 4))
+    with pytest.raises(AssertionError):
+        MazeFile(path)
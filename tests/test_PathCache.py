@@ -0,0 +1,51 @@
+import os
+
+from lib.PathCache import PathCache
+
+
+def get_key(i):
+    return PathCache.get_key('hash', (i, 0), (0, 0), 'bfs')
+
+
+def test_memory():
+    cache = PathCache(2)
+    cache.put(get_key(0), [0, 1])
+    cache.put(get_key(1), [1, 2])
+    assert list(cache.get(get_key(0))) == [0, 1]
+
+    # the least recently used is evicted
+    cache.put(get_key(2), [2, 3])
+    assert len(cache) == 2
+    assert cache.get(get_key(1)) is None
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_disk(tmp_path):
+    cache = PathCache(3, tmp_path)
+    for i in range(0, 5):
+        cache.put(get_key(i), range(i, i + 10))
+    assert len(os.listdir(tmp_path)) == 3
+    assert cache.disk_size == 3 * 10 * 4
+
+    # reused by the next runs, the most recently used files kept
+    cache = PathCache(3, tmp_path)
+    assert list(cache.get(get_key(2))) == list(range(2, 12))
+    assert cache.get(get_key(1)) is None
+
+    cache = PathCache(2, tmp_path)
+    assert len(os.listdir(tmp_path)) == 2
+    assert cache.get(get_key(2)) is not None
+    assert cache.get(get_key(4)) is not None
+    assert cache.get(get_key(3)) is None
+
+
+def test_disk_file_removed(tmp_path):
+    cache = PathCache(1, tmp_path)
+    cache.put(get_key(0), [0])
+    for name in os.listdir(tmp_path):
+        os.remove(tmp_path / name)
+
+    # removed by another run once indexed: nothing to remove on eviction
+    cache.put(get_key(1), [1])
+    assert len(os.listdir(tmp_path)) == 1
+    assert PathCache(1, tmp_path).get(get_key(0)) is None
@@ -0,0 +1,73 @@
+import pytest
+
+from conftest import generate
+from lib.PathCache import PathCache
+from lib.Pathfinder import Pathfinder
+
+SCREEN_SIZE = (400, 300)
+UPDATES_MAX = 20000
+
+
+def run(map_grid, solver, publish=False):
+    '''
+    Pathfinder updated step by step (drawn, see Pathfinder.update) until the stable path reaches the end.
+    '''
+    pathfinder = Pathfinder(map_grid, (0, 0), (map_grid.cols - 1, map_grid.rows - 1), solver, publish=publish)
+    updates_count = 0
+    while not pathfinder.path_found() and updates_count < UPDATES_MAX:
+        pathfinder.update()
+        if publish:
+            pathfinder.apply_changes(pathfinder.pop_changes())
+        updates_count += 1
+
+    assert pathfinder.path_found(), f'Error: Stable path stopped at {pathfinder._last_stable} after {updates_count} updates'
+    return pathfinder
+
+
+def check_stable_path(pathfinder):
+    # the stable path links the cells of the path found, from the start to the end
+    winner = pathfinder._solver.winner
+    path = list(reversed(list(pathfinder._get_path(winner))))
+
+    stable_path = [path[0]]
+    while stable_path[-1] != winner and len(stable_path) <= len(path):
+        stable_path.append(pathfinder._next[stable_path[-1]])
+    assert stable_path == path
+
+
+@pytest.mark.parametrize('algorithm', ['kruskal', 'prim', 'sidewinder'])
+@pytest.mark.parametrize('seed', range(0, 6))
+def test_stable_path(algorithm, seed):
+    # the stable path goes in dead ends and comes back to forks
+    map_grid = generate(40, 30, seed, algorithm=algorithm, screen_size=SCREEN_SIZE)
+    pathfinder = run(map_grid, 'astar')
+    check_stable_path(pathfinder)
+
+
+@pytest.mark.parametrize('solver', ['manhattan', 'bidirectional-astar', 'wall-follower'])
+@pytest.mark.parametrize('publish', [False, True])
+def test_stable_path_solvers(solver, publish):
+    map_grid = generate(40, 30, 3, algorithm='kruskal', screen_size=SCREEN_SIZE)
+    pathfinder = run(map_grid, solver, publish)
+    check_stable_path(pathfinder)
+
+
+def test_flow_field():
+    map_grid = generate(30, 20, 1)
+    cache = PathCache()
+
+    # read from the flow field: not a hit of the cache, nothing expanded
+    pathfinder = Pathfinder(map_grid, (0, 0), (29, 19), cache=cache, flow_field=True)
+    assert pathfinder.is_flow_field and not pathfinder.is_cached
+    assert pathfinder.path_found() and pathfinder.expanded_count == 0
+    assert cache.hits == 0
+
+    pathfinder = Pathfinder(map_grid, (0, 0), (29, 19), cache=cache)
+    while not pathfinder.path_found():
+        pathfinder.update(100)
+    length = len(pathfinder)
+
+    pathfinder = Pathfinder(map_grid, (0, 0), (29, 19), cache=cache, flow_field=True)
+    assert pathfinder.is_cached and not pathfinder.is_flow_field
+    assert cache.hits == 1
+    assert len(pathfinder) == length